@@ -108,10 +108,10 @@ def _compute_master(df_raw: pd.DataFrame, start_date_str: str, train_prop: float
     fname, csv_bytes = save_dataframe_csv(preds_df, filename=MASTER_PATH)
     with open(fname, "wb") as f:
         f.write(csv_bytes)
-    return preds_df, metrics, P["split_date"]
+    return preds_df, metrics, P["split_date"], P["memory"]
 
 with st.spinner("Computing master predictions..."):
-    preds_df, metrics, split_date = _compute_master(df_raw, str(start_date), float(train_prop))
+    preds_df, metrics, split_date, memory = _compute_master(df_raw, str(start_date), float(train_prop))
 
 with st.sidebar:
     st.markdown("### Model Snapshot")
@@ -120,6 +120,7 @@ with st.sidebar:
     st.write(f"- Split date (time-based): **{split_date.date()}**")
     st.write(f"- Train proportion: **{train_prop:.2f}** (Test: **{1-train_prop:.2f}**)")
     st.write(f"- Rows (train / test): **{(preds_df['split']=='train').sum()} / {(preds_df['split']=='test').sum()}**")
+    st.write(f"- Data in memory: **{memory['bytes_after'] / 1e6:.2f} MB** (from {memory['bytes_before'] / 1e6:.2f} MB)")
 
 # Interactive panel
 st.header("Match Explorer")
@@ -1,10 +1,16 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from pathlib import Path
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score
 
+# The pipeline's dtype compaction lives in src/, so the app runs from a full checkout (see README.md)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+from compact_dtypes import DEFAULT_SKIP, compact, memory_report  # noqa: E402
+
 FEATURES = [
     "map_pool_advantage",
     "r2_advantage",
@@ -14,6 +20,15 @@ FEATURES = [
     "rolling_round_diff",
 ]
 
+def compact_frame(df: pd.DataFrame):
+    """compact() copy of the dataset: rolling_* helper columns to float32, names/labels to category.
+    FEATURES keep their float64 values, since they are what LogisticRegression is fit on.
+    Returns (compacted frame, memory report with bytes_before/bytes_after)."""
+    rolling = [c for c in df.columns if c.startswith("rolling_") and c not in FEATURES]
+    d = compact(df, lossy_float32=rolling, skip=(*DEFAULT_SKIP, *FEATURES))
+    report = memory_report("app/prepare", df, d)
+    return d, dict(bytes_before=report["bytes_before"], bytes_after=report["bytes_after"])
+
 def prepare(df: pd.DataFrame, *, start_date: str = "2023-01-01", train_prop: float = 0.75):
     """Fresh, deterministic prep + time split by date. Never mutates caller data.
     
@@ -22,7 +37,7 @@ def prepare(df: pd.DataFrame, *, start_date: str = "2023-01-01", train_prop: flo
         start_date: Keep rows on/after this date (YYYY-MM-DD)
         train_prop: Fraction of earliest dates used for training (0.5–0.9 typical)
     """
-    d = df.copy()
+    d, memory = compact_frame(df)
     d["date"] = pd.to_datetime(d["date"], errors="coerce")
     d = d.sort_values("date").reset_index(drop=True)
     if start_date is not None:
@@ -39,7 +54,7 @@ def prepare(df: pd.DataFrame, *, start_date: str = "2023-01-01", train_prop: flo
     # Labels (1 for Win, 0 for not Win)
     ytr = (train["result"] == "W").astype(int)
     yte = (test["result"]  == "W").astype(int)
-    return dict(df=d, train=train, test=test, Xtr=Xtr, Xte=Xte, ytr=ytr, yte=yte, split_date=split_date, train_prop=q)
+    return dict(df=d, train=train, test=test, Xtr=Xtr, Xte=Xte, ytr=ytr, yte=yte, split_date=split_date, train_prop=q, memory=memory)
 
 def train_model(Xtr, ytr, Xte, yte):
     model = LogisticRegression(solver="lbfgs", max_iter=2000, C=10, random_state=42)
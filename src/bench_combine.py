@@ -0,0 +1,131 @@
+# BENCHMARK: COMBINE WALL TIME VS TEAM COUNT OVER SYNTHETIC RAW TEAM DATASETS
+# (the old one-team-at-a-time load against combine_team_data's concurrent, typed, projected load)
+
+import argparse
+import csv
+import logging
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+import combine_team_data
+from combine_manifest import KINDS
+from dataset_store import read_dataset, write_dataset
+
+MAPS = ['Ascent', 'Bind', 'Haven', 'Icebox', 'Lotus', 'Split', 'Sunset']
+
+
+def synthetic_team(index, num_teams, num_matches, rng):
+    """One team's matches/players/maps frames; opponents are other synthetic teams, so shared
+    matches show up in both teams' files the way they do in a real scrape"""
+    team = f"TEAM {index:04d}"
+    matches, players, maps = [], [], []
+    for number in range(1, num_matches + 1):
+        opponent = (index + number) % num_teams
+        low, high = sorted((index, opponent))
+        url = f"https://www.vlr.gg/{low * 100000 + high * 100 + number % 100}/team-{low}-vs-team-{high}"
+        won = rng.random() < 0.5
+        matches.append(dict(team_id=10000 + index, team_name=team, match_number=number,
+                            date=f"2025/{1 + number % 12:02d}/{1 + number % 28:02d}", result='W' if won else 'L',
+                            score='2:1' if won else '1:2', opponent=f"TEAM {opponent:04d}",
+                            tournament='Synthetic Cup', match_url=url))
+        for side in (low, high):
+            for slot in range(5):
+                players.append(dict(player_name=f"p{side}_{slot}", team=f"T{side}",
+                                    rating=round(rng.uniform(0.5, 1.6), 2), match_number=number, match_url=url))
+        for map_number in range(1, 4):
+            ours, theirs = (13, rng.randint(3, 11)) if rng.random() < 0.5 else (rng.randint(3, 11), 13)
+            maps.append(dict(team_name=team, match_number=number, overall_match_result='W' if won else 'L',
+                             map_number=map_number, map_name=rng.choice(MAPS), map_result='W' if ours > theirs else 'L',
+                             our_score=ours, their_score=theirs, map_score=f"{ours}-{theirs}", match_url=url))
+    return team, {'matches': pd.DataFrame(matches), 'players': pd.DataFrame(players), 'maps': pd.DataFrame(maps)}
+
+
+def write_raw_tree(base, num_teams, num_matches, fmt, seed=0):
+    """Lay out data/raw/vlr_data/{kind}/<TEAM>_<kind>.<fmt> for `num_teams` teams; returns total rows"""
+    rng = random.Random(seed)
+    rows = 0
+    for kind in KINDS:
+        (base / "data/raw/vlr_data" / kind).mkdir(parents=True, exist_ok=True)
+    for index in range(num_teams):
+        team, frames = synthetic_team(index, num_teams, num_matches, rng)
+        for kind, df in frames.items():
+            write_dataset(df, base / "data/raw/vlr_data" / kind / f"{team}_{kind}", kind, (fmt,))
+            rows += len(df)
+    return rows
+
+
+def sequential_load(base):
+    """The combine load before concurrent loading: every column of every file, one team at a time"""
+    frames = {kind: [] for kind in KINDS}
+    for team in combine_team_data.get_all_teams(base):
+        for kind in KINDS:
+            frames[kind].append(read_dataset(base / "data/raw/vlr_data" / kind / f"{team}_{kind}", kind))
+    return [pd.concat(frames[kind], ignore_index=True) for kind in KINDS]
+
+
+def concurrent_load(base, workers):
+    union = combine_team_data.load_teams(combine_team_data.get_all_teams(base), base, workers)
+    return [union[kind].drop(columns=combine_team_data.SOURCE) for kind in KINDS]
+
+
+def best_time(fn, repeat):
+    """Best wall time of `repeat` runs of fn() (load + dedupe/filter), and the last result"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = combine_team_data.filter_r2(*fn())
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark combine_team_data load time against team count")
+    parser.add_argument("--teams", type=str, default="25,50,100,200", help="Comma-separated team counts")
+    parser.add_argument("--matches", type=int, default=50, help="Matches per synthetic team")
+    parser.add_argument("--workers", type=int, default=combine_team_data.DEFAULT_WORKERS,
+                        help="Concurrent team loads for the new path")
+    parser.add_argument("--format", choices=("csv", "parquet"), default="csv", help="Format of the raw files")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per configuration (best is reported)")
+    parser.add_argument("--record", type=str, default=None, help="Append results to this CSV to track over time")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    print(f"{os.cpu_count()} CPUs, {args.matches} matches per team, raw files as {args.format}")
+    print(f"{'teams':>6} {'rows':>9} {'sequential':>11} {'1 worker':>9} {f'{args.workers} workers':>11} {'speedup':>8}")
+    results = []
+    for num_teams in [int(n) for n in args.teams.split(',')]:
+        with tempfile.TemporaryDirectory() as tmp:
+            base = Path(tmp)
+            rows = write_raw_tree(base, num_teams, args.matches, args.format)
+            sequential_s, expected = best_time(lambda: sequential_load(base), args.repeat)
+            single_s, _ = best_time(lambda: concurrent_load(base, 1), args.repeat)
+            pooled_s, combined = best_time(lambda: concurrent_load(base, args.workers), args.repeat)
+
+        # Same rows out of both paths (dtypes differ: the new path parses to the schema's types)
+        for old, new in zip(expected, combined):
+            pd.testing.assert_frame_equal(old.reset_index(drop=True), new.reset_index(drop=True),
+                                          check_dtype=False)
+        print(f"{num_teams:>6} {rows:>9} {sequential_s:>10.3f}s {single_s:>8.3f}s {pooled_s:>10.3f}s "
+              f"{sequential_s / pooled_s:>7.2f}x")
+        results.append((num_teams, rows, sequential_s, single_s, pooled_s))
+
+    if args.record:
+        new_file = not os.path.exists(args.record)
+        with open(args.record, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(['timestamp', 'format', 'teams', 'rows', 'workers', 'sequential_s', 'one_worker_s',
+                                 'pooled_s'])
+            for num_teams, rows, sequential_s, single_s, pooled_s in results:
+                writer.writerow([time.strftime('%Y-%m-%dT%H:%M:%S'), args.format, num_teams, rows, args.workers,
+                                 round(sequential_s, 4), round(single_s, 4), round(pooled_s, 4)])
+        print(f"Recorded to {args.record}")
+
+
+if __name__ == "__main__":
+    main()
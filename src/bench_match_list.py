@@ -0,0 +1,149 @@
+# BENCHMARK: MATCH-LIST PARSING FROM ONE page_source SNAPSHOT VS PER-ELEMENT WEBDRIVER CALLS
+# (runs over team match-list pages saved in the scraper's page cache, or, without one, the
+#  stand-in server's synthetic match lists)
+
+import argparse
+import contextlib
+import glob
+import gzip
+import io
+import json
+import os
+import tempfile
+import time
+
+from scrape_vlr import DEFAULT_CACHE_DIR, VLR_BASE_URL, collect_team_matches, element_match_cards, setup_driver, vct_teams
+from vlr_html import match_list_cards
+from vlr_stub_server import synthetic_site
+
+
+def cached_match_lists(cache_dir, limit=None):
+    """Yield (url, html) for every cached team match-list page"""
+    found = 0
+    for path in sorted(glob.glob(os.path.join(cache_dir, '*', '*.json.gz'))):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        if '/team/matches/' in snapshot.get('url', '') and snapshot.get('html'):
+            yield snapshot['url'], snapshot['html']
+            found += 1
+            if limit and found >= limit:
+                return
+
+
+def synthetic_match_lists(teams, matches, seed=0, limit=None):
+    """(url, html) for the match-list pages of a synthetic season between the first `teams` VCT teams"""
+    site = synthetic_site(dict(list(vct_teams.items())[:teams]), matches, seed=seed)
+    pages = [(VLR_BASE_URL + path, html) for path, html in sorted(site.items()) if path.startswith('/team/matches/')]
+    return pages[:limit] if limit else pages
+
+
+def team_from_url(url):
+    # https://www.vlr.gg/team/matches/{id}/{name}/?group=completed
+    parts = url.split('?')[0].split('/team/matches/')[1].split('/')
+    return int(parts[0]), parts[1]
+
+
+def run_quietly(fn, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args)
+
+
+def count_commands(driver):
+    """Wrap driver.execute so every WebDriver round trip is counted"""
+    counter = {'calls': 0}
+    execute = driver.execute
+
+    def counting_execute(*args, **kwargs):
+        counter['calls'] += 1
+        return execute(*args, **kwargs)
+
+    driver.execute = counting_execute
+    return counter
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark page_source match-list parsing against the per-element WebDriver scan"
+    )
+    parser.add_argument("--cache-dir", type=str, default=DEFAULT_CACHE_DIR, help="Scraper page cache")
+    parser.add_argument("--num-matches", type=int, default=50, help="Matches read per page")
+    parser.add_argument("--limit", type=int, default=None, help="Max pages to benchmark")
+    parser.add_argument("--teams", type=int, default=8, help="Synthetic fallback: number of tracked teams")
+    parser.add_argument("--matches", type=int, default=50, help="Synthetic fallback: matches per team")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic fallback: random seed")
+    parser.add_argument("--browser", action="store_true",
+                        help="Also time the WebDriver element scan (loads each page in Chrome)")
+    args = parser.parse_args()
+
+    pages = list(cached_match_lists(args.cache_dir, args.limit))
+    if not pages:
+        pages = synthetic_match_lists(args.teams, args.matches, args.seed, args.limit)
+        print(f"No cached match-list pages in {args.cache_dir} (run scrape_vlr.py to record some) - "
+              f"using {len(pages)} synthetic pages")
+
+    driver = setup_driver() if args.browser else None
+    counter = count_commands(driver) if driver else None
+    rows = []
+
+    try:
+        for url, html in pages:
+            team_id, team_name = team_from_url(url)
+
+            start = time.perf_counter()
+            source_matches = run_quietly(
+                lambda: collect_team_matches(match_list_cards(html), team_id, team_name, args.num_matches))
+            source_seconds = time.perf_counter() - start
+            row = {'url': url, 'matches': len(source_matches), 'source_s': source_seconds}
+
+            if driver:
+                # Serve the snapshot from disk; <base> keeps VLR's CSS so rendered text matches live
+                with tempfile.NamedTemporaryFile('w', suffix='.html', delete=False, encoding='utf-8') as f:
+                    f.write(html.replace('<head>', '<head><base href="https://www.vlr.gg/">', 1))
+                driver.get('file://' + f.name)
+
+                counter['calls'] = 0
+                start = time.perf_counter()
+                element_matches = run_quietly(
+                    lambda: collect_team_matches(element_match_cards(driver), team_id, team_name, args.num_matches))
+                row['element_s'] = time.perf_counter() - start
+                row['element_calls'] = counter['calls']
+
+                counter['calls'] = 0
+                start = time.perf_counter()
+                page_source = driver.page_source
+                run_quietly(lambda: collect_team_matches(match_list_cards(page_source), team_id, team_name, args.num_matches))
+                row['snapshot_s'] = time.perf_counter() - start
+                row['snapshot_calls'] = counter['calls']
+                row['identical'] = element_matches == source_matches
+                os.remove(f.name)
+
+            rows.append(row)
+    finally:
+        if driver:
+            driver.quit()
+
+    print(f"\n{'page':<60} {'matches':>7} {'source_s':>9}", end='')
+    print(f" {'element_s':>9} {'calls':>6} {'snapshot_s':>10} {'calls':>5} {'same':>5}" if driver else '')
+    for row in rows:
+        print(f"{row['url'][-60:]:<60} {row['matches']:>7} {row['source_s']:>9.3f}", end='')
+        if driver:
+            print(f" {row['element_s']:>9.2f} {row['element_calls']:>6} {row['snapshot_s']:>10.3f}"
+                  f" {row['snapshot_calls']:>5} {str(row['identical']):>5}")
+        else:
+            print()
+
+    total_source = sum(r['source_s'] for r in rows)
+    print(f"\n{len(rows)} pages - local parse: {total_source / len(rows) * 1000:.1f} ms/page")
+    if driver:
+        total_element = sum(r['element_s'] for r in rows)
+        total_snapshot = sum(r['snapshot_s'] for r in rows)
+        print(f"Element scan: {total_element / len(rows):.2f} s/page, "
+              f"{sum(r['element_calls'] for r in rows) / len(rows):.0f} WebDriver calls/page")
+        print(f"Snapshot (page_source + parse): {total_snapshot / len(rows):.3f} s/page, "
+              f"{sum(r['snapshot_calls'] for r in rows) / len(rows):.0f} WebDriver calls/page "
+              f"({total_element / total_snapshot:.0f}x faster)")
+        print(f"Identical rows on {sum(r['identical'] for r in rows)}/{len(rows)} pages")
+
+
+if __name__ == "__main__":
+    main()
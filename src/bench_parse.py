@@ -0,0 +1,113 @@
+# BENCHMARK: MATCH-PAGE PARSE THROUGHPUT (PAGES/SEC) OVER A SAVED PAGE CORPUS
+# (cached match pages from the scraper, or a directory of saved .html files; without either,
+#  the stand-in server's synthetic match pages, so the benchmark runs on a fresh checkout)
+
+import argparse
+import csv
+import glob
+import gzip
+import json
+import os
+import time
+
+from scrape_vlr import DEFAULT_CACHE_DIR, VLR_BASE_URL, vct_teams
+from vlr_html import match_page_parts
+from vlr_parse import parse_match_page
+from vlr_stub_server import synthetic_site
+
+
+def load_corpus(cache_dir=None, html_dir=None, limit=None):
+    """[(url, html)] for every cached match overview page and every .html file in html_dir"""
+    pages = []
+    if html_dir:
+        for path in sorted(glob.glob(os.path.join(html_dir, '**', '*.html'), recursive=True)):
+            with open(path, encoding='utf-8') as f:
+                pages.append((path, f.read()))
+    if cache_dir:
+        for path in sorted(glob.glob(os.path.join(cache_dir, '*', '*.json.gz'))):
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            url = snapshot.get('url', '')
+            if snapshot.get('tab') == 'overview' and snapshot.get('html') and '/team/matches/' not in url:
+                pages.append((url, snapshot['html']))
+    return pages[:limit] if limit else pages
+
+
+def synthetic_corpus(teams, matches, seed=0, limit=None):
+    """[(url, html)] for the match pages of a synthetic season between the first `teams` VCT teams"""
+    site = synthetic_site(dict(list(vct_teams.items())[:teams]), matches, seed=seed)
+    pages = [(VLR_BASE_URL + path, html) for path, html in sorted(site.items())
+             if not path.startswith('/team/matches/')]
+    return pages[:limit] if limit else pages
+
+
+def team_from_header(header_text):
+    """First team named in the match header, used as the perspective to parse from"""
+    for line in (header_text or '').split('\n'):
+        if line.strip():
+            return line.strip()
+    return 'Unknown'
+
+
+def parse_snapshot(url, html, parts):
+    """The scraper's parse of one snapshot (static HTML and browser paths alike)"""
+    return parse_match_page(parts, html, team_from_header(parts['header_text']), url, 1, 'W')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vlr_parse throughput over saved match pages")
+    parser.add_argument("--cache-dir", type=str, default=DEFAULT_CACHE_DIR, help="Scraper page cache")
+    parser.add_argument("--html-dir", type=str, default=None, help="Directory of saved match-page .html files")
+    parser.add_argument("--limit", type=int, default=None, help="Max pages to use")
+    parser.add_argument("--teams", type=int, default=8, help="Synthetic fallback: number of tracked teams")
+    parser.add_argument("--matches", type=int, default=50, help="Synthetic fallback: matches per team")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic fallback: random seed")
+    parser.add_argument("--repeat", type=int, default=5, help="Passes over the corpus (best pass is reported)")
+    parser.add_argument("--record", type=str, default=None, help="Append results to this CSV to track over time")
+    args = parser.parse_args()
+
+    pages = load_corpus(args.cache_dir, args.html_dir, args.limit)
+    if not pages:
+        pages = synthetic_corpus(args.teams, args.matches, args.seed, args.limit)
+        print(f"No saved match pages (pass --html-dir or run scrape_vlr.py to fill the page cache) - "
+              f"using {len(pages)} synthetic pages")
+
+    # Stage 1: HTML snapshot -> rendered text + map panels
+    html_times = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        snapshots = [(url, html, match_page_parts(html)) for url, html in pages]
+        html_times.append(time.perf_counter() - start)
+
+    # Stage 2: text -> players, maps and series score
+    text_times = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        results = [parse_snapshot(url, html, parts) for url, html, parts in snapshots]
+        text_times.append(time.perf_counter() - start)
+
+    html_s, text_s = min(html_times), min(text_times)
+    n = len(pages)
+    players = sum(len(r['players']) for r in results)
+    maps = sum(len(r['maps'] or []) for r in results)
+    unknown = sum(1 for r in results for m in r['maps'] or [] if m['map_result'] == 'Unknown')
+
+    print(f"Corpus: {n} pages, {players} player rows, {maps} map rows ({unknown} Unknown results)")
+    print(f"HTML snapshot parse: {n / html_s:8.1f} pages/sec ({html_s / n * 1000:.2f} ms/page)")
+    print(f"Text parse:          {n / text_s:8.1f} pages/sec ({text_s / n * 1000:.2f} ms/page)")
+    print(f"End to end:          {n / (html_s + text_s):8.1f} pages/sec")
+
+    if args.record:
+        new_file = not os.path.exists(args.record)
+        with open(args.record, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(['timestamp', 'pages', 'html_pages_per_sec', 'text_pages_per_sec',
+                                 'total_pages_per_sec', 'player_rows', 'map_rows', 'unknown_results'])
+            writer.writerow([time.strftime('%Y-%m-%dT%H:%M:%S'), n, round(n / html_s, 1), round(n / text_s, 1),
+                             round(n / (html_s + text_s), 1), players, maps, unknown])
+        print(f"Recorded to {args.record}")
+
+
+if __name__ == "__main__":
+    main()
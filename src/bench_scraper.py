@@ -0,0 +1,180 @@
+# BENCHMARK: END-TO-END SCRAPER THROUGHPUT AGAINST A LOCAL STAND-IN VLR.GG
+# (the real scrape_and_save_team code path, run over synthetic or recorded pages with no network)
+
+import argparse
+import contextlib
+import csv
+import io
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import scrape_vlr
+from driver_pool import DriverPool
+from http_fetch import HttpFetcher
+from match_registry import MatchRegistry
+from page_waits import wait_stats
+from rate_limit import HostRateLimiter
+from scrape_metrics import scrape_metrics
+from vlr_stub_server import StubServer, recorded_site, recorded_teams, synthetic_site
+
+# scrape_vlr functions that turn page HTML/text into rows - their time is reported as parse time
+PARSE_FUNCTIONS = ('collect_team_matches', 'match_page_parts', 'parse_match_page', 'parse_players',
+                   'parse_map_result', 'parse_single_map_data')
+
+
+class StageTimer:
+    """Thread-safe total seconds and call count per named stage"""
+
+    def __init__(self):
+        self.seconds = {}
+        self.calls = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds):
+        with self._lock:
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+            self.calls[stage] = self.calls.get(stage, 0) + 1
+
+    def wrap(self, stage, fn):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.add(stage, time.perf_counter() - start)
+        return timed
+
+
+def instrument(timer):
+    """Time driver startup and every parse function; returns a callable that undoes the patching"""
+    originals = {name: getattr(scrape_vlr, name) for name in PARSE_FUNCTIONS + ('setup_driver',)}
+    for name in PARSE_FUNCTIONS:
+        setattr(scrape_vlr, name, timer.wrap('parse', originals[name]))
+    scrape_vlr.setup_driver = timer.wrap('driver_startup', originals['setup_driver'])
+
+    def restore():
+        for name, fn in originals.items():
+            setattr(scrape_vlr, name, fn)
+    return restore
+
+
+def run_scrape(teams, num_matches, workers, pool, dirs, backfill_until=None):
+    """Scrape every team the way scrape_vlr.main() does; returns the per-team result dicts"""
+    if workers == 1:
+        return [scrape_vlr.scrape_and_save_team(name, team_id, num_matches, dirs, pool=pool,
+                                                backfill_until=backfill_until)
+                for name, team_id in teams.items()]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='matches') as match_executor, \
+         ThreadPoolExecutor(max_workers=workers, thread_name_prefix='worker') as team_executor:
+        futures = [team_executor.submit(scrape_vlr.scrape_and_save_team, name, team_id, num_matches, dirs,
+                                        pool=pool, executor=match_executor, backfill_until=backfill_until)
+                   for name, team_id in teams.items()]
+        return [future.result() for future in futures]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper end to end against a local stand-in VLR")
+    parser.add_argument("--recorded", nargs='?', const=scrape_vlr.DEFAULT_CACHE_DIR, default=None,
+                        help="Serve pages from the scraper's page cache instead of synthetic ones")
+    parser.add_argument("--teams", type=int, default=6, help="Synthetic: number of tracked teams")
+    parser.add_argument("--matches", type=int, default=10, help="Matches per team")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic: random seed")
+    parser.add_argument("--fetch", choices=("http", "browser"), default="http",
+                        help="Try plain HTTP first (falling back to Chrome), or load every page in Chrome")
+    parser.add_argument("--backfill-until", type=str, default=None,
+                        help="Walk each team's paginated history back to this date (YYYY/MM/DD) instead of "
+                             "reading the first --matches")
+    parser.add_argument("--workers", type=int, default=1, help="Teams (and match pages) scraped concurrently")
+    parser.add_argument("--pool-size", type=int, default=None, help="Chrome drivers kept open (default: --workers)")
+    parser.add_argument("--recycle-after", type=int, default=100, help="Restart a driver after this many pages")
+    parser.add_argument("--rate", type=float, default=1000.0, help="Max page loads per second to the stub server")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of delay the server adds per request")
+    parser.add_argument("--verbose", action="store_true", help="Show the scraper's own output")
+    parser.add_argument("--record", type=str, default=None, help="Append results to this CSV to track over time")
+    args = parser.parse_args()
+
+    if args.recorded:
+        pages = recorded_site(args.recorded)
+        teams = recorded_teams(pages, scrape_vlr.vct_teams)
+        if not teams:
+            print(f"No team match-list pages in {args.recorded} - run scrape_vlr.py first")
+            return
+    else:
+        teams = dict(list(scrape_vlr.vct_teams.items())[:args.teams])
+        pages = synthetic_site(teams, args.matches, seed=args.seed)
+    workers = max(args.workers, 1)
+
+    timer = StageTimer()
+    restore = instrument(timer)
+    output = io.StringIO() if not args.verbose else None
+
+    with StubServer(pages, latency=args.latency) as server, tempfile.TemporaryDirectory() as out_dir:
+        print(f"Stand-in VLR at {server.base_url}: {len(pages)} pages, {len(teams)} teams, "
+              f"{workers} worker(s), {args.fetch} fetch")
+
+        # Point the scraper at the stub for this run only: no page cache, a fresh match registry
+        scrape_vlr.VLR_BASE_URL = server.base_url
+        scrape_vlr.rate_limiter = HostRateLimiter(rate=args.rate, burst=workers)
+        scrape_vlr.page_cache = None
+        scrape_vlr.match_registry = MatchRegistry()
+        scrape_vlr.http_fetcher = HttpFetcher(max_concurrency=workers) if args.fetch == 'http' else None
+        dirs = tuple(os.path.join(out_dir, kind) for kind in ('matches', 'players', 'maps'))
+        for directory in dirs:
+            os.makedirs(directory)
+
+        pool = DriverPool(scrape_vlr.setup_driver, size=args.pool_size or workers, max_pages=args.recycle_after)
+        start = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(output) if output else contextlib.nullcontext():
+                results = run_scrape(teams, args.matches, workers, pool, dirs, args.backfill_until)
+        finally:
+            pool.shutdown()
+            restore()
+            if scrape_vlr.http_fetcher is not None:
+                scrape_vlr.http_fetcher.close()
+        elapsed = time.perf_counter() - start
+        pages_loaded = server.served + server.missing
+
+    matches = sum(r['matches'] for r in results)
+    failed = [r['team_name'] for r in results if not r['ok']]
+    startup = timer.seconds.get('driver_startup', 0.0)
+    parse = timer.seconds.get('parse', 0.0)
+    waits = wait_stats.summary()
+
+    print(f"\nTeams: {len(results) - len(failed)}/{len(results)} ok, {matches} matches, "
+          f"{sum(r['players'] for r in results)} player rows, {sum(r['maps'] for r in results)} map rows")
+    if failed:
+        print(f"Failed teams: {', '.join(failed)}")
+    print(f"Wall time:       {elapsed:.2f}s")
+    print(f"Pages loaded:    {pages_loaded} ({server.missing} not found), {pages_loaded / elapsed:.2f} pages/sec")
+    print(f"Per match:       {elapsed / matches:.3f}s" if matches else "Per match:       n/a")
+    print(f"Match pages:     {scrape_vlr.match_registry.fetched} fetched, {scrape_vlr.match_registry.shared} shared")
+    if scrape_vlr.http_fetcher is not None:
+        print(f"HTTP tier:       {scrape_vlr.http_fetcher.fetched} pages, "
+              f"{scrape_vlr.http_fetcher.fallbacks} fell back to the browser")
+    print(f"Driver startup:  {timer.calls.get('driver_startup', 0)} drivers, {startup:.2f}s "
+          f"({startup / elapsed:.0%} of wall time)")
+    print(f"Parse:           {parse:.2f}s over {timer.calls.get('parse', 0)} calls ({parse / elapsed:.0%} of wall time)")
+    for kind, stats in waits.items():
+        print(f"Waits ({kind}): p50 {stats['p50']:.3f}s, p90 {stats['p90']:.3f}s, {stats['timeouts']} timeouts")
+    scrape_metrics.print_summary()
+
+    if args.record:
+        new_file = not os.path.exists(args.record)
+        with open(args.record, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(['timestamp', 'source', 'fetch', 'teams', 'workers', 'pages', 'matches', 'wall_s',
+                                 'pages_per_sec', 'sec_per_match', 'driver_startup_s', 'parse_s'])
+            writer.writerow([time.strftime('%Y-%m-%dT%H:%M:%S'), 'recorded' if args.recorded else 'synthetic', args.fetch,
+                             len(teams), workers, pages_loaded, matches, round(elapsed, 3),
+                             round(pages_loaded / elapsed, 2), round(elapsed / matches, 4) if matches else None,
+                             round(startup, 3), round(parse, 3)])
+        print(f"Recorded to {args.record}")
+
+
+if __name__ == "__main__":
+    main()
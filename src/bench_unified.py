@@ -0,0 +1,107 @@
+# BENCHMARK: UNIFIED-DATASET AGGREGATION, PER-GROUP LAMBDAS VS GROUPED ARRAY OPERATIONS
+# (the R2_processed tables replicated 1x/10x/100x under fresh match URLs)
+
+import argparse
+import csv
+import logging
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+
+import create_r2_unified
+from dataset_store import read_dataset, to_arrow
+
+
+def legacy_unified(df_matches, df_maps, df_players):
+    """create_r2_unified_dataset's aggregation before vectorizing: tolist() per group and str.count per row"""
+    df_map_grouped = (
+        df_maps
+        .groupby(["team_name", "match_number", "match_url"], as_index=False)
+        .agg({
+            "map_name":    lambda s: s.tolist(),
+            "map_result":  lambda s: s.tolist(),
+            "our_score":   lambda s: s.tolist(),
+            "their_score": lambda s: s.tolist(),
+            "map_number":  'count'
+        })
+        .rename(columns={"map_name": "maps_played", "map_result": "map_results", "our_score": "our_scores",
+                         "their_score": "their_scores", "map_number": "total_maps"})
+    )
+    df_map_grouped['maps_won'] = df_map_grouped['map_results'].apply(lambda x: x.count('W') if isinstance(x, list) else 0)
+    df_map_grouped['maps_lost'] = df_map_grouped['map_results'].apply(lambda x: x.count('L') if isinstance(x, list) else 0)
+    df_player_grouped = (
+        df_players
+        .groupby(["match_url"], as_index=False)
+        .agg({"player_name": lambda s: s.tolist(), "team": lambda s: s.tolist(), "rating": lambda s: s.tolist()})
+        .rename(columns={"player_name": "all_players", "team": "all_player_teams", "rating": "all_player_ratings"})
+    )
+    df_unified = df_matches.merge(df_map_grouped, on=["team_name", "match_url"], how="left", suffixes=('_x', '_y'))
+    df_unified = df_unified.merge(df_player_grouped, on=["match_url"], how="left")
+    return df_unified[create_r2_unified.UNIFIED_SCHEMA.names]
+
+
+def replicate(frames, factor):
+    """Each table `factor` times over, every copy under its own match URLs (so groups grow in number, not size)"""
+    scaled = []
+    for df in frames:
+        copies = [df.assign(match_url=df['match_url'] + f"#{i}") if i else df for i in range(factor)]
+        scaled.append(pd.concat(copies, ignore_index=True))
+    return scaled
+
+
+def timed(fn, *args, repeat=1):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the unified-dataset aggregation at scaled data sizes")
+    parser.add_argument("--base-dir", type=Path, default=Path(__file__).parent.parent, help="Project root directory")
+    parser.add_argument("--scales", type=str, default="1,10,100", help="Comma-separated replication factors")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per configuration (best is reported)")
+    parser.add_argument("--skip-legacy-above", type=int, default=100,
+                        help="Do not time the lambda path above this scale (it takes minutes)")
+    parser.add_argument("--record", type=str, default=None, help="Append results to this CSV to track over time")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    r2_dir = args.base_dir / "data/processed/R2_processed"
+    base_frames = [read_dataset(r2_dir / f"R2_all_{kind}", kind) for kind in ("matches", "maps", "players")]
+
+    print(f"{'scale':>6} {'player rows':>12} {'lambdas':>9} {'vectorized':>11} {'speedup':>8}")
+    results = []
+    for scale in [int(n) for n in args.scales.split(',')]:
+        frames = replicate(base_frames, scale)
+        new_s, unified = timed(create_r2_unified.build_unified, *frames, repeat=args.repeat)
+        legacy_s = None
+        if scale <= args.skip_legacy_above:
+            legacy_s, expected = timed(legacy_unified, *frames, repeat=1 if scale > 10 else args.repeat)
+            # Same dataset once written: the Arrow tables must match exactly
+            if not to_arrow(expected, "unified").equals(to_arrow(unified, "unified")):
+                raise SystemExit(f"Vectorized output differs from the lambda path at scale {scale}")
+
+        legacy = f"{legacy_s:>8.3f}s" if legacy_s is not None else f"{'-':>9}"
+        speedup = f"{legacy_s / new_s:>7.1f}x" if legacy_s is not None else f"{'-':>8}"
+        print(f"{scale:>5}x {len(frames[2]):>12} {legacy} {new_s:>10.3f}s {speedup}")
+        results.append((scale, len(frames[2]), legacy_s, new_s))
+
+    if args.record:
+        new_file = not os.path.exists(args.record)
+        with open(args.record, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(['timestamp', 'scale', 'player_rows', 'lambda_s', 'vectorized_s'])
+            for scale, rows, legacy_s, new_s in results:
+                writer.writerow([time.strftime('%Y-%m-%dT%H:%M:%S'), scale, rows,
+                                 round(legacy_s, 4) if legacy_s is not None else '', round(new_s, 4)])
+        print(f"Recorded to {args.record}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# CONTENT-HASH MANIFEST FOR THE INCREMENTAL COMBINE STEP
+# (which raw team files combine_team_data.py last merged, so a re-run only reloads the teams
+#  whose maps/matches/players files actually changed)
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from dataset_store import dataset_file
+
+KINDS = ("maps", "matches", "players")
+
+HASH_CHUNK = 1 << 20
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CombineManifest:
+    """
+    JSON manifest: {"inputs": {TEAM: {kind: {"path", "size", "mtime_ns", "sha256", "rows"}}},
+                    "updated_at": ...}
+    A file whose size and mtime match the manifest is not re-hashed; a touched file with the
+    same content hashes equal and still counts as unchanged
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.inputs: Dict[str, dict] = {}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                self.inputs = json.load(f).get("inputs", {})
+
+    def team_state(self, team: str, raw_dir: Path) -> Optional[dict]:
+        """Current {kind: file state} of a team's raw files, or None if any of them is missing"""
+        previous = self.inputs.get(team, {})
+        state = {}
+        for kind in KINDS:
+            path = dataset_file(raw_dir / kind / f"{team}_{kind}")
+            if path is None:
+                return None
+            stat = path.stat()
+            known = previous.get(kind, {})
+            if known.get("path") == str(path) and known.get("size") == stat.st_size \
+                    and known.get("mtime_ns") == stat.st_mtime_ns:
+                sha256 = known["sha256"]
+            else:
+                sha256 = file_sha256(path)
+            state[kind] = {"path": str(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                           "sha256": sha256, "rows": known.get("rows") if known.get("sha256") == sha256 else None}
+        return state
+
+    def changed(self, team: str, state: dict) -> bool:
+        """True if any of the team's files has different content (or the team is new)"""
+        previous = self.inputs.get(team)
+        if previous is None:
+            return True
+        return any(previous.get(kind, {}).get("sha256") != state[kind]["sha256"] for kind in KINDS)
+
+    def save(self):
+        """Write atomically, so an interrupted combine never leaves a half-written manifest"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"inputs": self.inputs, "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, self.path)
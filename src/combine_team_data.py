@@ -1,80 +1,287 @@
-
 # COMBINES RAW VLR TEAM CSVs (MAPS, MATCHES, PLAYERS) INTO MASTER FILES, FILTERING OUT MATCHES WITHOUT PLAYER DATA
+# (incremental: only teams whose raw files changed since the last run are reloaded, see combine_manifest.py;
+#  teams are loaded concurrently, parsing only the schema's columns straight to their dtypes; the R2_all_*
+#  outputs are partitioned per team, so a refresh rewrites only the teams whose rows it can change)
 
 
 
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import argparse
 import logging
-from typing import List, Tuple
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from combine_manifest import KINDS, CombineManifest
+from compact_dtypes import compact_with_report
+from dataset_store import FORMAT_CHOICES, SCHEMAS, dataset_file, parse_formats, read_dataset, write_dataset
+from partitioned_store import read_partitions
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Team each row of the combined union came from (a categorical column over the team names)
+SOURCE = "_source"
+
+# R2 output per kind: a directory with one part per team, <name>/<TEAM>.parquet (and/or .csv)
+OUTPUTS = {"matches": "R2_all_matches", "maps": "R2_all_maps", "players": "R2_all_players"}
+
+# Every match URL and player key in each team's staged rows, so a refresh can tell which other
+# teams share the matches it touched without reading their rows
+URL_INDEX = "url_index.parquet"
+
+# A player row of a shared match is stored once, by the first team (in name order) that has it
+PLAYER_KEY = ['match_url', 'team', 'player_name']
+
+# Teams loaded at once; file reads and the CSV/Parquet parsers release the GIL, so threads overlap
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+
 def get_all_teams(base: Path) -> List[str]:
     """Extract all unique team names from the data directory"""
     teams = set()
     
-    # Check maps directory for team files
+    # Check maps directory for team files (Parquet or CSV)
     maps_dir = base / "data/raw/vlr_data/maps"
     if maps_dir.exists():
-        for file in maps_dir.glob("*_maps.csv"):
-            team_name = file.stem.replace("_maps", "")
-            teams.add(team_name)
+        for pattern in ("*_maps.parquet", "*_maps.csv"):
+            for file in maps_dir.glob(pattern):
+                team_name = file.stem.replace("_maps", "")
+                teams.add(team_name)
     
     return sorted(list(teams))
 
 def load_team_data(team: str, base: Path) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-    """Load all three CSV files for a given team"""
-    maps_file    = base / "data/raw/vlr_data/maps"    / f"{team}_maps.csv"
-    matches_file = base / "data/raw/vlr_data/matches" / f"{team}_matches.csv"
-    players_file = base / "data/raw/vlr_data/players" / f"{team}_players.csv"
+    """Load all three datasets for a given team (whichever of Parquet/CSV is newer)"""
+    maps_stem    = base / "data/raw/vlr_data/maps"    / f"{team}_maps"
+    matches_stem = base / "data/raw/vlr_data/matches" / f"{team}_matches"
+    players_stem = base / "data/raw/vlr_data/players" / f"{team}_players"
     
+    # Only the columns the R2 outputs keep are parsed
     try:
-        df_maps    = pd.read_csv(maps_file)
-        df_matches = pd.read_csv(matches_file)
-        df_players = pd.read_csv(players_file)
+        df_maps    = read_dataset(maps_stem, "maps", columns=SCHEMAS["maps"].names, typed=True)
+        df_matches = read_dataset(matches_stem, "matches", columns=SCHEMAS["matches"].names, typed=True)
+        df_players = read_dataset(players_stem, "players", columns=SCHEMAS["players"].names, typed=True)
         return df_maps, df_matches, df_players
     except FileNotFoundError as e:
         logger.warning(f"Missing file for team {team}: {e}")
         return None, None, None
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Save R2 data - filter out matches without player data"
-    )
-    parser.add_argument(
-        "--base-dir",
-        type=Path,
-        default=Path(__file__).parent.parent,
-        help="Project root directory"
-    )
-    args = parser.parse_args()
+def load_partitioned_data(root: Path) -> Dict[str, pd.DataFrame]:
+    """
+    {kind: every row of the scraper's partitioned dataset (--partitioned), tagged with the team
+    partition it came from}, including parts a running or interrupted scrape is still writing
+    """
+    teams = sorted({path.name[len("team="):] for path in root.glob("*/team=*")})
+    frames = {kind: [read_partitions(str(root), kind, teams=[team], include_in_progress=True)
+                     .reindex(columns=SCHEMAS[kind].names) for team in teams]
+              for kind in KINDS}
+    return tag_sources(frames, teams)
+
+def load_teams(teams: List[str], base: Path, workers: int = DEFAULT_WORKERS) -> Dict[str, pd.DataFrame]:
+    """
+    {kind: every row of `teams`' raw files, tagged with the team they came from}
+    Up to `workers` teams are read at once; rows still come out in `teams` order
+    """
+    frames = {kind: [] for kind in KINDS}
+    sources = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        loaded = pool.map(lambda team: load_team_data(team, base), teams)
+        for team, (df_maps, df_matches, df_players) in zip(teams, loaded):
+            logger.info(f"Processing team: {team}")
+            if df_maps is None:
+                continue
+            sources.append(team)
+            for kind, df in zip(KINDS, (df_maps, df_matches, df_players)):
+                frames[kind].append(df)
+    
+    return tag_sources(frames, sources)
+
+def tag_sources(frames: Dict[str, List[pd.DataFrame]], sources: List[str]) -> Dict[str, pd.DataFrame]:
+    """{kind: the frames (one per source team, in `sources` order) as one union with a SOURCE column}"""
+    union = {}
+    for kind, dfs in frames.items():
+        if not dfs:
+            union[kind] = pd.DataFrame(columns=SCHEMAS[kind].names + [SOURCE])
+            continue
+        # One categorical column for the whole union instead of a copy of every team's frame
+        union[kind] = pd.concat(dfs, ignore_index=True)
+        codes = np.repeat(np.arange(len(sources)), [len(df) for df in dfs])
+        union[kind][SOURCE] = pd.Categorical.from_codes(codes, categories=sources)
+    return union
+
+def output_parts(output_dir: Path, team: str, formats) -> List[Path]:
+    return [output_dir / OUTPUTS[kind] / f"{team}.{fmt}" for kind in KINDS for fmt in formats]
+
+def update_staging(base: Path, output_dir: Path, formats, full: bool = False, workers: int = DEFAULT_WORKERS
+                   ) -> Optional[Tuple[Dict[str, pd.DataFrame], List[str], List[str], bool, CombineManifest]]:
+    """
+    Bring the staged copy of every team's raw rows up to date
+    Returns None if no team's raw files changed since the last run (and every team's R2 output
+    parts exist), else (fresh, changed, removed, full, manifest): the union of the reloaded
+    teams' rows, the teams reloaded and removed, whether this is a full rebuild, and the updated
+    manifest
+    Rows are staged per team (combine_staging/<kind>/<TEAM>.parquet), so only new or changed
+    teams are read from their raw files and rewritten; everyone else's staged file is reused
+    as it is
+    The manifest is not saved here: the caller saves it once the R2 outputs are written, so an
+    interrupted run is redone instead of leaving stale outputs that look up to date
+    """
+    raw_dir = base / "data/raw/vlr_data"
+    staging_dir = output_dir / "combine_staging"
+    manifest = CombineManifest(output_dir / "combine_manifest.json")
+    
+    teams = get_all_teams(base)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        states = dict(zip(teams, pool.map(lambda team: manifest.team_state(team, raw_dir), teams)))
+    states = {team: state for team, state in states.items() if state is not None}
     
-    # Load all data
-    all_maps = []
-    all_matches = []
-    all_players = []
+    # Without a manifest or URL index there is nothing to refresh incrementally against
+    full = full or not manifest.inputs or not (staging_dir / URL_INDEX).exists()
     
-    teams = get_all_teams(args.base_dir)
-    logger.info(f"Found {len(teams)} teams to process")
+    def staged(team):
+        return all(dataset_file(staging_dir / kind / team) is not None for kind in KINDS) \
+            and all(path.exists() for path in output_parts(output_dir, team, formats))
     
-    for team in teams:
-        logger.info(f"Processing team: {team}")
-        df_maps, df_matches, df_players = load_team_data(team, args.base_dir)
+    changed = [team for team, state in states.items()
+               if full or manifest.changed(team, state) or not staged(team)]
+    removed = sorted(set(manifest.inputs) - set(states))
+    logger.info(f"Found {len(states)} teams: {len(changed)} new or changed, {len(removed)} removed, "
+                f"{len(states) - len(changed)} unchanged")
+    if not changed and not removed:
+        return None
+    
+    fresh = load_teams(changed, base, workers)
+    for kind in KINDS:
+        (staging_dir / kind).mkdir(parents=True, exist_ok=True)
+        # The single-file staging of earlier versions is superseded by the per-team files
+        for legacy in (staging_dir / f"{kind}.parquet", staging_dir / f"{kind}.csv"):
+            legacy.unlink(missing_ok=True)
+        for team in removed:
+            for path in (staging_dir / kind).glob(f"{team}.*"):
+                path.unlink()
         
-        if df_maps is not None:
-            all_maps.append(df_maps)
-            all_matches.append(df_matches)
-            all_players.append(df_players)
+        rows = fresh[kind][SOURCE].value_counts()
+        by_team = dict(tuple(fresh[kind].groupby(SOURCE, observed=True, sort=False))) if rows.any() else {}
+        for team in changed:
+            df = by_team.get(team, fresh[kind].iloc[0:0]).drop(columns=SOURCE)
+            write_dataset(df, staging_dir / kind / team, kind)
+            states[team][kind]["rows"] = int(rows.get(team, 0))
+    
+    manifest.inputs = states
+    return fresh, changed, removed, full, manifest
+
+def url_index(union: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    (match_url, SOURCE, team, player_name, players) for each team of a tagged union: a row per
+    player key in its player rows (players=True) and per match URL in its matches/maps rows
+    """
+    players = union["players"][PLAYER_KEY + [SOURCE]].astype(str).drop_duplicates().assign(players=True)
+    urls = pd.concat([union[kind][["match_url", SOURCE]].astype(str) for kind in ("matches", "maps")],
+                     ignore_index=True).drop_duplicates()
+    urls = urls.assign(team="", player_name="", players=False)
+    return pd.concat([players, urls], ignore_index=True)[["match_url", SOURCE, "team", "player_name", "players"]]
+
+def r2_rows(frames: Dict[str, pd.DataFrame], team: str, owners: pd.Series) -> Dict[str, pd.DataFrame]:
+    """
+    One team's part of the R2 outputs, from its staged rows and the owner of every player key
+    Matches and maps are kept if the match has player data in any team's rows; player rows are
+    kept if this team owns their key, once each - the same rows as deduping the whole union
+    """
+    keys = pd.MultiIndex.from_frame(frames["players"][PLAYER_KEY].astype(str))
+    players = frames["players"][keys.isin(owners.index[owners == team])]
+    urls_with_players = owners.index.unique(level="match_url")
+    return {
+        "matches": frames["matches"][frames["matches"]["match_url"].astype(str).isin(urls_with_players)],
+        "maps": frames["maps"][frames["maps"]["match_url"].astype(str).isin(urls_with_players)],
+        "players": players.drop_duplicates(subset=PLAYER_KEY),
+    }
+
+def update_outputs(output_dir: Path, fresh: Dict[str, pd.DataFrame], changed: List[str], removed: List[str],
+                   formats, full: bool = False) -> dict:
+    """
+    Rewrite the R2 output parts of the teams a refresh can affect: the reloaded ones, and those
+    sharing a match with them whose stored player rows or kept matches change as a result
+    Other teams' parts are not read or written. With full=True every part is rebuilt from
+    `fresh` and parts of teams not in it are removed. Saves the URL index last; returns counts
+    """
+    staging_dir = output_dir / "combine_staging"
+    index_path = staging_dir / URL_INDEX
+    replaced = set(changed) | set(removed)
+    
+    old = url_index({kind: pd.DataFrame(columns=SCHEMAS[kind].names + [SOURCE]) for kind in KINDS})
+    if not full:
+        old = pd.read_parquet(index_path)
+    else:
+        existing = {path.stem for name in OUTPUTS.values() for path in (output_dir / name).glob("*.*")}
+        removed = sorted(existing - set(changed))
+    new_rows = url_index(fresh)
+    index = pd.concat([old[~old[SOURCE].isin(replaced)], new_rows], ignore_index=True)
+    
+    # Besides the reloaded teams, only a team that gains or loses a player key's ownership, or
+    # holds a match that gains or loses player data, has different R2 rows than last time
+    old_owners = old[old["players"]].groupby(PLAYER_KEY)[SOURCE].min()
+    owners = index[index["players"]].groupby(PLAYER_KEY)[SOURCE].min()
+    keys = old_owners.index.union(owners.index)
+    before, after = old_owners.reindex(keys).fillna(""), owners.reindex(keys).fillna("")
+    moved = before != after
+    flipped = set(old_owners.index.unique(level="match_url")) ^ set(owners.index.unique(level="match_url"))
+    affected = set(changed) | set(before[moved]) | set(after[moved])
+    affected |= set(index.loc[index["match_url"].isin(flipped), SOURCE])
+    affected.discard("")
+    affected = sorted(affected - set(removed))
     
-    # Combine all dataframes
-    logger.info("Combining all dataframes...")
-    combined_maps = pd.concat(all_maps, ignore_index=True)
-    combined_matches = pd.concat(all_matches, ignore_index=True)
-    combined_players = pd.concat(all_players, ignore_index=True)
+    by_team = {kind: dict(tuple(fresh[kind].groupby(SOURCE, observed=True, sort=False))) for kind in KINDS}
+    counts = {kind: 0 for kind in KINDS}
+    dropped = 0
+    for team in affected:
+        frames = {}
+        for kind in KINDS:
+            if team in changed:
+                df = by_team[kind].get(team, fresh[kind].iloc[0:0]).drop(columns=SOURCE)
+            else:
+                df = read_dataset(staging_dir / kind / team, kind)
+            frames[kind] = df.reindex(columns=SCHEMAS[kind].names) if df.empty else df
+        rows = r2_rows(frames, team, owners)
+        dropped += len(frames["players"]) - len(rows["players"])
+        for kind, df in rows.items():
+            (output_dir / OUTPUTS[kind]).mkdir(parents=True, exist_ok=True)
+            write_dataset(df, output_dir / OUTPUTS[kind] / team, kind, formats)
+            counts[kind] += len(df)
+    
+    for name in OUTPUTS.values():
+        # The single-file outputs of earlier versions are superseded by the per-team parts
+        for legacy in (output_dir / f"{name}.parquet", output_dir / f"{name}.csv"):
+            legacy.unlink(missing_ok=True)
+        for team in removed:
+            for path in (output_dir / name).glob(f"{team}.*"):
+                path.unlink()
+    
+    # Written under a temporary name and renamed, so an interrupted run never leaves half an index
+    staging_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=staging_dir, suffix=".tmp")
+    os.close(fd)
+    index.to_parquet(tmp, index=False)
+    os.replace(tmp, index_path)
+    
+    if dropped:
+        logger.info(f"Dropped {dropped} duplicate player rows from shared matches")
+    return dict(affected=len(affected), removed=len(removed), rows=counts,
+                matches=owners.index.get_level_values("match_url").nunique(),
+                teams=index[SOURCE].nunique())
+
+def filter_r2(combined_maps: pd.DataFrame, combined_matches: pd.DataFrame,
+              combined_players: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Dedupe shared-match players and keep only matches (and their maps) that have player data"""
+    # The scraper writes a shared match's players to one team's file per run, but files from
+    # separate runs (or from before the match registry) can still both hold them - keep each once
+    before = len(combined_players)
+    combined_players = combined_players.drop_duplicates(subset=PLAYER_KEY)
+    if before > len(combined_players):
+        logger.info(f"Dropped {before - len(combined_players)} duplicate player rows from shared matches")
     
     # Get URLs that have player data
     urls_with_players = set(combined_players['match_url'].unique())
@@ -82,21 +289,88 @@ def main():
     # Filter everything to only include matches with player data
     filtered_matches = combined_matches[combined_matches['match_url'].isin(urls_with_players)]
     filtered_maps = combined_maps[combined_maps['match_url'].isin(urls_with_players)]
+    return filtered_maps, filtered_matches, combined_players
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Save R2 data - filter out matches without player data"
+    )
+    parser.add_argument(
+        "--base-dir",
+        type=Path,
+        default=Path(__file__).parent.parent,
+        help="Project root directory"
+    )
+    parser.add_argument(
+        "--partitions",
+        type=Path,
+        default=None,
+        help="Read the scraper's partitioned dataset (e.g. data/raw/vlr_data/partitions) instead of "
+             "the per-team datasets; works on a run that is still in progress"
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMAT_CHOICES,
+        default="parquet",
+        help="File format of the R2_processed outputs"
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Reload every team instead of only the ones whose raw files changed"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Teams to load concurrently"
+    )
+    parser.add_argument(
+        "--memory-report",
+        type=Path,
+        default=None,
+        help="Append per-column memory use before/after dtype compaction to this JSON-lines file"
+    )
+    args = parser.parse_args()
     
-    # Save to R2_processed folder
     output_dir = args.base_dir / "data/processed/R2_processed"
     output_dir.mkdir(parents=True, exist_ok=True)
+    formats = parse_formats(args.format)
+    
+    if args.partitions is not None:
+        root = args.partitions if args.partitions.is_absolute() else args.base_dir / args.partitions
+        logger.info(f"Loading partitioned dataset from {root}")
+        fresh = load_partitioned_data(root)
+        if fresh["players"].empty:
+            logger.error(f"No player rows under {root}")
+            return
+        changed, removed, full = list(fresh["players"][SOURCE].cat.categories), [], True
+        manifest = None
+    else:
+        update = update_staging(args.base_dir, output_dir, formats, full=args.full, workers=args.workers)
+        if update is None:
+            print(f"\n No team data changed - R2 data in {output_dir} is up to date")
+            return
+        fresh, changed, removed, full, manifest = update
+    
+    # Compact dtypes before deduping/filtering; the schemas cast them back on write
+    fresh = {kind: compact_with_report(fresh[kind], f"combine/{kind}", args.memory_report) for kind in KINDS}
     
-    filtered_matches.to_csv(output_dir / "R2_all_matches.csv", index=False)
-    filtered_maps.to_csv(output_dir / "R2_all_maps.csv", index=False)
-    combined_players.to_csv(output_dir / "R2_all_players.csv", index=False)
+    summary = update_outputs(output_dir, fresh, changed, removed, formats, full=full)
+    if manifest is not None:
+        # Only now that the output parts are written do the new inputs count as combined
+        manifest.save()
+    else:
+        # The outputs no longer come from the raw team files: the next run from them starts over
+        (output_dir / "combine_manifest.json").unlink(missing_ok=True)
     
     # Print summary
-    print(f"\n Saved R2 data to {output_dir}")
-    print(f"Matches: {len(filtered_matches)} rows")
-    print(f"Maps: {len(filtered_maps)} rows")
-    print(f"Players: {len(combined_players)} rows")
-    print(f"Unique matches: {filtered_matches['match_url'].nunique()}")
+    print(f"\n Saved R2 data to {output_dir} ({', '.join(formats)}): parts of {summary['affected']} of "
+          f"{summary['teams']} teams rewritten, {summary['removed']} removed")
+    print(f"Matches: {summary['rows']['matches']} rows rewritten")
+    print(f"Maps: {summary['rows']['maps']} rows rewritten")
+    print(f"Players: {summary['rows']['players']} rows rewritten")
+    print(f"Matches with player data: {summary['matches']}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,123 @@
+# COMPACT IN-MEMORY DTYPES AND PER-STAGE MEMORY REPORTS
+# (repeated strings become categoricals, integers the smallest type that holds them, floats
+#  float32 where no value changes; every stage can log bytes per column before/after)
+
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# A string column is stored as a categorical when it has at most this many distinct values per row
+CATEGORY_MAX_RATIO = 0.5
+
+# float32 represents every integer up to 2**24 exactly (round scores, map counts)
+FLOAT32_EXACT_LIMIT = 2 ** 24
+
+# Dates stay strings: every stage parses them or takes their min/max, which an unordered
+# categorical does not support
+DEFAULT_SKIP = ("date",)
+
+
+def _is_string_column(series: pd.Series) -> bool:
+    if series.dtype != object:
+        return False
+    first = series.dropna()[:1]
+    return not first.empty and isinstance(first.iloc[0], str)
+
+
+def compact(df: pd.DataFrame, lossy_float32: Iterable[str] = (), skip: Iterable[str] = DEFAULT_SKIP) -> pd.DataFrame:
+    """
+    Copy of `df` with compact dtypes; values are unchanged unless a column is named in lossy_float32
+    - string columns with few distinct values -> category (team, map and tournament names, results, URLs
+      of the long tables)
+    - integer columns -> the smallest signed int type that holds their values (nullable stays nullable)
+    - float columns whose values are all integers below 2**24 -> float32 (exact)
+    - columns in lossy_float32 (derived features, where ~7 significant digits are plenty) -> float32
+    List columns and the columns in `skip` are left alone. Code grouping by a categorical column
+    should pass observed=True, so groups that do not occur are not generated
+    """
+    lossy_float32, skip = set(lossy_float32), set(skip)
+    out = {}
+    for column in df.columns:
+        series = df[column]
+        if column in skip:
+            out[column] = series
+        elif _is_string_column(series):
+            distinct = series.nunique(dropna=True)
+            out[column] = series.astype("category") if distinct <= CATEGORY_MAX_RATIO * len(series) else series
+        elif pd.api.types.is_integer_dtype(series.dtype) and not isinstance(series.dtype, pd.ArrowDtype):
+            out[column] = _downcast_int(series)
+        elif pd.api.types.is_float_dtype(series.dtype) and series.dtype != np.float32:
+            values = series.dropna()
+            exact = ((values % 1 == 0) & (values.abs() < FLOAT32_EXACT_LIMIT)).all()
+            out[column] = series.astype(np.float32) if column in lossy_float32 or exact else series
+        else:
+            out[column] = series
+    return pd.DataFrame(out, index=df.index)
+
+
+def _downcast_int(series: pd.Series) -> pd.Series:
+    if series.empty:
+        return series
+    low, high = series.min(), series.max()
+    nullable = isinstance(series.dtype, pd.api.extensions.ExtensionDtype)
+    for bits in (8, 16, 32):
+        info = np.iinfo(f"int{bits}")
+        if info.min <= low and high <= info.max:
+            return series.astype(f"Int{bits}" if nullable else f"int{bits}")
+    return series
+
+
+def memory_report(stage: str, before: pd.DataFrame, after: pd.DataFrame,
+                  path: Optional[Path] = None, top: int = 5) -> dict:
+    """
+    Bytes per column (deep, so strings are counted) before and after compaction
+    Logs the totals and the biggest columns; with `path`, appends the full report as one JSON line
+    """
+    bytes_before = before.memory_usage(index=False, deep=True)
+    bytes_after = after.memory_usage(index=False, deep=True)
+    columns = {
+        column: {
+            "dtype_before": str(before[column].dtype),
+            "dtype_after": str(after[column].dtype),
+            "bytes_before": int(bytes_before[column]),
+            "bytes_after": int(bytes_after[column]),
+        }
+        for column in before.columns
+    }
+    report = {
+        "stage": stage,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "rows": len(before),
+        "bytes_before": int(bytes_before.sum()),
+        "bytes_after": int(bytes_after.sum()),
+        "columns": columns,
+    }
+
+    saved = report["bytes_before"] - report["bytes_after"]
+    logger.info(f"[memory] {stage}: {len(before)} rows, {report['bytes_before'] / 1e6:.2f} MB -> "
+                f"{report['bytes_after'] / 1e6:.2f} MB ({saved / max(report['bytes_before'], 1):.0%} saved)")
+    for column in bytes_before.sort_values(ascending=False).index[:top]:
+        entry = columns[column]
+        logger.info(f"[memory]   {column:<24} {entry['dtype_before']:>10} {entry['bytes_before'] / 1e6:8.3f} MB -> "
+                    f"{entry['dtype_after']:>10} {entry['bytes_after'] / 1e6:8.3f} MB")
+
+    if path is not None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(report) + "\n")
+    return report
+
+
+def compact_with_report(df: pd.DataFrame, stage: str, path: Optional[Path] = None, **kwargs) -> pd.DataFrame:
+    """compact(df, **kwargs), logging memory_report for `stage`"""
+    compacted = compact(df, **kwargs)
+    memory_report(stage, df, compacted, path)
+    return compacted
@@ -1,71 +1,33 @@
 
 ### USED TO CREATE A UNIFIED R2 DATASET WITH SPECIFIED FIELDS ###
-# (combines all of raw / R2_all_maps, matches and players into giant CSV)
+# (combines all of raw / R2_all_maps, matches and players into the canonical match tables - each
+#  match stored once, see match_tables.py - plus, for now, the legacy one-row-per-team dataset)
 
 
 import pandas as pd
 from pathlib import Path
 import argparse
 import logging
+from typing import Optional, Sequence
+
+from compact_dtypes import compact_with_report
+from dataset_store import FORMAT_CHOICES, UNIFIED_SCHEMA, parse_formats, read_dataset, write_dataset
+from match_tables import aggregate_maps, aggregate_players, build_match_players, build_match_table, perspective_view
+from validate_r2 import REPORT_NAME, print_report, validate
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def create_r2_unified_dataset(base: Path):
-    """Create unified R2 dataset with specified fields"""
-    
-    # Load R2 data
-    r2_dir = base / "data/processed/R2_processed"
-    logger.info(f"Loading R2 data from {r2_dir}")
-    
-    df_matches = pd.read_csv(r2_dir / "R2_all_matches.csv")
-    df_maps = pd.read_csv(r2_dir / "R2_all_maps.csv")
-    df_players = pd.read_csv(r2_dir / "R2_all_players.csv")
-    
-    logger.info(f"Loaded - Matches: {len(df_matches)}, Maps: {len(df_maps)}, Players: {len(df_players)}")
-    
+def build_unified(df_matches: pd.DataFrame, df_maps: pd.DataFrame, df_players: pd.DataFrame) -> pd.DataFrame:
+    """Match rows joined with their grouped map and player lists, in the unified column order"""
     # Group map-level info
     logger.info("Aggregating map data...")
-    df_map_grouped = (
-        df_maps
-        .groupby(["team_name", "match_number", "match_url"], as_index=False)
-        .agg({
-            "map_name":    lambda s: s.tolist(),
-            "map_result":  lambda s: s.tolist(),
-            "our_score":   lambda s: s.tolist(),
-            "their_score": lambda s: s.tolist(),
-            "map_number":  'count'  # Total maps played
-        })
-        .rename(columns={
-            "map_name":    "maps_played",
-            "map_result":  "map_results",
-            "our_score":   "our_scores",
-            "their_score": "their_scores",
-            "map_number":  "total_maps"
-        })
-    )
-    
-    # Add aggregate map statistics
-    df_map_grouped['maps_won'] = df_map_grouped['map_results'].apply(lambda x: x.count('W') if isinstance(x, list) else 0)
-    df_map_grouped['maps_lost'] = df_map_grouped['map_results'].apply(lambda x: x.count('L') if isinstance(x, list) else 0)
+    df_map_grouped = aggregate_maps(df_maps)
     
     # Group player-level info
     logger.info("Aggregating player data...")
-    df_player_grouped = (
-        df_players
-        .groupby(["match_url"], as_index=False)
-        .agg({
-            "player_name": lambda s: s.tolist(),
-            "team":        lambda s: s.tolist(),
-            "rating":      lambda s: s.tolist(),
-        })
-        .rename(columns={
-            "player_name":   "all_players",
-            "team":          "all_player_teams",
-            "rating":        "all_player_ratings",
-        })
-    )
+    df_player_grouped = aggregate_players(df_players)
     
     # Merge everything
     logger.info("Merging all data...")
@@ -86,12 +48,7 @@ def create_r2_unified_dataset(base: Path):
     )
     
     # Ensuring all columns are in the correct order
-    required_columns = [
-        'team_id', 'team_name', 'match_number_x', 'date', 'result', 'score', 
-        'opponent', 'tournament', 'match_url', 'match_number_y', 'maps_played', 
-        'map_results', 'our_scores', 'their_scores', 'total_maps', 'maps_won', 
-        'maps_lost', 'all_players', 'all_player_teams', 'all_player_ratings'
-    ]
+    required_columns = UNIFIED_SCHEMA.names
     
     # Checking for missing columns
     missing_columns = [col for col in required_columns if col not in df_unified.columns]
@@ -102,97 +59,59 @@ def create_r2_unified_dataset(base: Path):
             df_unified[col] = None
     
     # Select only the required columns in the specified order
-    df_unified = df_unified[required_columns]
-    
-    # Save the unified dataset
-    output_path = r2_dir / "R2_unified_dataset.csv"
-    df_unified.to_csv(output_path, index=False)
-    
-    # Print summary
-    print(f"\n Created R2 unified dataset: {output_path}")
-    print(f"Total rows: {len(df_unified)}")
-    print(f"Unique matches: {df_unified['match_url'].nunique()}")
-    print(f"Teams: {df_unified['team_name'].nunique()}")
-    print(f"Date range: {df_unified['date'].min()} to {df_unified['date'].max()}")
-    
-    # Analyze data quality
-    analyze_data_quality(df_unified, df_players)
-    
-    return df_unified
+    return df_unified[required_columns]
 
-def analyze_data_quality(df_unified: pd.DataFrame, df_players: pd.DataFrame):
-    """Analyze data quality and report issues"""
+def create_r2_unified_dataset(base: Path, formats: Sequence[str] = ("parquet",), legacy_unified: bool = True,
+                              memory_report: Optional[Path] = None, full_validation: bool = False):
+    """Create the canonical match tables and, unless turned off, the legacy unified dataset"""
     
-    print("\n=== Data Quality Analysis ===")
-    
-    # Clean player data first
-    df_players_clean = df_players.copy()
-    df_players_clean['player_name'] = df_players_clean['player_name'].str.strip()
-    df_players_clean['match_url'] = df_players_clean['match_url'].str.strip()
+    # Load R2 data
+    r2_dir = base / "data/processed/R2_processed"
+    logger.info(f"Loading R2 data from {r2_dir}")
     
-    # Remove any empty player names
-    df_players_clean = df_players_clean[df_players_clean['player_name'] != '']
+    df_matches = read_dataset(r2_dir / "R2_all_matches", "matches")
+    df_maps = read_dataset(r2_dir / "R2_all_maps", "maps")
+    df_players = read_dataset(r2_dir / "R2_all_players", "players")
     
-    # Check player counts per match
-    player_counts = df_players_clean.groupby('match_url')['player_name'].count().reset_index()
-    player_counts.columns = ['match_url', 'player_count']
+    logger.info(f"Loaded - Matches: {len(df_matches)}, Maps: {len(df_maps)}, Players: {len(df_players)}")
     
-    # Group by player count to see distribution
-    count_distribution = player_counts['player_count'].value_counts().sort_index()
-    print("\nPlayer count distribution:")
-    for count, num_matches in count_distribution.items():
-        print(f"  {count} players: {num_matches} matches")
+    # Repeated names/URLs as categoricals, small integers and whole-number scores narrowed
+    df_matches = compact_with_report(df_matches, "unify/matches", memory_report)
+    df_maps = compact_with_report(df_maps, "unify/maps", memory_report)
+    df_players = compact_with_report(df_players, "unify/players", memory_report)
+    
+    # Each match once, with its players in a long table
+    logger.info("Building canonical match tables...")
+    match_table = build_match_table(df_matches, df_maps, df_players)
+    match_players = build_match_players(df_players, match_table)
+    orphaned = (~df_players['match_url'].isin(match_table['match_url'])).sum()
+    if orphaned:
+        logger.warning(f"{orphaned} player rows belong to no match in R2_all_matches and are not stored")
+    output_paths = write_dataset(match_table, r2_dir / "R2_match_table", "match_table", formats)
+    output_paths += write_dataset(match_players, r2_dir / "R2_match_players", "match_players", formats)
+    
+    if legacy_unified:
+        # One row per team per match (list columns stay lists in Parquet; CSV gets their reprs)
+        df_unified = build_unified(df_matches, df_maps, df_players)
+        output_paths += write_dataset(df_unified, r2_dir / "R2_unified_dataset", "unified", formats)
+    
+    # Team perspectives are derived from the match tables, not stored
+    df_view = perspective_view(match_table, match_players)
     
-    ### NOTE: During data collection, some matches gathered double the players
-    ### due to the same match being scraped twice under different team names.
-    ### This is expected and should be filtered out during modeling.
-
-    # Find matches with incorrect player counts (not 10 or 20)
-    # 10 = one team perspective, 20 = both team perspectives
-
-    incorrect_counts = player_counts[(player_counts['player_count'] != 10) & (player_counts['player_count'] != 20)].sort_values('player_count')
-    
-    if len(incorrect_counts) > 0:
-        print(f"\nMatches with unusual player counts ({len(incorrect_counts)} total):")
-        # Show a sample of each count type
-        for count in sorted(incorrect_counts['player_count'].unique()):
-            matches_with_count = incorrect_counts[incorrect_counts['player_count'] == count]
-            print(f"\n  {count} players ({len(matches_with_count)} matches):")
-            for _, row in matches_with_count.head(3).iterrows():
-                print(f"    {row['match_url']}")
-            if len(matches_with_count) > 3:
-                print(f"    ... and {len(matches_with_count) - 3} more")
-    
-    # Check for missing data in unified dataset
-    print(f"\n=== Missing Data in Unified Dataset ===")
-    print(f"Rows with missing player data: {df_unified['all_players'].isna().sum()}")
-    print(f"Rows with missing map data: {df_unified['maps_played'].isna().sum()}")
-    print(f"Rows with missing team_id: {df_unified['team_id'].isna().sum()}")
-    
-    # Check for duplicate team-match combinations
-    duplicates = df_unified[df_unified.duplicated(subset=['team_name', 'match_url'], keep=False)]
-    if len(duplicates) > 0:
-        print(f"\nWARNING: Found {len(duplicates)} duplicate team-match combinations")
-        print("Example duplicates:")
-        print(duplicates[['team_name', 'match_url']].head(10))
-    
-    # Analyze match perspectives
-    match_perspectives = df_unified.groupby('match_url')['team_name'].count()
-    print(f"\n=== Match Perspectives Analysis ===")
-    print(f"Matches with 1 team perspective: {(match_perspectives == 1).sum()}")
-    print(f"Matches with 2 team perspectives: {(match_perspectives == 2).sum()}")
-    print(f"Matches with >2 team perspectives: {(match_perspectives > 2).sum()}")
-    
-    # Cross-check: matches with 20 players but only 1 perspective
-    matches_20_players = set(player_counts[player_counts['player_count'] == 20]['match_url'])
-    matches_1_perspective = set(match_perspectives[match_perspectives == 1].index)
-    weird_matches = matches_20_players.intersection(matches_1_perspective)
-    if weird_matches:
-        print(f"\nWARNING: {len(weird_matches)} matches have 20 players but only 1 team perspective!")
-        for match in list(weird_matches)[:3]:
-            print(f"  {match}")
-    
-    return incorrect_counts
+    # Print summary
+    print(f"\n Created R2 match tables: {', '.join(str(path) for path in output_paths)}")
+    print(f"Matches: {len(match_table)} ({match_table['team_b_id'].notna().sum()} between two tracked teams)")
+    print(f"Player rows: {len(match_players)}")
+    print(f"Team perspectives: {len(df_view)}")
+    print(f"Teams: {df_view['team_name'].nunique()}")
+    print(f"Date range: {match_table['date'].min()} to {match_table['date'].max()}")
+    
+    # Validate (partitions unchanged since they last passed are skipped)
+    report = validate(match_table, match_players, r2_dir, full=full_validation)
+    print_report(report)
+    print(f"\nValidation report: {r2_dir / REPORT_NAME}")
+    
+    return match_table, match_players
 
 def main():
     parser = argparse.ArgumentParser(
@@ -204,10 +123,35 @@ def main():
         default=Path(__file__).parent.parent,
         help="Project root directory"
     )
+    parser.add_argument(
+        "--format",
+        choices=FORMAT_CHOICES,
+        default="parquet",
+        help="File format of the match tables"
+    )
+    parser.add_argument(
+        "--legacy-unified",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Also write R2_unified_dataset (one row per team per match, players repeated per team); "
+             "still on by default while its consumers move to the match tables"
+    )
+    parser.add_argument(
+        "--memory-report",
+        type=Path,
+        default=None,
+        help="Append per-column memory use before/after dtype compaction to this JSON-lines file"
+    )
+    parser.add_argument(
+        "--full-validation",
+        action="store_true",
+        help="Validate every partition, including those unchanged since they last passed"
+    )
     args = parser.parse_args()
     
-    # Create the unified dataset
-    create_r2_unified_dataset(args.base_dir)
+    # Create the match tables
+    create_r2_unified_dataset(args.base_dir, parse_formats(args.format), args.legacy_unified, args.memory_report,
+                              args.full_validation)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
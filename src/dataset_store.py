@@ -0,0 +1,265 @@
+# COLUMNAR (PARQUET) STORAGE FOR THE RAW, R2_PROCESSED AND UNIFIED DATASETS
+# (explicit Arrow schemas with native list columns, so loading the unified dataset is one
+#  vectorized read instead of ast.literal_eval on every cell; CSV export is kept as an option)
+
+import ast
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+# Dates stay VLR's 'YYYY/MM/DD' strings so Parquet and CSV copies hold identical values
+MATCHES_SCHEMA = pa.schema([
+    ("team_id", pa.int64()),
+    ("team_name", pa.string()),
+    ("match_number", pa.int64()),
+    ("date", pa.string()),
+    ("result", pa.string()),
+    ("score", pa.string()),
+    ("opponent", pa.string()),
+    ("tournament", pa.string()),
+    ("match_url", pa.string()),
+])
+
+PLAYERS_SCHEMA = pa.schema([
+    ("player_name", pa.string()),
+    ("team", pa.string()),
+    ("rating", pa.float64()),
+    ("match_number", pa.int64()),
+    ("match_url", pa.string()),
+])
+
+MAPS_SCHEMA = pa.schema([
+    ("team_name", pa.string()),
+    ("match_number", pa.int64()),
+    ("overall_match_result", pa.string()),
+    ("map_number", pa.int64()),
+    ("map_name", pa.string()),
+    ("map_result", pa.string()),
+    ("our_score", pa.float64()),
+    ("their_score", pa.float64()),
+    ("map_score", pa.string()),
+    ("match_url", pa.string()),
+])
+
+UNIFIED_SCHEMA = pa.schema([
+    ("team_id", pa.int64()),
+    ("team_name", pa.string()),
+    ("match_number_x", pa.int64()),
+    ("date", pa.string()),
+    ("result", pa.string()),
+    ("score", pa.string()),
+    ("opponent", pa.string()),
+    ("tournament", pa.string()),
+    ("match_url", pa.string()),
+    ("match_number_y", pa.int64()),
+    ("maps_played", pa.list_(pa.string())),
+    ("map_results", pa.list_(pa.string())),
+    ("our_scores", pa.list_(pa.float64())),
+    ("their_scores", pa.list_(pa.float64())),
+    ("total_maps", pa.int64()),
+    ("maps_won", pa.int64()),
+    ("maps_lost", pa.int64()),
+    ("all_players", pa.list_(pa.string())),
+    ("all_player_teams", pa.list_(pa.string())),
+    ("all_player_ratings", pa.list_(pa.float64())),
+])
+
+# One row per match: team A is a tracked team whose record has map data, team B the other side
+# (team_b_id is null when B is not a tracked team); result, score and map lists are A's view
+MATCH_TABLE_SCHEMA = pa.schema([
+    ("match_url", pa.string()),
+    ("date", pa.string()),
+    ("tournament", pa.string()),
+    ("team_a_id", pa.int64()),
+    ("team_a_name", pa.string()),
+    ("team_a_code", pa.string()),
+    ("team_a_match_number", pa.int64()),
+    ("team_b_id", pa.int64()),
+    ("team_b_name", pa.string()),
+    ("team_b_code", pa.string()),
+    ("team_b_match_number", pa.int64()),
+    ("result", pa.string()),
+    ("score", pa.string()),
+    ("maps_played", pa.list_(pa.string())),
+    ("map_results", pa.list_(pa.string())),
+    ("team_a_scores", pa.list_(pa.float64())),
+    ("team_b_scores", pa.list_(pa.float64())),
+    ("total_maps", pa.int64()),
+    ("maps_won", pa.int64()),
+    ("maps_lost", pa.int64()),
+])
+
+# Every player once per match, keyed by (match_url, team); side says which of A/B they played for
+MATCH_PLAYERS_SCHEMA = pa.schema([
+    ("match_url", pa.string()),
+    ("side", pa.string()),
+    ("team", pa.string()),
+    ("player_name", pa.string()),
+    ("rating", pa.float64()),
+])
+
+SCHEMAS = {
+    "matches": MATCHES_SCHEMA,
+    "players": PLAYERS_SCHEMA,
+    "maps": MAPS_SCHEMA,
+    "unified": UNIFIED_SCHEMA,
+    "match_table": MATCH_TABLE_SCHEMA,
+    "match_players": MATCH_PLAYERS_SCHEMA,
+}
+
+FORMAT_CHOICES = ("parquet", "csv", "both")
+
+PathLike = Union[str, Path]
+
+
+def parse_formats(choice: str) -> Tuple[str, ...]:
+    """--format value -> the file formats to write"""
+    return ("parquet", "csv") if choice == "both" else (choice,)
+
+
+def list_columns(kind: str) -> List[str]:
+    return [field.name for field in SCHEMAS[kind] if pa.types.is_list(field.type)]
+
+
+def csv_convert_options(kind: str, columns: Optional[List[str]] = None) -> pacsv.ConvertOptions:
+    """
+    pyarrow CSV options that parse the schema's columns straight to their types (list columns
+    stay strings and are decoded afterwards) and skip every column not in `columns`
+    """
+    column_types = {field.name: pa.string() if pa.types.is_list(field.type) else field.type
+                    for field in SCHEMAS[kind]}
+    # Empty cells are nulls, the way pandas.read_csv reads them
+    return pacsv.ConvertOptions(column_types=column_types, include_columns=columns,
+                                include_missing_columns=True, strings_can_be_null=True)
+
+
+def is_arrow_list(series: pd.Series) -> bool:
+    return isinstance(series.dtype, pd.ArrowDtype) and pa.types.is_list(series.dtype.pyarrow_dtype)
+
+
+def to_arrow(df: pd.DataFrame, kind: str) -> pa.Table:
+    """
+    DataFrame -> Arrow table with the schema for `kind`; missing schema columns become all-null
+    and columns the schema does not know are kept at the end with inferred types
+    """
+    schema = SCHEMAS[kind]
+    extra = [column for column in df.columns if column not in schema.names]
+    typed = df.reindex(columns=schema.names)
+    # NaN stands for a missing list (a match without map rows), which Arrow stores as null;
+    # columns that are already Arrow lists go through as they are
+    for column in list_columns(kind):
+        if not is_arrow_list(typed[column]):
+            typed[column] = [value if isinstance(value, (list, tuple)) else None for value in typed[column]]
+    table = pa.Table.from_pandas(typed, schema=schema, preserve_index=False)
+    for column in extra:
+        table = table.append_column(column, pa.array(df[column], from_pandas=True))
+    # No pandas metadata: the schema is the contract, and pandas cannot read back the
+    # ArrowDtype names it would record for Arrow-backed list columns
+    return table.replace_schema_metadata(None)
+
+
+def write_dataset(df: pd.DataFrame, stem: PathLike, kind: str, formats: Sequence[str] = ("parquet",)) -> List[Path]:
+    """
+    Write `df` as <stem>.parquet (typed, zstd-compressed) and/or <stem>.csv (list columns as
+    Python reprs, the format older readers expect); returns the paths written
+    List columns may hold Python lists or be Arrow list columns (read_dataset(lists="arrow"))
+    """
+    stem = Path(stem)
+    written = []
+    if "parquet" in formats:
+        path = Path(f"{stem}.parquet")
+        pq.write_table(to_arrow(df, kind), path, compression="zstd")
+        written.append(path)
+    if "csv" in formats:
+        path = Path(f"{stem}.csv")
+        # Arrow list columns as Python lists, so the CSV holds the same reprs older readers expect
+        arrow_lists = {column: df[column].tolist() for column in df.columns if is_arrow_list(df[column])}
+        (df.assign(**arrow_lists) if arrow_lists else df).to_csv(path, index=False)
+        written.append(path)
+    return written
+
+
+def dataset_file(stem: PathLike) -> Optional[Path]:
+    """The newer of <stem>.parquet and <stem>.csv (Parquet on a tie), or None if neither exists"""
+    candidates = [path for path in (Path(f"{stem}.parquet"), Path(f"{stem}.csv")) if path.exists()]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda path: path.stat().st_mtime)
+
+
+def dataset_parts(directory: PathLike) -> List[Path]:
+    """Stems of the datasets in a partitioned dataset directory (one per part, in name order)"""
+    directory = Path(directory)
+    stems = {path.with_suffix("") for pattern in ("*.parquet", "*.csv") for path in directory.glob(pattern)}
+    return sorted(stems)
+
+
+def _decode_list(value):
+    return ast.literal_eval(value) if isinstance(value, str) else value
+
+
+def read_dataset(stem: PathLike, kind: str, columns: Optional[List[str]] = None,
+                 lists: str = "python", typed: bool = False) -> pd.DataFrame:
+    """
+    Load a dataset written by write_dataset, from whichever of its files is newest
+    columns= projects the read, so the other columns are never parsed (a requested column the
+    file does not have comes back all-null). List columns come back as Python lists
+    (lists="python") or as pyarrow list columns (lists="arrow", for vectorized Series.list
+    operations). Legacy CSVs with list reprs are decoded, so callers never need
+    ast.literal_eval themselves; typed=True parses a CSV with pyarrow straight to the schema's
+    types instead of letting pandas infer them
+    A directory at `stem` is a partitioned dataset: its parts (see dataset_parts) are read the
+    same way and concatenated
+    Raises FileNotFoundError if neither file (nor the directory) exists
+    """
+    if Path(stem).is_dir():
+        frames = [read_dataset(part, kind, columns=columns, lists=lists, typed=typed) for part in dataset_parts(stem)]
+        if not frames:
+            return pd.DataFrame(columns=columns if columns is not None else SCHEMAS[kind].names)
+        return pd.concat(frames, ignore_index=True)
+
+    path = dataset_file(stem)
+    if path is None:
+        raise FileNotFoundError(f"No {stem}.parquet or {stem}.csv")
+
+    if path.suffix == ".parquet":
+        present = columns
+        if columns is not None:
+            names = set(pq.read_schema(path).names)
+            present = [column for column in columns if column in names]
+        wanted = [column for column in list_columns(kind) if present is None or column in present]
+        table = pq.read_table(path, columns=present)
+        if lists == "arrow":
+            df = table.to_pandas(types_mapper=lambda t: pd.ArrowDtype(t) if pa.types.is_list(t) else None)
+        else:
+            df = table.to_pandas()
+            for column in wanted:
+                df[column] = table.column(column).to_pylist()
+        return df if columns is None else df.reindex(columns=columns)
+
+    df = None
+    if typed:
+        try:
+            df = pacsv.read_csv(path, convert_options=csv_convert_options(kind, columns)).to_pandas()
+        except pa.ArrowInvalid:
+            # A hand-edited or legacy file that does not fit the schema: let pandas infer instead
+            df = None
+    if df is None:
+        usecols = None if columns is None else (lambda column: column in columns)
+        df = pd.read_csv(path, usecols=usecols)
+        if columns is not None:
+            df = df.reindex(columns=columns)
+    wanted = [column for column in list_columns(kind) if column in df.columns]
+    for column in wanted:
+        df[column] = df[column].map(_decode_list)
+    if lists == "arrow" and wanted:
+        types = {field.name: field.type for field in SCHEMAS[kind]}
+        for column in wanted:
+            values = [value if isinstance(value, list) else None for value in df[column]]
+            df[column] = pd.Series(pa.array(values, type=types[column]), dtype=pd.ArrowDtype(types[column]),
+                                   index=df.index)
+    return df
@@ -0,0 +1,142 @@
+# POOL OF LONG-LIVED SELENIUM DRIVERS SHARED ACROSS PAGE LOADS
+# (starting Chrome costs more than parsing most pages, so drivers are reused)
+
+import threading
+from contextlib import contextmanager
+
+from selenium.common.exceptions import WebDriverException
+
+
+class _PooledDriver:
+    """A driver plus the bookkeeping the pool needs to decide when to recycle it"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+
+class DriverPool:
+    """
+    Hands out up to `size` long-lived drivers, one page load per checkout.
+
+    Drivers are created lazily with `factory`, health-checked on every checkout,
+    recycled after `max_pages` checkouts or after a WebDriver crash, and all quit
+    once in `shutdown()`.
+    """
+
+    def __init__(self, factory, size=1, max_pages=100):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.factory = factory
+        self.size = size
+        self.max_pages = max_pages
+
+        self._idle = []
+        self._cond = threading.Condition()
+        self._live = 0
+        self._closed = False
+
+        self.started = 0
+        self.recycled = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+
+    @contextmanager
+    def driver(self):
+        """
+        Check out a healthy driver for one page load
+        A WebDriverException raised inside the block discards the driver
+        """
+        slot = self._acquire()
+        try:
+            yield slot.driver
+        except WebDriverException:
+            print("    Driver crashed, recycling it")
+            self._discard(slot)
+            raise
+        except BaseException:
+            self._release(slot)
+            raise
+        else:
+            self._release(slot)
+
+    def shutdown(self):
+        """Quit every idle driver; drivers still checked out are quit on return"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for slot in idle:
+            self._quit(slot)
+        print(f"Driver pool shut down ({self.started} drivers started, {self.recycled} recycled)")
+
+    def _acquire(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("DriverPool is shut down")
+                    if self._idle:
+                        slot, create = self._idle.pop(), False
+                        break
+                    if self._live < self.size:
+                        self._live += 1
+                        slot, create = None, True
+                        break
+                    self._cond.wait()
+
+            if create:
+                try:
+                    slot = _PooledDriver(self.factory())
+                except BaseException:
+                    with self._cond:
+                        self._live -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self.started += 1
+
+            if self._is_healthy(slot):
+                slot.pages += 1
+                return slot
+
+            print("    Driver failed health check, replacing it")
+            self._discard(slot)
+
+    def _release(self, slot):
+        with self._cond:
+            if not self._closed and not (self.max_pages and slot.pages >= self.max_pages):
+                self._idle.append(slot)
+                self._cond.notify()
+                return
+            recycle = not self._closed
+        if recycle:
+            self._discard(slot)
+        else:
+            self._quit(slot)
+
+    def _discard(self, slot):
+        with self._cond:
+            self.recycled += 1
+        self._quit(slot)
+
+    def _quit(self, slot):
+        try:
+            slot.driver.quit()
+        except Exception:
+            pass
+        with self._cond:
+            self._live -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _is_healthy(slot):
+        try:
+            slot.driver.execute_script("return document.readyState")
+            return True
+        except Exception:
+            return False
@@ -0,0 +1,72 @@
+# PLAIN-HTTP FETCH TIER FOR VLR PAGES
+# (VLR renders match lists and match pages server-side, so most pages need one keep-alive GET,
+#  not a Chrome render; the scraper falls back to Selenium when the static HTML is missing fields)
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+FETCH_TIMEOUT = 10
+
+
+class HttpFetcher:
+    """
+    One pooled requests.Session shared by every worker thread
+    At most `max_concurrency` requests are in flight at once; the connection pool holds as
+    many keep-alive connections per host
+    """
+
+    def __init__(self, max_concurrency=4, timeout=FETCH_TIMEOUT):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept': 'text/html,application/xhtml+xml',
+            'Accept-Encoding': 'gzip, deflate',
+        })
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+
+        self.fetched = 0
+        self.failed = 0
+        self.fallbacks = 0
+        self.bytes = 0
+
+    def fetch(self, url):
+        """Page HTML, or None on a network error or non-200 response"""
+        try:
+            with self._slots:
+                response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"    HTTP fetch failed for {url}: {e}")
+            self._count(failed=1)
+            return None
+        if response.status_code != 200:
+            print(f"    HTTP {response.status_code} for {url}")
+            self._count(failed=1)
+            return None
+        self._count(fetched=1, size=len(response.content))
+        return response.text
+
+    def fell_back(self):
+        """Record a page whose static HTML was not enough, so it went to the browser"""
+        self._count(fallbacks=1)
+
+    def _count(self, fetched=0, failed=0, fallbacks=0, size=0):
+        with self._lock:
+            self.fetched += fetched
+            self.failed += failed
+            self.fallbacks += fallbacks
+            self.bytes += size
+
+    def print_summary(self):
+        print(f"HTTP fetches: {self.fetched} ok ({self.bytes / 1e6:.1f} MB), {self.failed} failed, "
+              f"{self.fallbacks} pages fell back to the browser")
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,59 @@
+# PER-TEAM WATERMARKS FOR INCREMENTAL SCRAPING
+# (which match_urls each team already has on disk and the newest match date seen)
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+class IngestManifest:
+    """
+    JSON manifest: {team_name: {"match_urls": [...], "latest_date": "YYYY/MM/DD", "updated_at": ...}}
+    Safe to share between worker threads; every update is written atomically
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.teams = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.teams = json.load(f)
+
+    def has_team(self, team_name):
+        with self._lock:
+            return team_name in self.teams
+
+    def known_urls(self, team_name):
+        with self._lock:
+            return set(self.teams.get(team_name, {}).get("match_urls", []))
+
+    def latest_date(self, team_name):
+        with self._lock:
+            return self.teams.get(team_name, {}).get("latest_date")
+
+    def update(self, team_name, matches_df):
+        """Record every match_url in `matches_df` as ingested and advance the date watermark"""
+        urls = [u for u in matches_df.get("match_url", []) if isinstance(u, str) and u]
+        dates = [d for d in matches_df.get("date", []) if isinstance(d, str) and d]
+
+        with self._lock:
+            entry = self.teams.setdefault(team_name, {"match_urls": [], "latest_date": None})
+            known = set(entry["match_urls"])
+            entry["match_urls"].extend(u for u in urls if u not in known)
+            if dates:
+                newest = max(dates)
+                if entry["latest_date"] is None or newest > entry["latest_date"]:
+                    entry["latest_date"] = newest
+            entry["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+            self._save()
+
+    def _save(self):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self.teams, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
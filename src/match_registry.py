@@ -0,0 +1,92 @@
+# RUN-WIDE MATCH REGISTRY
+# (a match between two tracked teams is fetched and parsed once; the second team gets the mirrored
+#  map rows, while the match's player rows - both rosters - stay in the first team's files only)
+
+import threading
+from concurrent.futures import Future
+
+import pandas as pd
+
+
+def mirror_maps(maps_df, team_name, match_number, match_result):
+    """The other team's view of a match's map rows: results flipped, scores swapped"""
+    if maps_df.empty:
+        return maps_df
+    mirrored = maps_df.copy()
+    mirrored['team_name'] = team_name
+    mirrored['match_number'] = match_number
+    mirrored['overall_match_result'] = match_result
+    mirrored['map_result'] = maps_df['map_result'].replace({'W': 'L', 'L': 'W'})
+    mirrored['our_score'] = maps_df['their_score']
+    mirrored['their_score'] = maps_df['our_score']
+    mirrored['map_score'] = [
+        None if pd.isna(ours) or pd.isna(theirs) else f"{int(ours)}-{int(theirs)}"
+        for ours, theirs in zip(mirrored['our_score'], mirrored['their_score'])
+    ]
+    return mirrored
+
+
+class MatchRegistry:
+    """
+    match_url -> the first team's parsed (players_df, maps_df), shared by every worker thread
+    A team asking for a match another team is already fetching waits for that fetch
+    instead of loading the page again
+    The players frame already holds both rosters, so only the team that fetched the page keeps
+    it; the other team gets an empty frame and the match's players are written once per run.
+    A match without map rows has nothing to mirror, so there the other team keeps the players
+    too - an empty pair would read as a failed load to every caller
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.fetched = 0
+        self.shared = 0
+
+    def get(self, match_url, team_name, match_number, match_result, fetch):
+        """(players_df, maps_df) for `team_name`, calling fetch() only if no team has this match yet"""
+        with self._lock:
+            entry = self._entries.get(match_url)
+            owner = entry is None
+            if owner:
+                entry = self._entries[match_url] = Future()
+
+        if not owner:
+            shared = entry.result()
+            if shared is not None:
+                source_team, players_df, maps_df = shared
+                with self._lock:
+                    self.shared += 1
+                if source_team != team_name and not maps_df.empty:
+                    return players_df.iloc[0:0].copy(), mirror_maps(maps_df, team_name, match_number, match_result)
+                players_df = players_df.copy()
+                if not players_df.empty:
+                    players_df['match_number'] = match_number
+                return players_df, maps_df
+            # The owner came back empty-handed - try the page ourselves
+            return fetch()
+
+        try:
+            players_df, maps_df = fetch()
+        except BaseException:
+            self._forget(match_url, entry)
+            raise
+        with self._lock:
+            self.fetched += 1
+        if players_df.empty and maps_df.empty:
+            # Failed loads are not shared, so the other team gets its own attempt
+            self._forget(match_url, entry)
+        else:
+            entry.set_result((team_name, players_df, maps_df))
+        return players_df, maps_df
+
+    def _forget(self, match_url, entry):
+        with self._lock:
+            self._entries.pop(match_url, None)
+        entry.set_result(None)
+
+    def print_summary(self):
+        total = self.fetched + self.shared
+        if total:
+            print(f"Match pages: {self.fetched} fetched, {self.shared} shared between teams "
+                  f"({self.shared / total:.0%} of page loads saved)")
@@ -0,0 +1,262 @@
+# CANONICAL MATCH TABLES: EACH MATCH STORED ONCE, PER-TEAM PERSPECTIVES DERIVED ON THE FLY
+# (R2_match_table has one row per match_url with team A/B columns, R2_match_players one row per
+#  player per match; perspective_view() rebuilds the one-row-per-team shape of the unified dataset)
+
+import logging
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from dataset_store import MATCH_TABLE_SCHEMA, UNIFIED_SCHEMA, list_columns, read_dataset
+
+logger = logging.getLogger(__name__)
+
+def grouped_lists(df: pd.DataFrame, keys: List[str], lists: Dict[str, str]) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    One row per `keys` group (sorted, like groupby) with each source column in `lists` gathered
+    into an Arrow list column named by its value, elements in the rows' original order
+    Built from one offsets array over the rows in group order rather than a Python list per
+    group. Also returns each row's group id (-1 where a key is missing) for grouped sums
+    """
+    ids = df.groupby(keys, sort=True, observed=True).ngroup().to_numpy()
+    valid = ids >= 0
+    counts = np.bincount(ids[valid], minlength=ids.max() + 1 if valid.any() else 0)
+    # Stable sort: rows with a missing key (-1) come first and are cut off
+    order = np.argsort(ids, kind="stable")[np.count_nonzero(~valid):]
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    grouped = df[keys].iloc[order[offsets[:-1]]].reset_index(drop=True)
+    list_offsets = pa.array(offsets, type=pa.int32())
+    for source, target in lists.items():
+        values = pa.array(df[source].iloc[order], from_pandas=True)
+        values = values.cast(UNIFIED_SCHEMA.field(target).type.value_type)
+        grouped[target] = pd.arrays.ArrowExtensionArray(pa.ListArray.from_arrays(list_offsets, values))
+    return grouped, ids
+
+def grouped_count(ids: np.ndarray, mask: np.ndarray, groups: int) -> np.ndarray:
+    """Rows per group where `mask` is True (ids from grouped_lists)"""
+    valid = ids >= 0
+    return np.bincount(ids[valid], weights=mask[valid], minlength=groups).astype(np.int64)
+
+def aggregate_maps(df_maps: pd.DataFrame) -> pd.DataFrame:
+    """One row per team per match: map lists plus total/won/lost map counts"""
+    df_map_grouped, ids = grouped_lists(
+        df_maps,
+        ["team_name", "match_number", "match_url"],
+        {
+            "map_name":    "maps_played",
+            "map_result":  "map_results",
+            "our_score":   "our_scores",
+            "their_score": "their_scores",
+        }
+    )
+
+    # Total maps played, and won/lost from grouped sums over boolean columns
+    groups = len(df_map_grouped)
+    df_map_grouped["total_maps"] = grouped_count(ids, df_maps["map_number"].notna().to_numpy(), groups)
+    df_map_grouped["maps_won"] = grouped_count(ids, (df_maps["map_result"] == "W").to_numpy(), groups)
+    df_map_grouped["maps_lost"] = grouped_count(ids, (df_maps["map_result"] == "L").to_numpy(), groups)
+    return df_map_grouped
+
+def aggregate_players(df_players: pd.DataFrame) -> pd.DataFrame:
+    """One row per match with every player's name, team and rating as lists"""
+    df_player_grouped, _ = grouped_lists(
+        df_players,
+        ["match_url"],
+        {
+            "player_name": "all_players",
+            "team":        "all_player_teams",
+            "rating":      "all_player_ratings",
+        }
+    )
+    return df_player_grouped
+
+def map_list_values(series: pd.Series, fn: Callable[[pa.Array], pa.Array]) -> pd.Series:
+    """Apply an Arrow compute function to every element of an Arrow list column, keeping its lists"""
+    lists = pa.array(series)
+    if isinstance(lists, pa.ChunkedArray):
+        lists = lists.combine_chunks()
+    start, end = lists.offsets[0].as_py(), lists.offsets[-1].as_py()
+    offsets = pc.subtract(lists.offsets, start)
+    values = fn(lists.values.slice(start, end - start))
+    mapped = pa.ListArray.from_arrays(offsets, values, mask=lists.is_null())
+    return pd.Series(pd.arrays.ArrowExtensionArray(mapped), index=series.index)
+
+def flip_results(results):
+    """'W' <-> 'L' (anything else, e.g. 'Unknown', is kept)"""
+    return pc.if_else(pc.equal(results, "W"), "L", pc.if_else(pc.equal(results, "L"), "W", results))
+
+def own_team_codes(perspectives: pd.DataFrame, df_players: pd.DataFrame) -> pd.Series:
+    """
+    Player team code (e.g. '100T') each perspective's team played under in that match
+    Of the codes in the match, the one seen in the most of that team's matches - a team's own
+    code is in all of them, an opponent's only in the few they played each other
+    """
+    codes = df_players[["match_url", "team"]].drop_duplicates()
+    pairs = perspectives[["match_url", "team_name"]].reset_index().merge(codes, on="match_url")
+    pairs["affinity"] = pairs.groupby(["team_name", "team"], observed=True)["match_url"].transform("size")
+    best = pairs.sort_values("affinity", ascending=False, kind="stable").drop_duplicates("index")
+    return best.set_index("index")["team"].reindex(perspectives.index)
+
+def map_conflicts(side_a: pd.DataFrame, side_b: pd.DataFrame) -> pd.DataFrame:
+    """
+    Matches where both teams have map rows and B's record, seen from A's side, differs from A's:
+    other maps, results that are not each other's flip, or swapped scores that do not match
+    One row per conflict with both team names and the fields that disagree
+    """
+    both = side_a.merge(side_b, on="match_url", suffixes=("_a", "_b"))
+    both = both[both["maps_played_a"].notna() & both["maps_played_b"].notna()]
+    if both.empty:
+        return pd.DataFrame(columns=["match_url", "team_a", "team_b", "fields"])
+
+    def values(column):
+        return pa.array(both[column]).to_pylist()
+
+    # Per shared match: a handful of maps each, compared as Python lists
+    checks = {
+        "maps": (values("maps_played_a"), values("maps_played_b")),
+        "results": (pa.array(both["map_results_a"].pipe(map_list_values, flip_results)).to_pylist(),
+                    values("map_results_b")),
+        "scores": (list(zip(values("our_scores_a"), values("their_scores_a"))),
+                   list(zip(values("their_scores_b"), values("our_scores_b")))),
+    }
+    fields = [
+        [name for name, (a, b) in checks.items() if a[i] != b[i]]
+        for i in range(len(both))
+    ]
+    conflicts = pd.DataFrame({
+        "match_url": both["match_url"].to_numpy(),
+        "team_a": both["team_name_a"].to_numpy(),
+        "team_b": both["team_name_b"].to_numpy(),
+        "fields": [", ".join(names) for names in fields],
+    })
+    return conflicts[conflicts["fields"] != ""].reset_index(drop=True)
+
+def build_match_table(df_matches: pd.DataFrame, df_maps: pd.DataFrame, df_players: pd.DataFrame) -> pd.DataFrame:
+    """One row per match_url from the per-team R2 tables (see MATCH_TABLE_SCHEMA)"""
+    perspectives = df_matches.drop_duplicates(["team_name", "match_url"])
+    maps = aggregate_maps(df_maps).drop_duplicates(["team_name", "match_url"]).drop(columns="match_number")
+    perspectives = perspectives.merge(maps, on=["team_name", "match_url"], how="left")
+    perspectives["team_code"] = own_team_codes(perspectives, df_players)
+
+    # Team A: the perspective with map data, then the first team name
+    perspectives["no_maps"] = perspectives["maps_played"].isna()
+    perspectives = perspectives.sort_values(["match_url", "no_maps", "team_name"], kind="stable")
+    first = ~perspectives.duplicated("match_url")
+    side_a = perspectives[first]
+    side_b = perspectives[~first].drop_duplicates("match_url")
+
+    # Only A's map record is stored - say so when B's tells a different story
+    map_columns = ["match_url", "team_name"] + list(maps.columns.drop(["team_name", "match_url"]))
+    for conflict in map_conflicts(side_a[map_columns], side_b[map_columns]).itertuples(index=False):
+        logger.warning(f"{conflict.match_url}: {conflict.team_b}'s map record disagrees with "
+                       f"{conflict.team_a}'s ({conflict.fields}); keeping {conflict.team_a}'s")
+    side_b = side_b[["match_url", "team_id", "team_name", "match_number"]]
+
+    table = side_a.rename(columns={
+        "team_id":      "team_a_id",
+        "team_name":    "team_a_name",
+        "team_code":    "team_a_code",
+        "match_number": "team_a_match_number",
+        "our_scores":   "team_a_scores",
+        "their_scores": "team_b_scores",
+    }).merge(
+        side_b.rename(columns={
+            "team_id":      "team_b_id",
+            "team_name":    "team_b_name",
+            "match_number": "team_b_match_number",
+        }),
+        on="match_url",
+        how="left"
+    )
+    # Untracked opponents are only known by the name in A's record (filled as plain strings:
+    # compacted, the two columns are categoricals over different names)
+    table["team_b_name"] = table["team_b_name"].astype(object).fillna(table["opponent"].astype(object))
+    for column in ("team_b_id", "team_b_match_number"):
+        table[column] = table[column].astype("Int64")
+
+    # Team B's code: the other code among the match's players
+    codes = df_players[["match_url", "team"]].drop_duplicates().merge(table[["match_url", "team_a_code"]], on="match_url")
+    other = codes[codes["team"] != codes["team_a_code"]].drop_duplicates("match_url")
+    table = table.merge(other[["match_url", "team"]].rename(columns={"team": "team_b_code"}), on="match_url", how="left")
+    return table[MATCH_TABLE_SCHEMA.names]
+
+def build_match_players(df_players: pd.DataFrame, match_table: pd.DataFrame) -> pd.DataFrame:
+    """Every player once per match with the side (A/B) they played for, in page order"""
+    players = df_players.drop_duplicates(subset=["match_url", "team", "player_name"])
+    players = players.merge(match_table[["match_url", "team_a_code"]], on="match_url")
+    players["side"] = np.where(players["team"] == players["team_a_code"], "A", "B")
+    return players[["match_url", "side", "team", "player_name", "rating"]]
+
+def perspective_view(match_table: pd.DataFrame, match_players: pd.DataFrame,
+                     tracked_only: bool = True) -> pd.DataFrame:
+    """
+    One row per team per match in the unified dataset's columns, plus mean_my_rating and
+    mean_opp_rating: A's rows as stored, B's with results, scores and map lists swapped
+    tracked_only=False also includes B rows for untracked opponents (team_id is null there)
+    """
+    shared = match_table[["date", "tournament", "match_url", "maps_played", "total_maps"]]
+    side_a = shared.assign(
+        side="A",
+        team_id=match_table["team_a_id"],
+        team_name=match_table["team_a_name"],
+        match_number=match_table["team_a_match_number"],
+        opponent=match_table["team_b_name"],
+        result=match_table["result"],
+        score=match_table["score"],
+        map_results=match_table["map_results"],
+        our_scores=match_table["team_a_scores"],
+        their_scores=match_table["team_b_scores"],
+        maps_won=match_table["maps_won"],
+        maps_lost=match_table["maps_lost"],
+    )
+    side_b = shared.assign(
+        side="B",
+        team_id=match_table["team_b_id"],
+        team_name=match_table["team_b_name"],
+        match_number=match_table["team_b_match_number"],
+        opponent=match_table["team_a_name"],
+        result=match_table["result"].map({"W": "L", "L": "W"}),
+        score=match_table["score"].str.split(":").str[::-1].str.join(":"),
+        map_results=map_list_values(match_table["map_results"], flip_results),
+        our_scores=match_table["team_b_scores"],
+        their_scores=match_table["team_a_scores"],
+        maps_won=match_table["maps_lost"],
+        maps_lost=match_table["maps_won"],
+    )
+    if tracked_only:
+        side_b = side_b[match_table["team_b_id"].notna()]
+    view = pd.concat([side_a, side_b], ignore_index=True)
+    view["match_number_x"] = view["match_number_y"] = view.pop("match_number")
+
+    # Mean rating per side, then "my"/"opp" picked by the row's side
+    means = match_players.groupby(["match_url", "side"], observed=True)["rating"].mean().unstack("side")
+    means = means.reindex(columns=["A", "B"])
+    mean_a = view["match_url"].map(means["A"])
+    mean_b = view["match_url"].map(means["B"])
+    is_a = view["side"] == "A"
+    view["mean_my_rating"] = mean_a.where(is_a, mean_b)
+    view["mean_opp_rating"] = mean_b.where(is_a, mean_a)
+
+    view = view.merge(aggregate_players(match_players), on="match_url", how="left")
+    view = view.sort_values(["team_name", "match_number_x"], kind="stable", ignore_index=True)
+    return view[UNIFIED_SCHEMA.names + ["mean_my_rating", "mean_opp_rating"]]
+
+def load_perspectives(r2_dir, tracked_only: bool = True, lists: str = "python") -> pd.DataFrame:
+    """
+    perspective_view() of the match tables saved in `r2_dir` (R2_match_table / R2_match_players)
+    List columns come back as Python lists (lists="python"), like read_dataset, or as Arrow
+    list columns (lists="arrow")
+    """
+    r2_dir = Path(r2_dir)
+    match_table = read_dataset(r2_dir / "R2_match_table", "match_table", lists="arrow")
+    match_players = read_dataset(r2_dir / "R2_match_players", "match_players")
+    view = perspective_view(match_table, match_players, tracked_only)
+    if lists == "python":
+        for column in list_columns("unified"):
+            view[column] = view[column].tolist()
+    return view
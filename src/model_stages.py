@@ -0,0 +1,92 @@
+### TRAIN AND PREDICT STAGES OF THE PIPELINE ###
+# (fits app/model_utils' model on app/processed_valorant_dataset.csv, then writes the predictions
+#  the Streamlit app serves, app/all_predictions.csv, with the app's default start date and split)
+
+import argparse
+import json
+import logging
+import pickle
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+sys.path.insert(0, str(APP_DIR))
+from model_utils import compute_predictions_df, prepare, save_dataframe_csv, train_model  # noqa: E402
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DATASET = "app/processed_valorant_dataset.csv"
+MODEL_PATH = "data/models/model.pkl"
+METRICS_PATH = "data/models/metrics.json"
+PREDICTIONS = "app/all_predictions.csv"
+
+def train(base: Path, start_date: str, train_prop: float):
+    """Fit on the time split and save the model with the settings it was trained under"""
+    df = pd.read_csv(base / DATASET)
+    P = prepare(df, start_date=start_date, train_prop=train_prop)
+    model, metrics = train_model(P["Xtr"], P["ytr"], P["Xte"], P["yte"])
+    metrics.update(start_date=start_date, train_prop=P["train_prop"], split_date=str(P["split_date"].date()),
+                   train_rows=len(P["train"]), test_rows=len(P["test"]))
+
+    model_path = base / MODEL_PATH
+    model_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(model_path, "wb") as f:
+        pickle.dump({"model": model, "metrics": metrics}, f)
+    with open(base / METRICS_PATH, "w", encoding="utf-8") as f:
+        json.dump(metrics, f, indent=2)
+    logger.info(f"Train accuracy {metrics['train_acc']:.3f}, test accuracy {metrics['test_acc']:.3f} "
+                f"(split {metrics['split_date']}) -> {model_path}")
+
+def predict(base: Path):
+    """Predictions for every row of the dataset from the saved model"""
+    with open(base / MODEL_PATH, "rb") as f:
+        saved = pickle.load(f)
+    metrics = saved["metrics"]
+    df = pd.read_csv(base / DATASET)
+    P = prepare(df, start_date=metrics["start_date"], train_prop=metrics["train_prop"])
+    preds_df = compute_predictions_df(P, saved["model"], metrics)
+
+    filename, csv_bytes = save_dataframe_csv(preds_df, filename=str(base / PREDICTIONS))
+    with open(filename, "wb") as f:
+        f.write(csv_bytes)
+    logger.info(f"Wrote {len(preds_df)} predictions to {filename}")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Train the match model or write its predictions"
+    )
+    parser.add_argument(
+        "stage",
+        choices=("train", "predict"),
+        help="Stage to run"
+    )
+    parser.add_argument(
+        "--base-dir",
+        type=Path,
+        default=Path(__file__).parent.parent,
+        help="Project root directory"
+    )
+    parser.add_argument(
+        "--start-date",
+        type=str,
+        default="2023-01-01",
+        help="Train on matches on/after this date (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        "--train-prop",
+        type=float,
+        default=0.75,
+        help="Fraction of the earliest dates used for training"
+    )
+    args = parser.parse_args()
+
+    if args.stage == "train":
+        train(args.base_dir, args.start_date, args.train_prop)
+    else:
+        predict(args.base_dir)
+
+if __name__ == "__main__":
+    main()
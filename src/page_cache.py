@@ -0,0 +1,214 @@
+# ON-DISK CACHE OF RENDERED VLR PAGES + A BROWSERLESS DRIVER THAT REPLAYS THEM
+# (lets the parsers re-run over every scraped match without Selenium or the network)
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from vlr_html import hidden_map_panel, parse_html
+
+MAP_BUTTON_SELECTOR = ".vm-stats-gamesnav-item.js-map-switch"
+OVERVIEW_TAB = "overview"
+
+
+def map_tab(button_index):
+    """Cache tab name for the page state after clicking the map button at `button_index`"""
+    return f"map-{button_index}"
+
+
+class PageCache:
+    """
+    Content-addressed store of page snapshots, one gzipped JSON file per (url, tab)
+    Files live at <root>/<key[:2]>/<key>.json.gz where key = sha256(url + tab)
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    @staticmethod
+    def key(url, tab=OVERVIEW_TAB):
+        return hashlib.sha256(f"{url}\n{tab}".encode("utf-8")).hexdigest()
+
+    def path(self, url, tab=OVERVIEW_TAB):
+        key = self.key(url, tab)
+        return os.path.join(self.root, key[:2], f"{key}.json.gz")
+
+    def __contains__(self, url):
+        return os.path.exists(self.path(url))
+
+    def get(self, url, tab=OVERVIEW_TAB):
+        """Return the cached snapshot dict, or None if this page/tab was never stored"""
+        path = self.path(url, tab)
+        if not os.path.exists(path):
+            return None
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def put(self, url, tab, snapshot):
+        """Store a snapshot atomically (written to a temp file, then renamed into place)"""
+        path = self.path(url, tab)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        record = dict(snapshot, url=url, tab=tab, cached_at=time.strftime("%Y-%m-%dT%H:%M:%S"))
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+                f.write(json.dumps(record, ensure_ascii=False).encode("utf-8"))
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def snapshot_page(driver, include_html=True):
+    """
+    Capture everything the parsers read from a rendered page
+    Map tabs only need their body text - the HTML and header are shared with the overview
+    """
+    snapshot = {
+        "title": driver.title,
+        "text": driver.find_element(By.TAG_NAME, "body").text,
+    }
+    if include_html:
+        snapshot["html"] = driver.page_source
+        for key, selector in (("header_vs_text", ".match-header-vs"), ("header_text", ".match-header")):
+            elements = driver.find_elements(By.CSS_SELECTOR, selector)
+            snapshot[key] = elements[0].text if elements else None
+        snapshot["map_buttons"] = [
+            {"class": b.get_attribute("class"), "text": b.text}
+            for b in driver.find_elements(By.CSS_SELECTOR, MAP_BUTTON_SELECTOR)
+        ]
+    return snapshot
+
+
+def snapshot_html(html):
+    """
+    snapshot_page for a page fetched without a browser: the same fields, rendered from its HTML
+    (inactive map panels are left out of the body text, as a browser would hide them)
+    """
+    root = parse_html(html)
+    title_node = root.find("title")
+    body = root.find("body") or root
+
+    snapshot = {
+        "title": "".join(c for c in title_node.children if isinstance(c, str)).strip() if title_node else "",
+        "text": body.render_text(skip=hidden_map_panel),
+        "html": html,
+    }
+    for key, cls in (("header_vs_text", "match-header-vs"), ("header_text", "match-header")):
+        node = root.find(classes=(cls,))
+        snapshot[key] = node.text if node is not None else None
+    snapshot["map_buttons"] = [
+        {"class": b.get("class", ""), "text": b.text}
+        for b in root.find_all(classes=("vm-stats-gamesnav-item", "js-map-switch"))
+    ]
+    return snapshot
+
+
+class _ReplayElement:
+    def __init__(self, text, classes=""):
+        self.text = text
+        self._classes = classes
+
+    def get_attribute(self, name):
+        return self._classes if name == "class" else None
+
+
+class _ReplayMapButton(_ReplayElement):
+    def __init__(self, driver, index, text, classes):
+        super().__init__(text, classes)
+        self._driver = driver
+        self._index = index
+
+    def click(self):
+        self._driver.show_tab(map_tab(self._index))
+        self._classes = f"{self._classes} mod-active"
+
+
+class PageNotCached(KeyError):
+    """A replayed page (or map tab) that was never stored in the cache"""
+
+    # KeyError would print the message quoted, like a missing dict key
+    __str__ = Exception.__str__
+
+
+class ReplayDriver:
+    """
+    Stand-in for a Selenium driver that serves pages from a PageCache
+    Implements only the calls the match-page parsers make
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.url = None
+        self._overview = None
+        self._current = None
+
+    def get(self, url):
+        snapshot = self.cache.get(url)
+        if snapshot is None:
+            raise PageNotCached(f"Page not in cache: {url}")
+        self.url = url
+        self._overview = self._current = snapshot
+
+    def show_tab(self, tab):
+        snapshot = self.cache.get(self.url, tab)
+        if snapshot is None:
+            raise PageNotCached(f"Tab {tab} not in cache: {self.url}")
+        self._current = snapshot
+
+    @property
+    def title(self):
+        return self._overview.get("title", "")
+
+    @property
+    def page_source(self):
+        return self._overview.get("html", "")
+
+    def execute_script(self, script, *args):
+        return "complete"
+
+    def find_element(self, by, value):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"{value} not in cached page {self.url}")
+        return elements[0]
+
+    def find_elements(self, by, value):
+        if by == By.TAG_NAME and value == "body":
+            return [_ReplayElement(self._current.get("text", ""))]
+        if by == By.CSS_SELECTOR and value == ".match-header-vs" and self._overview.get("header_vs_text") is not None:
+            return [_ReplayElement(self._overview["header_vs_text"])]
+        if by == By.CSS_SELECTOR and value == ".match-header" and self._overview.get("header_text") is not None:
+            return [_ReplayElement(self._overview["header_text"])]
+        if by == By.CSS_SELECTOR and value == MAP_BUTTON_SELECTOR:
+            return [
+                _ReplayMapButton(self, i, b["text"], b["class"])
+                for i, b in enumerate(self._overview.get("map_buttons", []))
+            ]
+        return []
+
+    def quit(self):
+        pass
+
+
+class ReplayPool:
+    """Drop-in for DriverPool that hands out ReplayDrivers over one cache"""
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    @contextmanager
+    def driver(self):
+        yield ReplayDriver(self.cache)
+
+    def shutdown(self):
+        pass
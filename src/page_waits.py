@@ -0,0 +1,117 @@
+# CONDITION-BASED WAITS FOR PAGE LOADS AND MAP SWITCHES
+# (replaces fixed time.sleep calls; every wait's real duration is recorded)
+
+import csv
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+PAGE_TIMEOUT = 10
+MAP_SWITCH_TIMEOUT = 5
+POLL_INTERVAL = 0.1
+
+
+class WaitStats:
+    """
+    Thread-safe log of how long each wait took, grouped by kind ('match_list', 'match_page', 'map_switch', ...)
+    """
+
+    def __init__(self):
+        self.samples = []
+        self._lock = threading.Lock()
+
+    def record(self, kind, seconds, timed_out):
+        with self._lock:
+            self.samples.append((kind, seconds, timed_out))
+
+    def summary(self):
+        """Per-kind count, timeouts and latency percentiles in seconds"""
+        with self._lock:
+            samples = list(self.samples)
+
+        by_kind = {}
+        for kind, seconds, timed_out in samples:
+            by_kind.setdefault(kind, []).append((seconds, timed_out))
+
+        summary = {}
+        for kind, rows in by_kind.items():
+            durations = sorted(seconds for seconds, _ in rows)
+            summary[kind] = {
+                'count': len(durations),
+                'timeouts': sum(1 for _, timed_out in rows if timed_out),
+                'p50': _percentile(durations, 50),
+                'p90': _percentile(durations, 90),
+                'p99': _percentile(durations, 99),
+                'max': durations[-1],
+                'total': sum(durations),
+            }
+        return summary
+
+    def print_summary(self):
+        summary = self.summary()
+        if not summary:
+            return
+        print("\nPage-ready latency (seconds):")
+        for kind, s in sorted(summary.items()):
+            print(f"  {kind:<12} n={s['count']:<5} p50={s['p50']:.2f} p90={s['p90']:.2f} "
+                  f"p99={s['p99']:.2f} max={s['max']:.2f} timeouts={s['timeouts']} total={s['total']:.0f}s")
+
+    def to_csv(self, path):
+        with self._lock:
+            samples = list(self.samples)
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['kind', 'seconds', 'timed_out'])
+            writer.writerows(samples)
+
+
+def _percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+# Shared by every worker thread
+wait_stats = WaitStats()
+
+
+def wait_until(driver, condition, kind, timeout=PAGE_TIMEOUT):
+    """
+    Poll `condition(driver)` until it is truthy or `timeout` passes
+    Never raises on timeout - callers parse whatever has rendered, as they did after a fixed sleep
+    Returns True if the condition was met
+    """
+    start = time.perf_counter()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(condition)
+        met = True
+    except TimeoutException:
+        met = False
+    wait_stats.record(kind, time.perf_counter() - start, not met)
+    if not met:
+        print(f"    Timed out after {timeout}s waiting for {kind}")
+    return met
+
+
+def wait_for_page(driver, css_selector=None, kind='page', timeout=PAGE_TIMEOUT):
+    """
+    Wait for the document to finish loading and, if given, for `css_selector` to appear
+    """
+    def ready(d):
+        if d.execute_script("return document.readyState") != 'complete':
+            return False
+        return css_selector is None or bool(d.find_elements(By.CSS_SELECTOR, css_selector))
+
+    return wait_until(driver, ready, kind, timeout)
+
+
+def wait_for_active_map(driver, button, kind='map_switch', timeout=MAP_SWITCH_TIMEOUT):
+    """
+    Wait for a clicked map tab to become the active one (VLR marks it with 'mod-active')
+    """
+    def active(d):
+        return 'mod-active' in (button.get_attribute('class') or '')
+
+    return wait_until(driver, active, kind, timeout)
@@ -0,0 +1,181 @@
+# STREAMING PARTITIONED STORE FOR SCRAPED ROWS
+# (every match's matches/players/maps rows are appended as soon as it is parsed, into
+#  {kind}/team=<TEAM>/month=<YYYY-MM>/ part files, instead of one file per team at the end;
+#  published parts are written with dataset_store in the run's formats and schema types)
+
+import glob
+import io
+import os
+import threading
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+from dataset_store import SCHEMAS, csv_convert_options, read_dataset, write_dataset
+
+KINDS = ('matches', 'players', 'maps')
+IN_PROGRESS = '.inprogress'
+
+
+def match_month(date):
+    """Partition month for a VLR list date ('2025/03/14' -> '2025-03'); 'unknown' if missing"""
+    if not isinstance(date, str) or len(date) < 7:
+        return 'unknown'
+    return date[:7].replace('/', '-')
+
+
+def partition_dir(root, kind, team_name, month):
+    return os.path.join(root, kind, f"team={team_name.upper()}", f"month={month}")
+
+
+class PartitionedStore:
+    """
+    Thread-safe appender of per-match rows into team/month partitions
+    Each partition has at most one open part, journaled to `part-<run>-<n>.csv.inprogress`; rows
+    are flushed and fsynced after every match. Once the part holds `rows_per_part` rows, or on
+    finalize()/close(), it is published as `part-<run>-<n>` in `formats` (write_dataset, so
+    Parquet parts carry the schema types) and the journal is removed. Readers see published
+    parts only, unless they ask for in-progress ones too
+    """
+
+    def __init__(self, root, rows_per_part=2000, formats=('parquet',)):
+        self.root = root
+        self.rows_per_part = rows_per_part
+        self.formats = tuple(formats)
+        # Unique per writer, so several processes can write the same partition
+        self.run_id = f"{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}"
+        self._parts = {}
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self.rows_written = 0
+        self.parts_finalized = 0
+
+    def write_match(self, team_name, match, players_df, maps_df):
+        """Append one match's list row and its players/maps rows to the match's month partition"""
+        month = match_month(match.get('date'))
+        frames = (('matches', pd.DataFrame([match])), ('players', players_df), ('maps', maps_df))
+        with self._lock:
+            for kind, df in frames:
+                if not df.empty:
+                    self._append(kind, team_name, month, df)
+
+    def _append(self, kind, team_name, month, df):
+        key = (kind, team_name.upper(), month)
+        part = self._parts.get(key)
+        columns = list(df.columns)
+        if part is not None and part['columns'] != columns:
+            # A journal keeps one header; a frame with different columns starts a new part
+            self._finalize(key)
+            part = None
+        if part is None:
+            directory = partition_dir(self.root, kind, team_name, month)
+            os.makedirs(directory, exist_ok=True)
+            self._sequence += 1
+            path = os.path.join(directory, f"part-{self.run_id}-{self._sequence:05d}.csv{IN_PROGRESS}")
+            part = self._parts[key] = {
+                'path': path, 'file': open(path, 'w', newline='', encoding='utf-8'),
+                'columns': columns, 'rows': 0,
+            }
+            df.iloc[:0].to_csv(part['file'], index=False)
+
+        df.to_csv(part['file'], index=False, header=False)
+        part['file'].flush()
+        os.fsync(part['file'].fileno())
+        part['rows'] += len(df)
+        self.rows_written += len(df)
+        if part['rows'] >= self.rows_per_part:
+            self._finalize(key)
+
+    def _finalize(self, key):
+        part = self._parts.pop(key)
+        part['file'].close()
+        publish(part['path'], key[0], self.formats)
+        self.parts_finalized += 1
+
+    def finalize(self, team_name=None):
+        """Close and publish the open parts (of one team, or all of them)"""
+        with self._lock:
+            for key in [k for k in self._parts if team_name is None or k[1] == team_name.upper()]:
+                self._finalize(key)
+
+    def close(self):
+        self.finalize()
+
+
+def _part_stem(journal_path):
+    """.../part-<run>-<n>.csv.inprogress -> .../part-<run>-<n>"""
+    return journal_path[:-len(IN_PROGRESS)].rsplit('.', 1)[0]
+
+
+def _read_journal(path, kind):
+    """
+    An in-progress part's rows, parsed to the schema's types; a live writer may be mid-line,
+    so only the rows up to the last complete line are read
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    complete = data[:data.rfind(b'\n') + 1]
+    if complete.count(b'\n') <= 1:
+        return pd.DataFrame()
+    try:
+        return pacsv.read_csv(io.BytesIO(complete), convert_options=csv_convert_options(kind)).to_pandas()
+    except pa.ArrowInvalid:
+        # Rows that do not fit the schema: let pandas infer, as read_dataset does
+        return pd.read_csv(io.BytesIO(complete))
+
+
+def publish(journal_path, kind, formats=('parquet',)):
+    """
+    Write an in-progress part's rows as its final part in `formats` and remove the journal
+    Each file is written under a hidden temporary name and renamed into place, so a reader
+    never sees a half-written part; returns False if the journal held no complete rows
+    """
+    df = _read_journal(journal_path, kind)
+    if not df.empty:
+        stem = _part_stem(journal_path)
+        directory, name = os.path.split(stem)
+        for path in write_dataset(df, os.path.join(directory, f".tmp-{name}"), kind, formats):
+            os.replace(path, os.path.join(directory, name + path.suffix))
+    os.remove(journal_path)
+    return not df.empty
+
+
+def recover(root, formats=('parquet',)):
+    """
+    Publish the in-progress parts a crashed run left behind, dropping a torn trailing line
+    Only call this when no writer is running on `root`; returns the number of parts recovered
+    """
+    recovered = 0
+    for kind in KINDS:
+        for path in glob.glob(os.path.join(root, kind, 'team=*', 'month=*', f"*{IN_PROGRESS}")):
+            recovered += publish(path, kind, formats)
+    return recovered
+
+
+def read_partitions(root, kind, teams=None, include_in_progress=False):
+    """
+    Every row of `kind` under `root` as one DataFrame (empty if there are none), in the
+    schema's columns and types
+    include_in_progress=True also reads the parts a running (or crashed) scrape is still
+    writing, so downstream stages can work from a partial run. Rows written twice - a match
+    re-driven after a crash - are dropped
+    """
+    team_dirs = ['team=*'] if teams is None else [f"team={team.upper()}" for team in teams]
+    columns = SCHEMAS[kind].names
+    stems, journals = set(), []
+    for team_dir in team_dirs:
+        for path in glob.glob(os.path.join(root, kind, team_dir, 'month=*', 'part-*')):
+            if path.endswith(IN_PROGRESS):
+                journals.append(path)
+            else:
+                # A part written in both formats is read once, from its newer file
+                stems.add(os.path.splitext(path)[0])
+    frames = [read_dataset(stem, kind, columns=columns, typed=True) for stem in sorted(stems)]
+    if include_in_progress:
+        frames += [_read_journal(path, kind).reindex(columns=columns) for path in sorted(journals)]
+    frames = [df for df in frames if not df.empty]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True).drop_duplicates(ignore_index=True)
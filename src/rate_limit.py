@@ -0,0 +1,59 @@
+# TOKEN-BUCKET RATE LIMITING SHARED BY ALL SCRAPER WORKERS
+# (one bucket per host, so concurrent workers stay polite to vlr.gg as a whole)
+
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, holding at most `burst`
+    """
+
+    def __init__(self, rate, burst=1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = float(max(burst, 1))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Take one token, sleeping until it is available
+        Returns the number of seconds spent waiting
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            # Reserve the token now (possibly going negative) and sleep outside the lock,
+            # so waiting callers queue up in arrival order
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """One TokenBucket per host, created on first use"""
+
+    def __init__(self, rate=1.0, burst=2):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        """Block until a request to the host of `url` is allowed; returns seconds waited"""
+        host = urlparse(url).netloc or url
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return bucket.acquire()
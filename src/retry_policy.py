@@ -0,0 +1,115 @@
+# RETRIES WITH JITTERED EXPONENTIAL BACKOFF, CIRCUIT BREAKERS AND A RE-DRIVE LOG
+# (transient page-load failures are retried; a team or host that keeps failing stops burning attempts)
+
+import json
+import os
+import random
+import threading
+import time
+
+
+class PageNotReady(Exception):
+    """A page load finished without the element the parsers need ever appearing"""
+
+
+class RetryPolicy:
+    """
+    Up to `attempts` tries; before retry n (1-based) sleep a random time in
+    [0, min(max_delay, base_delay * 2**(n-1))] ("full jitter", so workers don't retry in lockstep)
+    """
+
+    def __init__(self, attempts=3, base_delay=2.0, max_delay=30.0):
+        self.attempts = max(attempts, 1)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, retry_number):
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry_number - 1)))
+
+    def call(self, fn, *args, retry_on=(Exception,), on_retry=None, **kwargs):
+        """
+        fn(*args, **kwargs), retried on `retry_on` exceptions; the last failure is re-raised
+        on_retry(attempt, error, delay) is called before each backoff sleep
+        """
+        for attempt in range(1, self.attempts + 1):
+            try:
+                return fn(*args, **kwargs)
+            except retry_on as e:
+                if attempt == self.attempts:
+                    raise
+                delay = self.backoff(attempt)
+                if on_retry is not None:
+                    on_retry(attempt, e, delay)
+                time.sleep(delay)
+
+
+class CircuitBreaker:
+    """
+    Per-key consecutive-failure counter: after `threshold` failures in a row the key is open
+    for `cooldown` seconds, then half-open - one more failure opens it again, a success closes it
+    """
+
+    def __init__(self, threshold=5, cooldown=60.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures = {}
+        self._opened_at = {}
+        self._lock = threading.Lock()
+        self.trips = 0
+
+    def is_open(self, key):
+        with self._lock:
+            opened = self._opened_at.get(key)
+            return opened is not None and time.monotonic() - opened < self.cooldown
+
+    def remaining(self, key):
+        """Seconds until an open key goes half-open (0 if it is not open)"""
+        with self._lock:
+            opened = self._opened_at.get(key)
+            return 0.0 if opened is None else max(0.0, self.cooldown - (time.monotonic() - opened))
+
+    def wait(self, key):
+        """Block while `key` is open; returns the seconds paused"""
+        paused = self.remaining(key)
+        if paused:
+            time.sleep(paused)
+        return paused
+
+    def success(self, key):
+        with self._lock:
+            self._failures.pop(key, None)
+            self._opened_at.pop(key, None)
+
+    def failure(self, key):
+        """Record a failure; returns True if this one tripped the breaker"""
+        with self._lock:
+            failures = self._failures[key] = self._failures.get(key, 0) + 1
+            if failures < self.threshold:
+                return False
+            # Opening, or re-opening after a failed half-open attempt
+            self._opened_at[key] = time.monotonic()
+            self.trips += 1
+            return True
+
+
+class RedriveLog:
+    """
+    Append-only JSONL of pages that needed retries, were abandoned or were skipped by an open
+    breaker, so a later run (or --resume) can target exactly those URLs
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def record(self, status, url, team_name, attempts=0, error=None, **extra):
+        entry = dict(status=status, url=url, team_name=team_name, attempts=attempts,
+                     error=None if error is None else str(error)[:300],
+                     at=time.strftime('%Y-%m-%dT%H:%M:%S'), **extra)
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
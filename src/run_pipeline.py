@@ -0,0 +1,307 @@
+### END-TO-END PIPELINE RUNNER ###
+# (scrape -> combine -> unify -> features -> train -> predictions; every stage declares its input
+#  and output files, and one whose input hashes and parameters match its last successful run - with
+#  its outputs still as it left them - is skipped, so a nightly refresh recomputes only what changed)
+
+import argparse
+import glob
+import hashlib
+import json
+import logging
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from graphlib import TopologicalSorter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from combine_manifest import file_sha256
+from dataset_store import FORMAT_CHOICES, parse_formats
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SRC_DIR = Path(__file__).resolve().parent
+ROOT_DIR = SRC_DIR.parent
+NOTEBOOK = ROOT_DIR / "notebooks/00_data_inspect.ipynb"
+MANIFEST_NAME = "data/pipeline_manifest.json"
+
+# inputs/outputs are glob patterns, relative to --base-dir unless absolute (the code files);
+# params are what the command depends on besides its inputs; `always` stages (the scraper, whose
+# input is the website) run every time they are selected
+Stage = namedtuple('Stage', 'name deps inputs outputs params command always')
+
+
+def build_stages(args) -> List[Stage]:
+    base = args.base_dir
+    formats = parse_formats(args.format)
+    r2 = "data/processed/R2_processed"
+
+    def datasets(*stems):
+        return [f"{stem}.{fmt}" for stem in stems for fmt in formats]
+
+    # combine_team_data.py writes the R2_all_* outputs as one part per team
+    r2_all = [f"{r2}/R2_all_{kind}/*.{fmt}" for kind in ("matches", "maps", "players") for fmt in formats]
+
+    def script(name, *extra):
+        return lambda: run_script(name, *extra)
+
+    raw = [f"data/raw/vlr_data/{kind}/*" for kind in ("matches", "players", "maps")]
+    return [
+        Stage("scrape", [], [], raw, {"format": args.format, "args": args.scrape_args},
+              script("scrape_vlr.py", "--format", args.format, *shlex.split(args.scrape_args)), True),
+        Stage("combine", ["scrape"],
+              raw + [SRC_DIR / name for name in ("combine_team_data.py", "combine_manifest.py", "dataset_store.py",
+                                                 "compact_dtypes.py")],
+              r2_all,
+              {"format": args.format},
+              script("combine_team_data.py", "--base-dir", str(base), "--format", args.format), False),
+        Stage("unify", ["combine"],
+              r2_all
+              + [SRC_DIR / name for name in ("create_r2_unified.py", "match_tables.py", "validate_r2.py",
+                                             "dataset_store.py", "compact_dtypes.py")],
+              datasets(f"{r2}/R2_match_table", f"{r2}/R2_match_players", f"{r2}/R2_unified_dataset"),
+              {"format": args.format},
+              script("create_r2_unified.py", "--base-dir", str(base), "--format", args.format), False),
+        Stage("features", ["unify"],
+              datasets(f"{r2}/R2_match_table", f"{r2}/R2_match_players")
+              + [NOTEBOOK, SRC_DIR / "match_tables.py", SRC_DIR / "dataset_store.py", SRC_DIR / "compact_dtypes.py"],
+              ["notebooks/processed_valorant_dataset.csv", "app/processed_valorant_dataset.csv"],
+              {},
+              lambda: run_features(base), False),
+        Stage("train", ["features"],
+              ["app/processed_valorant_dataset.csv", ROOT_DIR / "app/model_utils.py", SRC_DIR / "model_stages.py",
+               SRC_DIR / "compact_dtypes.py"],
+              ["data/models/model.pkl", "data/models/metrics.json"],
+              {"start_date": args.start_date, "train_prop": args.train_prop},
+              script("model_stages.py", "train", "--base-dir", str(base), "--start-date", args.start_date,
+                     "--train-prop", str(args.train_prop)), False),
+        Stage("predictions", ["train"],
+              ["app/processed_valorant_dataset.csv", "data/models/model.pkl", ROOT_DIR / "app/model_utils.py",
+               SRC_DIR / "model_stages.py", SRC_DIR / "compact_dtypes.py"],
+              ["app/all_predictions.csv"],
+              {},
+              script("model_stages.py", "predict", "--base-dir", str(base)), False),
+    ]
+
+
+def run_script(name: str, *args: str):
+    """A pipeline script in its own interpreter, from src/ (the scraper's paths are relative to it)"""
+    subprocess.run([sys.executable, name, *args], cwd=SRC_DIR, check=True)
+
+
+def notebook_code(path: Path) -> str:
+    """The notebook's code cells, top to bottom, as one script"""
+    with open(path, encoding="utf-8") as f:
+        cells = json.load(f)["cells"]
+    return "\n\n".join("".join(cell["source"]) for cell in cells if cell["cell_type"] == "code")
+
+
+def run_features(base: Path):
+    """Run the feature notebook in a fresh interpreter (no Jupyter needed), then hand its dataset to the app"""
+    env = dict(os.environ, PIPELINE_BASE_DIR=str(base), MPLBACKEND="Agg",
+               PYTHONPATH=os.pathsep.join(filter(None, [str(SRC_DIR), os.environ.get("PYTHONPATH")])))
+    for directory in ("notebooks", "app"):
+        (base / directory).mkdir(parents=True, exist_ok=True)
+    subprocess.run([sys.executable, "-c", notebook_code(NOTEBOOK)], cwd=NOTEBOOK.parent, env=env, check=True)
+    shutil.copyfile(base / "notebooks/processed_valorant_dataset.csv", base / "app/processed_valorant_dataset.csv")
+
+
+class PipelineManifest:
+    """
+    JSON manifest: {"stages": {name: {"key", "outputs": {path: sha256}, "seconds", "finished_at"}},
+                    "files": {path: {"size", "mtime_ns", "sha256"}}}
+    "files" caches hashes, so a file whose size and mtime are unchanged is not read again
+    """
+
+    def __init__(self, path: Path, base: Path):
+        self.path = Path(path)
+        self.base = Path(base)
+        self.stages: Dict[str, dict] = {}
+        self.files: Dict[str, dict] = {}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                payload = json.load(f)
+            self.stages = payload.get("stages", {})
+            self.files = payload.get("files", {})
+
+    def expand(self, patterns) -> List[Path]:
+        paths = set()
+        for pattern in patterns:
+            paths.update(Path(p) for p in glob.glob(str(self.base / pattern)) if os.path.isfile(p))
+        return sorted(paths)
+
+    def file_hash(self, path: Path) -> str:
+        stat = path.stat()
+        key = str(path)
+        known = self.files.get(key, {})
+        if known.get("size") != stat.st_size or known.get("mtime_ns") != stat.st_mtime_ns:
+            known = self.files[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": file_sha256(path)}
+        return known["sha256"]
+
+    def hashes(self, patterns) -> Dict[str, str]:
+        return {str(path): self.file_hash(path) for path in self.expand(patterns)}
+
+    def stage_key(self, stage: Stage) -> str:
+        """sha256 over the stage's parameters and the content of every input file"""
+        payload = {"params": stage.params, "inputs": self.hashes(stage.inputs)}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def up_to_date(self, stage: Stage, key: str) -> bool:
+        """Same key as the last successful run, and every output it wrote is still there, unchanged"""
+        record = self.stages.get(stage.name)
+        if record is None or record["key"] != key or not record["outputs"]:
+            return False
+        return self.hashes(stage.outputs) == record["outputs"]
+
+    def record(self, stage: Stage, key: str, seconds: float):
+        # Keyed by the inputs as they were when the stage started
+        self.stages[stage.name] = {
+            "key": key,
+            "outputs": self.hashes(stage.outputs),
+            "seconds": round(seconds, 3),
+            "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        self.save()
+
+    def save(self):
+        """Write atomically, so an interrupted run never leaves a half-written manifest"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"stages": self.stages, "files": self.files}, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+
+def select_stages(stages: List[Stage], names: Optional[str], start: Optional[str]) -> List[Stage]:
+    """Stages in dependency order, limited to `names` (comma-separated) and/or those from `start` on"""
+    by_name = {stage.name: stage for stage in stages}
+    order = list(TopologicalSorter({stage.name: stage.deps for stage in stages}).static_order())
+    wanted = set(order)
+    if names:
+        wanted = {name.strip() for name in names.split(",")}
+        unknown = wanted - set(by_name)
+        if unknown:
+            raise SystemExit(f"Unknown stage(s): {', '.join(sorted(unknown))} (choose from {', '.join(order)})")
+    if start:
+        if start not in by_name:
+            raise SystemExit(f"Unknown stage: {start} (choose from {', '.join(order)})")
+        wanted &= set(order[order.index(start):])
+    return [by_name[name] for name in order if name in wanted]
+
+
+def print_timings(results: List[tuple]):
+    print("\n=== Pipeline ===")
+    print(f"{'stage':<12} {'status':<10} {'seconds':>8}")
+    for name, status, seconds in results:
+        print(f"{name:<12} {status:<10} {seconds:>8.2f}")
+    print(f"{'total':<12} {'':<10} {sum(seconds for _, _, seconds in results):>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run scrape -> combine -> unify -> features -> train -> predictions, skipping unchanged stages"
+    )
+    parser.add_argument(
+        "--base-dir",
+        type=Path,
+        default=ROOT_DIR,
+        help="Project root directory"
+    )
+    parser.add_argument(
+        "--stages",
+        type=str,
+        default=None,
+        help="Comma-separated stages to run (default: all), e.g. combine,unify"
+    )
+    parser.add_argument(
+        "--from",
+        dest="start",
+        type=str,
+        default=None,
+        help="Run this stage and everything after it (e.g. --from combine to refresh without scraping)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Run the selected stages even if their inputs are unchanged"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only show which stages would run"
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMAT_CHOICES,
+        default="parquet",
+        help="File format of the raw and R2_processed datasets"
+    )
+    parser.add_argument(
+        "--scrape-args",
+        type=str,
+        default="--incremental",
+        help="Extra arguments for scrape_vlr.py"
+    )
+    parser.add_argument(
+        "--start-date",
+        type=str,
+        default="2023-01-01",
+        help="Train on matches on/after this date (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        "--train-prop",
+        type=float,
+        default=0.75,
+        help="Fraction of the earliest dates used for training"
+    )
+    args = parser.parse_args()
+    args.base_dir = args.base_dir.resolve()
+
+    stages = select_stages(build_stages(args), args.stages, args.start)
+    if any(stage.name == "scrape" for stage in stages) and args.base_dir != ROOT_DIR:
+        # scrape_vlr.py writes to ../data relative to src/
+        raise SystemExit("The scrape stage writes under this repository's data/; drop --base-dir or use --from combine")
+    manifest = PipelineManifest(args.base_dir / MANIFEST_NAME, args.base_dir)
+
+    results = []
+    pending = set()
+    for stage in stages:
+        start = time.perf_counter()
+        upstream = args.dry_run and pending.intersection(stage.deps)
+        key = manifest.stage_key(stage)
+        if not (args.force or stage.always or upstream) and manifest.up_to_date(stage, key):
+            logger.info(f"[{stage.name}] inputs unchanged - skipped")
+            results.append((stage.name, "skipped", time.perf_counter() - start))
+            continue
+        if args.dry_run:
+            # Without running it, a stage's new outputs are unknown: everything after it may run too
+            logger.info(f"[{stage.name}] would run")
+            pending.add(stage.name)
+            results.append((stage.name, "would run", time.perf_counter() - start))
+            continue
+
+        logger.info(f"[{stage.name}] running")
+        try:
+            stage.command()
+        except (subprocess.CalledProcessError, OSError) as e:
+            logger.error(f"[{stage.name}] failed: {e}")
+            results.append((stage.name, "failed", time.perf_counter() - start))
+            print_timings(results)
+            raise SystemExit(1)
+        seconds = time.perf_counter() - start
+        manifest.record(stage, key, seconds)
+        results.append((stage.name, "ran", seconds))
+
+    # Keeps the file hashes computed for skipped stages
+    if not args.dry_run:
+        manifest.save()
+    print_timings(results)
+
+if __name__ == "__main__":
+    main()
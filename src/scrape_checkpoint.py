@@ -0,0 +1,93 @@
+# CRASH-SAFE PER-MATCH CHECKPOINTS FOR LONG SCRAPE RUNS
+# (one append-only JSONL journal per team; --resume replays it instead of re-fetching)
+
+import json
+import os
+import shutil
+import threading
+
+import pandas as pd
+
+
+def _records(df):
+    # to_json handles numpy scalars and NaN (read_csv frames), unlike json.dumps
+    return json.loads(df.to_json(orient='records')) if not df.empty else []
+
+
+class TeamJournal:
+    """
+    Append-only log of one team's progress:
+      {"type": "matches", "rows": [...]}                              the match list, once fetched
+      {"type": "match", "match_url": ..., "players": [...], "maps": [...]}   one per finished match
+      {"type": "done"}                                                the team's CSVs were written
+    Every line is flushed and fsynced before the call returns, so a crash loses at most the page in flight
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.matches_df = None
+        self.completed = {}
+        self.done = False
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        intact = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                intact += len(line)
+                if entry['type'] == 'matches':
+                    self.matches_df = pd.DataFrame(entry['rows'])
+                elif entry['type'] == 'match':
+                    self.completed[entry['match_url']] = (pd.DataFrame(entry['players']), pd.DataFrame(entry['maps']))
+                elif entry['type'] == 'done':
+                    self.done = True
+
+        # Drop a line cut short by the crash so new entries start on a clean line
+        if intact < os.path.getsize(self.path):
+            with open(self.path, 'r+b') as f:
+                f.truncate(intact)
+
+    def _append(self, entry):
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def record_matches(self, matches_df):
+        self.matches_df = matches_df
+        self._append({'type': 'matches', 'rows': _records(matches_df)})
+
+    def record_match(self, match_url, players_df, maps_df):
+        self.completed[match_url] = (players_df, maps_df)
+        self._append({'type': 'match', 'match_url': match_url,
+                      'players': _records(players_df), 'maps': _records(maps_df)})
+
+    def mark_done(self):
+        self.done = True
+        self._append({'type': 'done'})
+
+
+class ScrapeCheckpoint:
+    """Directory of TeamJournals for one scrape run"""
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def reset(self):
+        """Start a fresh run: forget every journal from the previous one"""
+        shutil.rmtree(self.root, ignore_errors=True)
+        os.makedirs(self.root, exist_ok=True)
+
+    def team(self, team_name):
+        return TeamJournal(os.path.join(self.root, f'{team_name.upper()}.jsonl'))
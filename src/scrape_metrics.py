@@ -0,0 +1,150 @@
+# PER-STAGE SCRAPE TELEMETRY: LATENCY HISTOGRAMS, FALLBACK AND FAILURE COUNTERS
+# (answers where a run's time goes - page loads, waits, WebDriver reads, clicks, parsing - and
+#  catches parse-quality regressions like a jump in "Unknown" maps)
+
+import csv
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open-ended
+HISTOGRAM_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+
+
+def _percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _bucket_label(index):
+    if index == len(HISTOGRAM_BUCKETS):
+        return f">{HISTOGRAM_BUCKETS[-1]}s"
+    return f"<={HISTOGRAM_BUCKETS[index]}s"
+
+
+class ScrapeMetrics:
+    """
+    Thread-safe stage timings and named counters for one scrape run
+    Stages nest (get_match_complete_data contains driver_get, parse_players, ...), so stage
+    totals overlap and are compared against each other, not summed
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self.counters = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        with self._lock:
+            self.timings.setdefault(stage, []).append(seconds)
+
+    def count(self, name, n=1):
+        if n:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextmanager
+    def timed(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def instrumented(self, stage):
+        """Decorator: time every call as `stage` and count the calls that raise as '<stage>_errors'"""
+        def decorate(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                except Exception:
+                    self.count(f"{stage}_errors")
+                    raise
+                finally:
+                    self.record(stage, time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def summary(self):
+        """{'stages': {stage: count/percentiles/total/histogram}, 'counters': {...}, 'elapsed': s}"""
+        with self._lock:
+            timings = {stage: sorted(values) for stage, values in self.timings.items()}
+            counters = dict(self.counters)
+
+        stages = {}
+        for stage, durations in timings.items():
+            histogram = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+            for seconds in durations:
+                histogram[next((i for i, bound in enumerate(HISTOGRAM_BUCKETS) if seconds <= bound),
+                               len(HISTOGRAM_BUCKETS))] += 1
+            stages[stage] = {
+                'count': len(durations),
+                'p50': _percentile(durations, 50),
+                'p90': _percentile(durations, 90),
+                'p99': _percentile(durations, 99),
+                'max': durations[-1],
+                'total': sum(durations),
+                'histogram': {_bucket_label(i): n for i, n in enumerate(histogram) if n},
+            }
+        return {'elapsed': time.time() - self.started, 'stages': stages, 'counters': counters}
+
+    def live_line(self):
+        """One-line running summary for progress output"""
+        summary = self.summary()
+        stages, counters = summary['stages'], summary['counters']
+        matches = stages.get('get_match_complete_data', {}).get('count', 0)
+        parts = [f"{matches} match pages"]
+        if matches:
+            parts.append(f"{summary['elapsed'] / matches:.1f}s/match")
+        for stage in ('rate_limit_wait', 'http_fetch', 'driver_get', 'parse_match_page'):
+            if stage in stages:
+                parts.append(f"{stage} p50 {stages[stage]['p50']:.2f}s")
+        for name in ('unknown_map_name', 'unknown_map_result', 'unknown_opponent', 'parse_errors'):
+            if counters.get(name):
+                parts.append(f"{name} {counters[name]}")
+        return ' | '.join(parts)
+
+    def print_summary(self):
+        summary = self.summary()
+        if not summary['stages']:
+            return
+        print("\nStage timings (seconds):")
+        for stage, s in sorted(summary['stages'].items(), key=lambda item: -item[1]['total']):
+            print(f"  {stage:<26} n={s['count']:<5} p50={s['p50']:.3f} p90={s['p90']:.3f} "
+                  f"p99={s['p99']:.3f} max={s['max']:.2f} total={s['total']:.1f}s")
+        if summary['counters']:
+            print("Counters:")
+            for name, n in sorted(summary['counters'].items()):
+                print(f"  {name:<26} {n}")
+
+    def write_report(self, directory, extra=None):
+        """
+        Write scrape_metrics_<timestamp>.json (full summary plus `extra`) and a .csv with one row
+        per stage and per counter; returns the JSON path
+        """
+        os.makedirs(directory, exist_ok=True)
+        stem = os.path.join(directory, f"scrape_metrics_{time.strftime('%Y%m%d_%H%M%S')}")
+        summary = self.summary()
+        report = dict(summary, **(extra or {}))
+        with open(stem + '.json', 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+        with open(stem + '.csv', 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['kind', 'name', 'count', 'p50', 'p90', 'p99', 'max', 'total'])
+            for stage, s in sorted(summary['stages'].items()):
+                writer.writerow(['stage', stage, s['count'], round(s['p50'], 4), round(s['p90'], 4),
+                                 round(s['p99'], 4), round(s['max'], 4), round(s['total'], 3)])
+            for name, n in sorted(summary['counters'].items()):
+                writer.writerow(['counter', name, n, '', '', '', '', ''])
+        return stem + '.json'
+
+
+# Shared by every worker thread
+scrape_metrics = ScrapeMetrics()
@@ -4,37 +4,33 @@ from selenium.webdriver.chrome.options import Options
 import pandas as pd
 import time
 import re
-import random
 import os
+import argparse
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import partial
 
-def clean_page_text(page_text):
-    """
-    Remove forum sections and comments from page text to avoid parsing interference
-    """
-    # Find section markers
-    forums_start = page_text.find('Forums')
-    more_matches_match = re.search(r'\.\.\. \d+ more matches', page_text)
-    comments_start = page_text.find('COMMENTS:')
-    
-    filtered_text = page_text
-    
-    # Remove from "Forums" to "... X more matches" 
-    if forums_start != -1 and more_matches_match:
-        end_pos = more_matches_match.end()
-        filtered_text = page_text[:forums_start] + page_text[end_pos:]
-    elif forums_start != -1:
-        # If no "more matches" found, just cut from Forums onward
-        filtered_text = page_text[:forums_start]
-    
-    # Remove everything after COMMENTS: 
-    comments_start = filtered_text.find('COMMENTS:')
-    if comments_start != -1:
-        filtered_text = filtered_text[:comments_start]
-    
-    return filtered_text
-
-
-
+from driver_pool import DriverPool
+from page_waits import wait_for_page, wait_for_active_map, wait_stats
+from page_cache import PageCache, PageNotCached, ReplayDriver, ReplayPool, snapshot_page, snapshot_html, map_tab, OVERVIEW_TAB
+from http_fetch import HttpFetcher
+from ingest_manifest import IngestManifest
+from scrape_checkpoint import ScrapeCheckpoint
+from match_registry import MatchRegistry
+from partitioned_store import PartitionedStore, recover as recover_partitions
+from dataset_store import FORMAT_CHOICES, dataset_file, parse_formats, read_dataset, write_dataset
+from scrape_metrics import scrape_metrics
+from retry_policy import RetryPolicy, CircuitBreaker, RedriveLog, PageNotReady
+from selenium.common.exceptions import WebDriverException
+from urllib.parse import urlparse
+from vlr_html import match_list_cards, match_list_page_count, match_page_parts
+from rate_limit import HostRateLimiter
+from vlr_parse import (
+    clean_page_text, series_score, body_series_score, title_series_score,
+    parse_players, parse_map_result, parse_single_map_data, parse_match_page,
+)
 
 vct_teams = {
     "Sentinels": 2,
@@ -82,6 +78,54 @@ vct_teams = {
     "Rare Atom": 11985,
 }
 
+# Site root for every URL the scraper builds (bench_scraper.py points it at a local stand-in server)
+VLR_BASE_URL = "https://www.vlr.gg"
+
+# Shared by every worker thread so the total request rate to vlr.gg stays polite
+# (main() replaces it with the --rate / --burst settings)
+rate_limiter = HostRateLimiter(rate=0.5, burst=1)
+
+# Elements whose presence means a page has rendered enough to parse
+MATCH_LIST_READY_SELECTOR = "a.m-item"
+MATCH_PAGE_READY_SELECTOR = ".match-header-vs"
+
+# Rendered pages are saved here so the parsers can be replayed offline (main() sets it from --cache-dir)
+DEFAULT_CACHE_DIR = '../data/raw/vlr_pages'
+page_cache = None
+
+# Plain-HTTP tier tried before Chrome for every page (main() sets it; None = browser only)
+http_fetcher = None
+
+# Matches between two tracked teams are fetched once per run and mirrored for the other team
+match_registry = MatchRegistry()
+
+# Page loads and map clicks are retried with jittered backoff on these errors; a team with
+# repeated abandoned matches is skipped for a while, and the whole host paused
+# (main() sets these from the command line; redrive_log records retried/abandoned/skipped pages,
+#  and in replay the match pages missing from the cache)
+TRANSIENT_ERRORS = (WebDriverException, PageNotReady)
+retry_policy = RetryPolicy(attempts=3, base_delay=2.0, max_delay=30.0)
+click_retry_policy = RetryPolicy(attempts=3, base_delay=0.5, max_delay=2.0)
+team_breaker = CircuitBreaker(threshold=5, cooldown=600)
+host_breaker = CircuitBreaker(threshold=10, cooldown=60)
+redrive_log = None
+DEFAULT_REDRIVE_LOG = '../data/raw/vlr_data/redrive.jsonl'
+
+# File formats of the per-team raw datasets (main() sets it from --format; Parquet by default)
+raw_formats = ('parquet',)
+
+# Optional streaming output: every match's rows appended to team/month partitions as soon as
+# they are parsed, published as parts in `raw_formats` (main() sets it with --partitioned; the team
+# datasets are still written at the end)
+DEFAULT_PARTITIONS_DIR = '../data/raw/vlr_data/partitions'
+row_store = None
+
+# Per-run stage timing / fallback counter reports (scrape_metrics.py)
+DEFAULT_METRICS_DIR = '../data/raw/vlr_data/metrics'
+
+# Per-team match journals of the current run, read back by --resume
+DEFAULT_CHECKPOINT_DIR = '../data/raw/vlr_data/checkpoints'
+
 
 
 
@@ -96,137 +140,381 @@ def setup_driver():
     driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
     return driver
 
+def load_page(driver, url, ready_selector, kind):
+    """
+    Open a page and wait until it is ready to parse
+    Live loads take a rate-limiter token first and are saved to the page cache
+    Raises PageNotReady if `ready_selector` never appears, so the caller can retry
+    """
+    if isinstance(driver, ReplayDriver):
+        with scrape_metrics.timed('driver_get'):
+            driver.get(url)
+        return
+    
+    scrape_metrics.record('rate_limit_wait', rate_limiter.wait(url))
+    with scrape_metrics.timed('driver_get'):
+        driver.get(url)
+    if not wait_for_page(driver, ready_selector, kind=kind):
+        raise PageNotReady(f"{ready_selector} never appeared on {url}")
+    cache_page(driver, url, OVERVIEW_TAB)
+
+def log_retry(attempt, error, delay):
+    """on_retry callback for RetryPolicy.call: report and count the failed attempt"""
+    print(f"    Attempt {attempt} failed ({type(error).__name__}: {str(error)[:120]}), retrying in {delay:.1f}s")
+    scrape_metrics.count('retries')
+
+def fetch_static(url):
+    """
+    Page HTML over the plain-HTTP tier (rate limited like a browser load), or None if the
+    tier is off or the request failed
+    """
+    if http_fetcher is None:
+        return None
+    scrape_metrics.record('rate_limit_wait', rate_limiter.wait(url))
+    with scrape_metrics.timed('http_fetch'):
+        return http_fetcher.fetch(url)
+
+def cache_html(url, html):
+    """cache_page for a page fetched without a browser"""
+    if page_cache is None:
+        return
+    try:
+        page_cache.put(url, OVERVIEW_TAB, snapshot_html(html))
+    except Exception as e:
+        print(f"    Could not cache {url}: {e}")
+
+def cache_page(driver, url, tab, include_html=True):
+    """
+    Save the current page state to the page cache (no-op when caching is off or replaying)
+    """
+    if page_cache is None or isinstance(driver, ReplayDriver):
+        return
+    try:
+        page_cache.put(url, tab, snapshot_page(driver, include_html=include_html))
+    except Exception as e:
+        print(f"    Could not cache {url} ({tab}): {e}")
+
+@contextmanager
+def checkout_driver(pool=None):
+    """
+    Yield a driver for one page load - from the pool if given, otherwise a throwaway one
+    """
+    if pool is not None:
+        with pool.driver() as driver:
+            yield driver
+        return
+
+    driver = setup_driver()
+    try:
+        yield driver
+    finally:
+        driver.quit()
+
 import re
 import time
 import pandas as pd
 from selenium.webdriver.common.by import By
 
-def get_team_matches(team_id, team_name, num_matches):
-    driver = setup_driver()
+def team_matches_url(team_id, team_name, page=1):
+    url = f"{VLR_BASE_URL}/team/matches/{team_id}/{team_name.lower()}/?group=completed"
+    return url if page == 1 else f"{url}&page={page}"
+
+# Match-list pages fetched ahead of the one being read during a history backfill
+BACKFILL_LOOKAHEAD = 3
+
+@scrape_metrics.instrumented('get_team_matches')
+def get_team_matches(team_id, team_name, num_matches, pool=None, known_urls=None, since_date=None,
+                     from_source=True):
+    """
+    Read a team's completed-matches list (newest first)
+    Stops early at the first match in `known_urls` or dated before `since_date` (incremental mode)
+    The list is fetched over plain HTTP first and only loaded in the browser if that fails
+    By default the browser's list is parsed locally from one page_source snapshot; from_source=False
+    (or a snapshot with no match cards) falls back to reading every element over WebDriver
+    """
+    url = team_matches_url(team_id, team_name)
+    print(f"Getting matches for {team_name}...")
     
-    try:
-        url = f"https://www.vlr.gg/team/matches/{team_id}/{team_name.lower()}/?group=completed"
-        print(f"Getting matches for {team_name}...")
-        
-        driver.get(url)
-        time.sleep(3)
-        
-        all_elements = driver.find_elements(By.CSS_SELECTOR, "*")
-        matches = []
-        seen_matches = set()
+    html = fetch_static(url)
+    if html is not None:
+        matches = collect_team_matches(match_list_cards(html), team_id, team_name,
+                                       num_matches, known_urls, since_date)
+        if matches or ((known_urls or since_date) and 'm-item' in html):
+            cache_html(url, html)
+            return pd.DataFrame(matches)
+        print("  No match cards in the static HTML, falling back to the browser")
+        http_fetcher.fell_back()
+        scrape_metrics.count('browser_fallbacks')
+    
+    with checkout_driver(pool) as driver:
+        load_page(driver, url, MATCH_LIST_READY_SELECTOR, kind='match_list')
         
-        # Precompile regexes once
-        score_re = re.compile(r'\b\d+\s*:\s*\d+\b')
-        date_re  = re.compile(r'\d{4}/\d{2}/\d{2}')
+        if from_source:
+            matches = collect_team_matches(match_list_cards(driver.page_source), team_id, team_name,
+                                           num_matches, known_urls, since_date)
+            if matches or known_urls or since_date or isinstance(driver, ReplayDriver):
+                return pd.DataFrame(matches)
+            print("  No matches found in page source, falling back to element scan")
         
-        for element in all_elements:
-            try:
-                text = element.text.strip()
-                score_match = re.search(r'(\d+)\s*:\s*(\d+)', text)
-                
-                if score_match and 20 < len(text) < 500:
-                    team_score = int(score_match.group(1))
-                    opponent_score = int(score_match.group(2))
-                    result = 'W' if team_score > opponent_score else 'L'
-                    score = f"{team_score}:{opponent_score}"
-                    
-                    # Get match URL
-                    match_url = None
-                    try:
-                        if element.tag_name == 'a':
-                            match_url = element.get_attribute('href')
-                        else:
-                            link = element.find_element(By.TAG_NAME, 'a')
-                            match_url = link.get_attribute('href')
-                        if match_url and match_url.startswith('/'):
-                            match_url = 'https://www.vlr.gg' + match_url
-                    except:
-                        pass
-                    
-                    match_key = (score, match_url) if match_url else (score, text[:50])
-                    if match_key in seen_matches or not match_url:
+        matches = collect_team_matches(element_match_cards(driver), team_id, team_name,
+                                       num_matches, known_urls, since_date)
+        return pd.DataFrame(matches)
+
+def load_match_list_html(url, pool=None):
+    """
+    HTML of one match-list page: plain HTTP first, the browser if that fails or has no match cards
+    """
+    html = fetch_static(url)
+    if html is not None and 'm-item' in html:
+        cache_html(url, html)
+        return html
+    if html is not None:
+        http_fetcher.fell_back()
+        scrape_metrics.count('browser_fallbacks')
+    
+    with checkout_driver(pool) as driver:
+        load_page(driver, url, MATCH_LIST_READY_SELECTOR, kind='match_list')
+        return driver.page_source
+
+def iter_match_history(team_id, team_name, until_date=None, max_pages=None, pool=None, skip_urls=None):
+    """
+    Walk a team's completed-match history page by page (newest first), yielding match_data dicts
+    as each page is read, until a match dated before `until_date` or after `max_pages` pages
+    The next BACKFILL_LOOKAHEAD pages are fetched concurrently while one is read; every load still
+    goes through the shared rate limiter. Matches in `skip_urls` (already saved) are passed over
+    without ending the walk, and a match that moves to the next page mid-walk is yielded once
+    """
+    def load(page):
+        url = team_matches_url(team_id, team_name, page)
+        html = retry_policy.call(load_match_list_html, url, pool=pool,
+                                 retry_on=TRANSIENT_ERRORS, on_retry=log_retry)
+        scrape_metrics.count('history_pages')
+        return collect_team_matches(match_list_cards(html), team_id, team_name, None), html
+    
+    print(f"Walking {team_name}'s match history back to {until_date or 'the first match'}...")
+    first_page, html = load(1)
+    page_count = match_list_page_count(html)
+    if max_pages:
+        page_count = min(page_count, max_pages)
+    print(f"  {page_count} pages of match history")
+    
+    seen = set()
+    with ThreadPoolExecutor(max_workers=BACKFILL_LOOKAHEAD, thread_name_prefix='pages') as page_executor:
+        pending = deque(page_executor.submit(load, page) for page in range(2, page_count + 1))
+        try:
+            matches, page = first_page, 1
+            while True:
+                for match in matches:
+                    if until_date and match['date'] and match['date'] < until_date:
+                        print(f"  Reached matches older than {until_date} on page {page}, stopping")
+                        return
+                    if match['match_url'] in seen or (skip_urls and match['match_url'] in skip_urls):
                         continue
-                    seen_matches.add(match_key)
-                    
-                    # Split into lines once
-                    lines = text.split('\n')
-                    
-                    # --- Extract tournament name ---
-                    tournament = 'Unknown'
-                    # Find first hashtag line
-                    first_hashtag_index = None
-                    for i, line in enumerate(lines):
-                        if line.strip().startswith('#'):
-                            first_hashtag_index = i
-                            break
-                    
-                    # Tournament name is ALWAYS 3 lines before the first hashtag
-                    if first_hashtag_index is not None and first_hashtag_index >= 3:
-                        tournament = lines[first_hashtag_index - 3].strip()
-                    
-                    # Pull out date line
-                    match_date = None
-                    for line in lines:
-                        line = line.strip()
-                        if date_re.match(line):
-                            match_date = line
-                            break
-                    
-                    # Existing opponent logic, now also skipping date lines
-                    opponent = 'Unknown'
-                    for line in lines[2:]:
-                        line = line.strip()
-                        if (
-                            not line
-                            or line.upper() == team_name.upper()
-                            or line.startswith('#')
-                            or score_re.match(line)
-                            or date_re.match(line)
-                            or (line.isdigit() and len(line) == 1)
-                            or line == ':'
-                        ):
-                            continue
-                        opponent = line
+                    seen.add(match['match_url'])
+                    yield dict(match, match_number=len(seen))
+                if not pending:
+                    return
+                matches, page = pending.popleft().result()[0], page + 1
+        finally:
+            # Stopped early (cutoff reached or the caller failed): drop the pages not started yet
+            for future in pending:
+                future.cancel()
+
+def element_match_cards(driver):
+    """
+    (text, get_url) for every element on the page, read over WebDriver (one round trip per call)
+    """
+    for element in driver.find_elements(By.CSS_SELECTOR, "*"):
+        try:
+            text = element.text
+        except Exception:
+            continue
+        yield text, partial(_element_href, element)
+
+def _element_href(element):
+    if element.tag_name == 'a':
+        return element.get_attribute('href')
+    link = element.find_element(By.TAG_NAME, 'a')
+    return link.get_attribute('href')
+
+# Precompile regexes once
+MATCH_SCORE_RE = re.compile(r'(\d+)\s*:\s*(\d+)')
+SCORE_LINE_RE  = re.compile(r'\b\d+\s*:\s*\d+\b')
+DATE_RE        = re.compile(r'\d{4}/\d{2}/\d{2}')
+
+@scrape_metrics.instrumented('collect_team_matches')
+def collect_team_matches(cards, team_id, team_name, num_matches, known_urls=None, since_date=None):
+    """
+    Turn match-list candidates, (text, get_url) pairs in document order, into match_data dicts
+    Shared by the page_source and WebDriver element paths so both produce identical rows
+    num_matches=None reads every match on the page
+    """
+    matches = []
+    seen_matches = set()
+    
+    for text, get_url in cards:
+        try:
+            text = text.strip()
+            score_match = MATCH_SCORE_RE.search(text)
+            
+            if score_match and 20 < len(text) < 500:
+                team_score = int(score_match.group(1))
+                opponent_score = int(score_match.group(2))
+                result = 'W' if team_score > opponent_score else 'L'
+                score = f"{team_score}:{opponent_score}"
+                
+                # Get match URL
+                match_url = None
+                try:
+                    match_url = get_url()
+                    if match_url and match_url.startswith('/'):
+                        match_url = VLR_BASE_URL + match_url
+                except Exception:
+                    pass
+                
+                match_key = (score, match_url) if match_url else (score, text[:50])
+                if match_key in seen_matches or not match_url:
+                    continue
+                seen_matches.add(match_key)
+                
+                # Split into lines once
+                lines = text.split('\n')
+                
+                # --- Extract tournament name ---
+                tournament = 'Unknown'
+                # Find first hashtag line
+                first_hashtag_index = None
+                for i, line in enumerate(lines):
+                    if line.strip().startswith('#'):
+                        first_hashtag_index = i
                         break
+                
+                # Tournament name is ALWAYS 3 lines before the first hashtag
+                if first_hashtag_index is not None and first_hashtag_index >= 3:
+                    tournament = lines[first_hashtag_index - 3].strip()
+                
+                # Pull out date line
+                match_date = None
+                for line in lines:
+                    line = line.strip()
+                    if DATE_RE.match(line):
+                        match_date = line
+                        break
+                
+                # The list is newest first, so everything past this point is already ingested
+                if known_urls and match_url in known_urls:
+                    print(f"  Reached already-ingested match {match_url}, stopping")
+                    break
+                if since_date and match_date and match_date < since_date:
+                    print(f"  Reached matches older than {since_date}, stopping")
+                    break
+                
+                # Existing opponent logic, now also skipping date lines
+                opponent = 'Unknown'
+                for line in lines[2:]:
+                    line = line.strip()
+                    if (
+                        not line
+                        or line.upper() == team_name.upper()
+                        or line.startswith('#')
+                        or SCORE_LINE_RE.match(line)
+                        or DATE_RE.match(line)
+                        or (line.isdigit() and len(line) == 1)
+                        or line == ':'
+                    ):
+                        continue
+                    opponent = line
+                    break
 
-                    match_data = {
-                        'team_id':     team_id,
-                        'team_name':   team_name,
-                        'match_number': len(matches) + 1,
-                        'date':        match_date,
-                        'result':      result,
-                        'score':       score,
-                        'opponent':    opponent,
-                        'tournament':  tournament,
-                        'match_url':   match_url
-                    }
-                    
-                    matches.append(match_data)
-                    print(f"  Match {len(matches)}: {match_date} {result} vs {opponent} ({score}) - {tournament}")
+                match_data = {
+                    'team_id':     team_id,
+                    'team_name':   team_name,
+                    'match_number': len(matches) + 1,
+                    'date':        match_date,
+                    'result':      result,
+                    'score':       score,
+                    'opponent':    opponent,
+                    'tournament':  tournament,
+                    'match_url':   match_url
+                }
+                
+                matches.append(match_data)
+                print(f"  Match {len(matches)}: {match_date} {result} vs {opponent} ({score}) - {tournament}")
+                
+                if num_matches and len(matches) >= num_matches:
+                    break
                     
-                    if len(matches) >= num_matches:
-                        break
-                        
-            except:
-                continue
-        
-        return pd.DataFrame(matches)
-        
-    finally:
-        driver.quit()
+        except Exception:
+            scrape_metrics.count('match_card_errors')
+            continue
+    
+    scrape_metrics.count('unknown_opponent', sum(1 for m in matches if m['opponent'] == 'Unknown'))
+    scrape_metrics.count('unknown_tournament', sum(1 for m in matches if m['tournament'] == 'Unknown'))
+    scrape_metrics.count('missing_date', sum(1 for m in matches if not m['date']))
+    return matches
 
 
-def get_match_complete_data(match_url, team_name, match_number, match_result):
+@scrape_metrics.instrumented('get_match_complete_data')
+def get_match_complete_data(match_url, team_name, match_number, match_result, pool=None):
     """
     Enhanced function to get players AND maps from a single match page visit
+    Load failures are retried with backoff; a match that still fails is abandoned (empty frames),
+    logged for re-drive and counted against the team's and the host's circuit breakers
+    A page missing from the replay cache is only logged as a miss - it says nothing about the
+    team or the host, and replay never loads from the host, so its breaker is bypassed
     """
-    driver = setup_driver()
+    host = None if isinstance(pool, ReplayPool) else urlparse(match_url).netloc
+    paused = host_breaker.wait(host) if host else 0
+    if paused:
+        print(f"  {host} paused for {paused:.0f}s after repeated failures")
+    
+    retries = []
+    def on_retry(attempt, error, delay):
+        retries.append(attempt)
+        log_retry(attempt, error, delay)
     
     try:
         print(f"  Getting complete data from: {match_url}")
-        
-        driver.get(match_url)
-        time.sleep(3)
+        players_df, maps_df = retry_policy.call(load_match_data, match_url, team_name, match_number,
+                                                match_result, pool=pool, retry_on=TRANSIENT_ERRORS,
+                                                on_retry=on_retry)
+    except PageNotCached as e:
+        print(f"  Not in the page cache: {e}")
+        scrape_metrics.count('cache_misses')
+        if redrive_log is not None:
+            redrive_log.record('miss', match_url, team_name, error=e, match_number=match_number)
+        return pd.DataFrame(), pd.DataFrame()
+    except Exception as e:
+        print(f"  ERROR: {e}")
+        scrape_metrics.count('match_errors')
+        if team_breaker.failure(team_name):
+            print(f"  {team_name}: too many failed matches, skipping the rest for {team_breaker.cooldown:.0f}s")
+            scrape_metrics.count('team_breaker_trips')
+        if host and host_breaker.failure(host):
+            scrape_metrics.count('host_pauses')
+        if redrive_log is not None:
+            redrive_log.record('abandoned', match_url, team_name, attempts=len(retries) + 1, error=e,
+                               match_number=match_number)
+        return pd.DataFrame(), pd.DataFrame()
+    
+    team_breaker.success(team_name)
+    if host:
+        host_breaker.success(host)
+    if retries and redrive_log is not None:
+        redrive_log.record('retried', match_url, team_name, attempts=len(retries) + 1, match_number=match_number)
+    return players_df, maps_df
+
+def load_match_data(match_url, team_name, match_number, match_result, pool=None):
+    """
+    One attempt at a match page: the static HTML first, the browser only for pages it could not
+    fully parse
+    """
+    static = get_match_data_from_html(match_url, team_name, match_number, match_result)
+    if static is not None:
+        return static
+    
+    with checkout_driver(pool) as driver:
+        load_page(driver, match_url, MATCH_PAGE_READY_SELECTOR, kind='match_page')
         
         # Get player data first (from overview/all maps)
         players_df = extract_player_data(driver, match_url, match_number)
@@ -234,79 +522,76 @@ def get_match_complete_data(match_url, team_name, match_number, match_result):
         # Get map data
         maps_df = extract_map_data(driver, match_url, team_name, match_number, match_result)
         
+        record_match_quality(players_df, maps_df)
         return players_df, maps_df
-        
-    except Exception as e:
-        print(f"  ERROR: {e}")
-        return pd.DataFrame(), pd.DataFrame()
-        
-    finally:
-        driver.quit()
 
+def record_match_quality(players_df, maps_df):
+    """Count the parser fallbacks that would otherwise only show up as odd values in the CSVs"""
+    if len(players_df) != 10:
+        scrape_metrics.count('player_count_not_10')
+    if maps_df.empty:
+        scrape_metrics.count('no_maps')
+        return
+    scrape_metrics.count('unknown_map_name', int((maps_df['map_name'] == 'Unknown').sum()))
+    scrape_metrics.count('unknown_map_result', int((maps_df['map_result'] == 'Unknown').sum()))
+
+def get_match_data_from_html(match_url, team_name, match_number, match_result):
+    """
+    Players + maps from the match page's static HTML, fetched over plain HTTP
+    Returns (players_df, maps_df), or None when the tier is off, the fetch failed or a field the
+    parsers need (match header, player stats, a played map's panel) is missing from the HTML
+    """
+    html = fetch_static(match_url)
+    if html is None:
+        return None
+    
+    with scrape_metrics.timed('parse_match_page'):
+        page = match_page_parts(html)
+        parsed = parse_match_page(page, html, team_name, match_url, match_number, match_result)
+    players, maps = parsed['players'], None
+    if page['header_text'] is None:
+        missing = 'match header'
+    elif not players and page['stat_panels']:
+        missing = 'player stats'
+    else:
+        maps = report_parsed_maps(parsed, page, team_name)
+        missing = 'map panels'
+    
+    if maps is None:
+        print(f"  Static HTML has no {missing}, falling back to the browser")
+        http_fetcher.fell_back()
+        scrape_metrics.count('browser_fallbacks')
+        return None
+    
+    cache_html(match_url, html)
+    players_df, maps_df = players_frame(players), pd.DataFrame(maps)
+    record_match_quality(players_df, maps_df)
+    return players_df, maps_df
+
+def players_frame(players):
+    for player in players:
+        print(f"    {player['player_name']} ({player['team']}): {player['rating']}")
+    print(f"  Found {len(players)} players")
+    return pd.DataFrame(players)
+
+@scrape_metrics.instrumented('extract_player_data')
 def extract_player_data(driver, match_url, match_number):
     """
     Extract player ratings (simplified without W/L logic)
     """
     try:
-        # Get and clean page text
-        raw_page_text = driver.find_element(By.TAG_NAME, 'body').text
-        page_text = clean_page_text(raw_page_text)
-        
-    
-        # Find where forums end (look for "... X more matches")
-        more_matches = re.search(r'\.\.\. \d+ more matches', page_text)
-        
-        match_start = 0
-        if more_matches:
-            match_start = more_matches.end()
-        
-        # Find where comments start
-        comments_start = page_text.find('COMMENTS:')
-        
-        # Extract only the match section
-        if comments_start != -1:
-            page_text = page_text[match_start:comments_start]
-        else:
-            page_text = page_text[match_start:]
-        
-        lines = page_text.split('\n')
-        
-        players = []
-        
-        # Looking for rating lines and extract player info
-        for i, line in enumerate(lines):
-            line = line.strip()
-            
-            # Look for rating lines that start with decimal
-            if re.match(r'^(0\.\d{2}|1\.\d{2}|2\.\d{2})', line):
-                rating = float(line.split()[0])
-                
-                # Player name is 2 lines before, team is 1 line before
-                if i >= 2:
-                    player_name = lines[i - 2].strip()
-                    team_name = lines[i - 1].strip()
-                    
-                    # Basic validation
-                    if (2 <= len(player_name) <= 20 and 
-                        2 <= len(team_name) <= 10 and
-                        team_name.isupper()):
-                        
-                        players.append({
-                            'player_name': player_name,
-                            'team': team_name,
-                            'rating': rating,
-                            'match_number': match_number,  
-                            'match_url': match_url
-                        })
-                        print(f"    {player_name} ({team_name}): {rating}")
-        
-        print(f"  Found {len(players)} players")
-        return pd.DataFrame(players)
+        with scrape_metrics.timed('read_body_text'):
+            raw_page_text = driver.find_element(By.TAG_NAME, 'body').text
+        with scrape_metrics.timed('parse_players'):
+            players = parse_players(raw_page_text, match_url, match_number)
+        return players_frame(players)
     
     except Exception as e:
         print(f"  Error extracting player data: {e}")
+        scrape_metrics.count('parse_errors')
         return pd.DataFrame()
 
+@scrape_metrics.instrumented('extract_map_data')
 def extract_map_data(driver, match_url, team_name, match_number, match_result):
     """
     Extract map results - handles both multi-map and single-map matches
@@ -317,6 +602,26 @@ def extract_map_data(driver, match_url, team_name, match_number, match_result):
     try:
         print(f"  Extracting map data for {team_name}...")
         
+        # Every map panel is already in the DOM, so try reading them all from one snapshot first
+        try:
+            with scrape_metrics.timed('read_page_source'):
+                page_source, title = driver.page_source, driver.title
+            with scrape_metrics.timed('parse_match_page'):
+                page = match_page_parts(page_source)
+                parsed = parse_match_page(page, page_source, team_name, match_url, match_number, match_result,
+                                          title=title)
+            snapshot_maps = report_parsed_maps(parsed, page, team_name)
+        except Exception as e:
+            print(f"  Error reading maps from page snapshot: {e}")
+            scrape_metrics.count('parse_errors')
+            snapshot_maps = None
+        
+        if snapshot_maps is not None:
+            print(f"  Found {len(snapshot_maps)} maps that were actually played")
+            return pd.DataFrame(snapshot_maps)
+        print(f"  Falling back to clicking through the map tabs")
+        scrape_metrics.count('click_fallbacks')
+        
         # First, determine how many maps were actually played from overall score
         maps_played = get_maps_actually_played(driver, match_url)
         print(f"  Maps actually played: {maps_played}")
@@ -359,8 +664,9 @@ def extract_map_data(driver, match_url, team_name, match_number, match_result):
                         
                         
                         try:
-                            button.click()
-                            time.sleep(2)
+                            with scrape_metrics.timed('map_click'):
+                                click_map_tab(driver, button)
+                            cache_page(driver, match_url, map_tab(i), include_html=False)
                             
                             # Get result AND scores for target team
                             result, our_score, their_score = get_map_result_from_page(driver, team_name)
@@ -383,6 +689,7 @@ def extract_map_data(driver, match_url, team_name, match_number, match_result):
                             
                         except Exception as e:
                             print(f"    Error processing map {map_number}: {e}")
+                            scrape_metrics.count('parse_errors')
                     else:
                         print(f"  Skipping Map {map_number}: {map_name} (not played - series ended {maps_played} maps)")
         
@@ -391,6 +698,7 @@ def extract_map_data(driver, match_url, team_name, match_number, match_result):
         
     except Exception as e:
         print(f"  Error extracting maps: {e}")
+        scrape_metrics.count('parse_errors')
         return pd.DataFrame()
 
 
@@ -404,118 +712,79 @@ def extract_map_data(driver, match_url, team_name, match_number, match_result):
 
 
 
+def click_map_tab(driver, button):
+    """
+    Click a map tab until it is the active one, retrying with a short backoff
+    Raises PageNotReady if it never activates (parsing then would read the previous map)
+    """
+    def attempt():
+        button.click()
+        if not wait_for_active_map(driver, button):
+            raise PageNotReady("map tab never became active")
+    click_retry_policy.call(attempt, retry_on=TRANSIENT_ERRORS, on_retry=log_retry)
+
+def report_parsed_maps(parsed, page, team_name):
+    """
+    Log the maps parse_match_page read from a page snapshot and return them
+    VLR renders all map panels (.vm-stats-game) up front and only toggles which one is visible,
+    so no tab clicks or extra page reads are needed
+    Returns the list of map dicts, or None if a played map's panel is missing from the snapshot
+    """
+    print(f"  Maps actually played: {parsed['maps_played']}")
+    print(f"  Found {len(page['map_tabs'])} numbered map navigation items")
+    maps_data = parsed['maps']
+    
+    if maps_data is None:
+        print(f"    A played map's panel is not in the snapshot")
+        return None
+    
+    if len(page['map_tabs']) == 0:
+        single_map_data = maps_data[0]
+        print(f"  Single map match detected - extracted from snapshot")
+        print(f"    Single map: {single_map_data['map_name']} {single_map_data['map_result']} ({single_map_data['map_score']})")
+        return maps_data
+    
+    for row in maps_data:
+        print(f"  Map {row['map_number']}: {team_name} result on {row['map_name']}: {row['map_result']} "
+              f"({row['our_score']}-{row['their_score']})")
+    skipped = [map_number for map_number, _, _ in page['map_tabs'] if map_number > parsed['maps_played']]
+    if skipped:
+        print(f"  Skipped maps {skipped} (not played - series ended {parsed['maps_played']} maps)")
+    return maps_data
+
 def get_maps_actually_played(driver, match_url):
     """
     Determine how many maps were actually played based on the overall score
     """
-    try:
-        # Method 1: Target the specific .match-header-vs element
+    # Method 1/2: the .match-header-vs element, then the wider .match-header
+    # (format like "FNATIC[2110]final2:0vs.Bo3Karmine Corp[1765]")
+    for selector in ('.match-header-vs', '.match-header'):
         try:
-            vs_element = driver.find_element(By.CSS_SELECTOR, '.match-header-vs')
-            vs_text = vs_element.text
-            print(f"    Found .match-header-vs text: {vs_text}")
-            
-            # Extract score from format like "FNATIC[2110]final2:0vs.Bo3Karmine Corp[1765]"
-            score_match = re.search(r'final\s*(\d+)\s*:\s*(\d+)\s*vs', vs_text)
-            if score_match:
-                score1, score2 = int(score_match.group(1)), int(score_match.group(2))
-                total_maps = score1 + score2
-                if is_valid_match_score(score1, score2):
-                    print(f"    Found overall score: {score1}:{score2} (total maps: {total_maps})")
-                    return total_maps
+            score = series_score(driver.find_element(By.CSS_SELECTOR, selector).text)
+            if score:
+                print(f"    Found overall score in {selector}: {score[0]}:{score[1]} (total maps: {sum(score)})")
+                return sum(score)
         except Exception as e:
-            print(f"    Could not find .match-header-vs element: {e}")
-        
-        # Method 2: Look for score in .match-header element(I dont even think I used method 1 I think I just use this one)
-        try:
-            header_element = driver.find_element(By.CSS_SELECTOR, '.match-header')
-            header_text = header_element.text
-            
-            # Look for "final X:Y vs" pattern in header
-            score_match = re.search(r'final\s*(\d+)\s*:\s*(\d+)\s*vs', header_text)
-            if score_match:
-                score1, score2 = int(score_match.group(1)), int(score_match.group(2))
-                total_maps = score1 + score2
-                if is_valid_match_score(score1, score2):
-                    print(f"    Found overall score in header: {score1}:{score2} (total maps: {total_maps})")
-                    return total_maps
-        except Exception as e:
-            print(f"    Could not find .match-header element: {e}")
-        
-        # Method 3: Search page source for the pattern (before falling back to body text)
-        try:
-            page_source = driver.page_source
-            # Look for the "final X:Y vs" pattern identified
-            score_match = re.search(r'final\s*(\d+)\s*:\s*(\d+)\s*vs', page_source)
-            if score_match:
-                score1, score2 = int(score_match.group(1)), int(score_match.group(2))
-                total_maps = score1 + score2
-                if is_valid_match_score(score1, score2):
-                    print(f"    Found overall score in page source: {score1}:{score2} (total maps: {total_maps})")
-                    return total_maps
-        except Exception as e:
-            print(f"    Error searching page source: {e}")
-        
-        # Method 4: Fallback - look in body text but avoid comments section
-        try:
-            raw_body_text = driver.find_element(By.TAG_NAME, 'body').text
-            body_text = clean_page_text(raw_body_text)
-            
-            # Find where comments start and exclude that section (case insensitive)
-            comments_start = body_text.lower().find('comments')
-            if comments_start != -1:
-                pre_comments_text = body_text[:comments_start]
-            else:
-                pre_comments_text = body_text
-            
-            # Look for valid match scores in the non-comment section
-            score_patterns = re.findall(r'(\d)\s*:\s*(\d)(?!\d)(?!\s*[AP]M)', pre_comments_text)
-            for score_match in score_patterns:
-                score1, score2 = int(score_match[0]), int(score_match[1])
-                total_maps = score1 + score2
-                if is_valid_match_score(score1, score2):
-                    print(f"    Found overall score in body: {score1}:{score2} (total maps: {total_maps})")
-                    return total_maps
-        except Exception as e:
-            print(f"    Error searching body text: {e}")
-        
-        # Method 5: Last resort - check title
+            print(f"    Could not find {selector} element: {e}")
+    
+    # Method 3: page source, Method 4: body text outside comments, Method 5: title
+    sources = (
+        ('page source', lambda: series_score(driver.page_source)),
+        ('body', lambda: body_series_score(driver.find_element(By.TAG_NAME, 'body').text)),
+        ('title', lambda: title_series_score(driver.title)),
+    )
+    for name, find_score in sources:
         try:
-            title = driver.title
-            score_in_title = re.search(r'(\d+)\s*[:-]\s*(\d+)', title)
-            if score_in_title:
-                score1, score2 = int(score_in_title.group(1)), int(score_in_title.group(2))
-                total_maps = score1 + score2
-                if is_valid_match_score(score1, score2):
-                    print(f"    Found score in title: {score1}:{score2} (total maps: {total_maps})")
-                    return total_maps
+            score = find_score()
+            if score:
+                print(f"    Found overall score in {name}: {score[0]}:{score[1]} (total maps: {sum(score)})")
+                return sum(score)
         except Exception as e:
-            print(f"    Error checking title: {e}")
-        
-        # If we can't determine, assume all available maps were played
-        print(f"    Could not determine maps played, assuming all maps were played")
-        return 5  # Max possible in a BO5
-        
-    except Exception as e:
-        print(f"    Error determining maps played: {e}")
-        return 5  # Safe default
-
-def is_valid_match_score(score1, score2):
-    """
-    Check if a score looks like a valid Valorant match score
-    """
-    total_maps = score1 + score2
-    max_score = max(score1, score2)
+            print(f"    Error searching {name}: {e}")
     
-    # Valorant match constraints:
-    # - Total maps: 1-5 (BO1, BO3, BO5)
-    # - Max score for winner: 1-3 
-    # - Both scores should be reasonable (not round scores like 13:11)
-    return (
-        1 <= total_maps <= 5 and      # Valid total maps
-        1 <= max_score <= 3 and       # Valid max score for winner  
-        score1 <= 3 and score2 <= 3   # Both scores reasonable
-    )
+    # If we can't determine, assume all available maps were played
+    print(f"    Could not determine maps played, assuming all maps were played")
+    return 5  # Max possible in a BO5
 
 def extract_single_map_data(driver, match_url, team_name, match_number, match_result):
     """
@@ -524,138 +793,12 @@ def extract_single_map_data(driver, match_url, team_name, match_number, match_re
     """
     try:
         print(f"    Extracting single map data...")
-        
-        # Get and clean page text
         raw_page_text = driver.find_element(By.TAG_NAME, 'body').text
-        page_text = clean_page_text(raw_page_text)
-
-
-        # Find where forums end (look for "... X more matches") (for comment exclusion)
-        more_matches = re.search(r'\.\.\. \d+ more matches', page_text)
-        
-        match_start = 0
-        if more_matches:
-            match_start = more_matches.end()
-        
-        # Find where comments start
-        comments_start = page_text.find('COMMENTS:')
-        
-        # Extract only the match section
-        if comments_start != -1:
-            page_text = page_text[match_start:comments_start]
-        else:
-            page_text = page_text[match_start:]
-        
-        # Try to get the actual map scores for single map matches
-        result, our_score, their_score = get_map_result_from_page(driver, team_name)
-        
-        # Strategy 1: Look for "X remains" pattern (most reliable for single maps)
-        remains_match = re.search(r'(\w+)\s+remains', page_text, re.IGNORECASE)
-        if remains_match:
-            found_map = remains_match.group(1).capitalize()
-            print(f"    Found map from 'remains' pattern: {found_map}")
-            
-            # Validate it's a real Valorant map
-            map_names = ['ascent', 'bind', 'haven', 'icebox', 'lotus', 'sunset', 'split', 
-                         'breeze', 'fracture', 'pearl', 'dust2', 'abyss',
-                         'corrode'] #screw corrode
-            
-            if found_map.lower() in map_names:
-                return {
-                    'team_name': team_name,
-                    'match_number': match_number,
-                    'overall_match_result': match_result,
-                    'map_number': 1,
-                    'map_name': found_map,
-                    'map_result': result if result != 'Unknown' else match_result,
-                    'our_score': our_score,
-                    'their_score': their_score,
-                    'map_score': f"{our_score}-{their_score}" if our_score is not None else None,
-                    'match_url': match_url
-                }
-        
-        # Strategy 2: Look for pick/ban phase and find the final map
-        ban_phase_match = re.search(r'ban\s+\w+.*?(\w+)\s+remains', page_text, re.IGNORECASE | re.DOTALL)
-        if ban_phase_match:
-            found_map = ban_phase_match.group(1).capitalize()
-            print(f"    Found map from ban phase: {found_map}")
-            
-            map_names = ['ascent', 'bind', 'haven', 'icebox', 'lotus', 'sunset', 'split', 
-                         'breeze', 'fracture', 'pearl', 'dust2', 'abyss', 'corrode']
-
-            if found_map.lower() in map_names:
-                return {
-                    'team_name': team_name,
-                    'match_number': match_number,
-                    'overall_match_result': match_result,
-                    'map_number': 1,
-                    'map_name': found_map,
-                    'map_result': result if result != 'Unknown' else match_result,
-                    'our_score': our_score,
-                    'their_score': their_score,
-                    'map_score': f"{our_score}-{their_score}" if our_score is not None else None,
-                    'match_url': match_url
-                }
-        
-        # Strategy 3: Look for map in page title
-        title = driver.title.lower()
-        map_names = ['ascent', 'bind', 'haven', 'icebox', 'lotus', 'sunset', 'split', 
-                     'breeze', 'fracture', 'pearl', 'dust2','abyss', 'corrode']
-        
-        for map_name in map_names:
-            if map_name in title:
-                found_map = map_name.capitalize()
-                print(f"    Found map in title: {found_map}")
-                return {
-                    'team_name': team_name,
-                    'match_number': match_number,
-                    'overall_match_result': match_result,
-                    'map_number': 1,
-                    'map_name': found_map,
-                    'map_result': result if result != 'Unknown' else match_result,
-                    'our_score': our_score,
-                    'their_score': their_score,
-                    'map_score': f"{our_score}-{their_score}" if our_score is not None else None,
-                    'match_url': match_url
-                }
-        
-        # Strategy 4: Fallback - search page text but be more careful
-        for map_name in map_names:
-            # Look for map name with word boundaries
-            pattern = r'\b' + map_name + r'\b'
-            if re.search(pattern, page_text, re.IGNORECASE):
-                # Additional check: make sure it's not in a ban context
-                context_match = re.search(r'.{0,20}\b' + map_name + r'\b.{0,20}', page_text, re.IGNORECASE)
-                if context_match and 'ban' not in context_match.group().lower():
-                    found_map = map_name.capitalize()
-                    print(f"    Found map in page text (verified): {found_map}")
-                    return {
-                        'team_name': team_name,
-                        'match_number': match_number,
-                        'overall_match_result': match_result,
-                        'map_number': 1,
-                        'map_name': found_map,
-                        'map_result': result if result != 'Unknown' else match_result,
-                        'our_score': our_score,
-                        'their_score': their_score,
-                        'map_score': f"{our_score}-{their_score}" if our_score is not None else None,
-                        'match_url': match_url
-                    }
-        
-        # If all else fails
-        print(f"    Could not determine map name, using 'Unknown'")
-        return {
-            'team_name': team_name,
-            'match_number': match_number,
-            'overall_match_result': match_result,
-            'map_number': 1,
-            'map_name': 'Unknown',
-            'map_result': result if result != 'Unknown' else match_result,
-            'our_score': our_score,
-            'their_score': their_score,
-            'map_score': f"{our_score}-{their_score}" if our_score is not None else None,
-            'match_url': match_url
-        }
+        single_map_data = parse_single_map_data(raw_page_text, driver.title, match_url, team_name,
+                                                match_number, match_result)
+        if single_map_data['map_name'] == 'Unknown':
+            print(f"    Could not determine map name, using 'Unknown'")
+        return single_map_data
         
     except Exception as e:
         print(f"    Error extracting single map: {e}")
@@ -669,111 +812,11 @@ def get_map_result_from_page(driver, target_team_name):
     """
     try:
         print(f"    Looking for {target_team_name} result...")
-        
-        # Get and clean page text
         raw_page_text = driver.find_element(By.TAG_NAME, 'body').text
-        page_text = clean_page_text(raw_page_text)
-        
-        # EXCLUDE COMMENTS SECTION (just like in get_maps_actually_played)
-        comments_start = page_text.lower().find('comments')
-        if comments_start != -1:
-            page_text = page_text[:comments_start]
-        
-        lines = page_text.split('\n')
-        
-        # Valorant map names
-        map_names = ['ascent', 'bind', 'haven', 'icebox', 'lotus', 'sunset', 'split', 
-                     'breeze', 'fracture', 'pearl', 'dust2', 'abyss',
-                     'corrode']
-        
-        # Look for map names and analyze surrounding context
-        for i, line in enumerate(lines):
-            line_lower = line.lower().strip()
-            
-            # Check if this line contains a map name
-            for map_name in map_names:
-                if line_lower == map_name or (map_name in line_lower and len(line_lower) < 20):
-                    print(f"    Found map line: '{line}' at index {i}")
-                    
-                    # Look for the score pattern in surrounding lines
-                    # Pattern: Score, Team Name, A/D, Map, (PICK), Time, Team Name, A/D, Score
-                    
-                    # Check lines before the map (typically 1-3 lines)
-                    team1_score = None
-                    team1_name = None
-                    
-                    for j in range(max(0, i-4), i):
-                        prev_line = lines[j].strip()
-                        
-                        # Check if it's a score (single number 0-25 for overtime)
-                        if prev_line.isdigit() and 0 <= int(prev_line) <= 25:
-                            team1_score = int(prev_line)
-                            # Team name should be right after the score
-                            if j+1 < i and not lines[j+1].strip().isdigit():
-                                potential_team = lines[j+1].strip()
-                                # Validate it's a team name (not A/D pattern)
-                                if not re.match(r'^\d+\s*/\s*\d+$', potential_team):
-                                    team1_name = potential_team
-                            break
-                    
-                    # Check lines after the map
-                    team2_score = None
-                    team2_name = None
-                    
-                    # Skip "PICK" line if present
-                    start_idx = i + 1
-                    if i+1 < len(lines) and lines[i+1].strip().upper() == 'PICK':
-                        start_idx = i + 2
-                    
-                    # Skip time line (format: MM:SS or HH:MM:SS)
-                    if start_idx < len(lines) and re.match(r'^\d+:\d+(:\d+)?$', lines[start_idx].strip()):
-                        start_idx += 1
-                    
-                    # Now look for team2 info
-                    for j in range(start_idx, min(len(lines), start_idx + 4)):
-                        current_line = lines[j].strip()
-                        
-                        # First non-time line should be team name
-                        if team2_name is None and current_line and not current_line.isdigit():
-                            # Check if it's not A/D pattern
-                            if not re.match(r'^\d+\s*/\s*\d+$', current_line):
-                                team2_name = current_line
-                        
-                        # Look for score after team name
-                        elif team2_name and current_line.isdigit() and 0 <= int(current_line) <= 25:
-                            team2_score = int(current_line)
-                            break
-                    
-                    # If we found both scores and at least one team name
-                    if team1_score is not None and team2_score is not None:
-                        print(f"    Found scores - Team1: {team1_name} ({team1_score}) vs Team2: {team2_name} ({team2_score})")
-                        
-                        # Determine which score belongs to our target team
-                        if team1_name and target_team_name.lower() in team1_name.lower():
-                            our_score, their_score = team1_score, team2_score
-                        elif team2_name and target_team_name.lower() in team2_name.lower():
-                            our_score, their_score = team2_score, team1_score
-                        else:
-                            # If we can't match names exactly, look in broader context
-                            context_start = max(0, i-10)
-                            context_end = min(len(lines), i+10)
-                            context = ' '.join(lines[context_start:context_end])
-                            
-                            # Find which position our team appears more prominently
-                            team_mentions_before = context[:context.find(map_name)].lower().count(target_team_name.lower())
-                            team_mentions_after = context[context.find(map_name):].lower().count(target_team_name.lower())
-                            
-                            if team_mentions_before > team_mentions_after:
-                                our_score, their_score = team1_score, team2_score
-                            else:
-                                our_score, their_score = team2_score, team1_score
-                        
-                        result = 'W' if our_score > their_score else 'L'
-                        print(f"    {target_team_name} scored {our_score} vs opponent's {their_score}")
-                        return result, our_score, their_score
-        
-        print(f"    Could not determine result for {target_team_name}")
-        return 'Unknown', None, None
+        result, our_score, their_score = parse_map_result(raw_page_text, target_team_name)
+        if result == 'Unknown':
+            print(f"    Could not determine result for {target_team_name}")
+        return result, our_score, their_score
         
     except Exception as e:
         print(f"    Error getting map result: {e}")
@@ -913,48 +956,457 @@ def parse_match_score_structure(driver, target_team_name):
 
 
 
-def scrape_team_data(team_id, team_name, num_matches):
+def load_saved_matches(team_name, matches_dir, num_matches):
+    """
+    Read a team's previously scraped match list (used by --replay when the list page is not cached)
+    """
+    stem = f'{matches_dir}/{team_name.upper()}_matches'
+    if dataset_file(stem) is None:
+        return pd.DataFrame()
+    saved = read_dataset(stem, 'matches')
+    return saved.head(num_matches) if num_matches else saved
+
+def merge_with_saved(team_name, dirs, matches_df, players_df, maps_df):
+    """
+    Merge newly scraped matches into the team's saved data (incremental and backfill modes)
+    Newest first by date, then renumbered so match 1 is still the newest, as in a full scrape
+    """
+    saved = []
+    for directory, kind in zip(dirs, ('matches', 'players', 'maps')):
+        stem = f'{directory}/{team_name.upper()}_{kind}'
+        saved.append(read_dataset(stem, kind) if dataset_file(stem) is not None else pd.DataFrame())
+    
+    merged = []
+    new_urls = set(matches_df['match_url']) if not matches_df.empty else set()
+    for new_df, old_df in zip((matches_df, players_df, maps_df), saved):
+        if not old_df.empty:
+            old_df = old_df[~old_df['match_url'].isin(new_urls)]
+        merged.append(pd.concat([df for df in (new_df, old_df) if not df.empty], ignore_index=True)
+                      if not (new_df.empty and old_df.empty) else pd.DataFrame())
+    
+    matches_df, players_df, maps_df = merged
+    if not matches_df.empty:
+        # Backfilled matches are older than the saved ones; a stable sort keeps same-day order
+        merged[0] = matches_df = matches_df.sort_values('date', ascending=False, kind='stable',
+                                                        na_position='last', ignore_index=True)
+        numbers = dict(zip(matches_df['match_url'], range(1, len(matches_df) + 1)))
+        for df in merged:
+            if not df.empty:
+                df['match_number'] = df['match_url'].map(numbers).fillna(df['match_number']).astype(int)
+    
+    return matches_df, players_df, maps_df
+
+def save_team_data(team_name, dirs, matches_df, players_df, maps_df):
+    """
+    Write a team's matches/players/maps datasets (team-specific filenames) in `raw_formats`;
+    empty frames are skipped
+    """
+    print(f"\nResults for {team_name}:")
+    print(f"Matches: {len(matches_df)}")
+    print(f"Player records: {len(players_df)}")
+    print(f"Map records: {len(maps_df)}")
+
+    # Save data with team-specific filenames
+    for directory, kind, df in zip(dirs, ('matches', 'players', 'maps'), (matches_df, players_df, maps_df)):
+        if not df.empty:
+            paths = write_dataset(df, f'{directory}/{team_name.upper()}_{kind}', kind, raw_formats)
+            print(f"Saved {len(df)} {kind} rows to {', '.join(str(path) for path in paths)}")
+
+def fetch_match(match_url, team_name, match_number, match_result, pool=None, journal=None, match=None):
+    """
+    get_match_complete_data through the run-wide match registry, checkpointing the result as soon
+    as it is parsed (and appending it, with its `match` list row, to the partitioned store if on)
+    Matches that came back empty (load or parse errors) are not recorded, so --resume retries them
+    Once the team's circuit breaker is open the rest of its matches are skipped (and logged)
+    """
+    if team_breaker.is_open(team_name):
+        print(f"  Skipping {match_url}: {team_name} circuit breaker is open")
+        scrape_metrics.count('skipped_matches')
+        if redrive_log is not None:
+            redrive_log.record('skipped', match_url, team_name, match_number=match_number)
+        return pd.DataFrame(), pd.DataFrame()
+    
+    players_df, maps_df = match_registry.get(
+        match_url, team_name, match_number, match_result,
+        partial(get_match_complete_data, match_url, team_name, match_number, match_result, pool=pool)
+    )
+    if not (players_df.empty and maps_df.empty):
+        if journal is not None:
+            journal.record_match(match_url, players_df, maps_df)
+        if row_store is not None and match is not None:
+            row_store.write_match(team_name, match, players_df, maps_df)
+    return players_df, maps_df
+
+def scrape_team_data(team_id, team_name, num_matches, pool=None, executor=None, matches_df=None,
+                     known_urls=None, since_date=None, journal=None, until_date=None, max_pages=None):
+    """
+    Scrape a team's match list, then players + maps for every match
+    Match pages are spread over `executor` when given, otherwise fetched one by one
+    Pass `matches_df` to skip the match list page (replay mode), or `known_urls`/`since_date`
+    to only fetch matches newer than what is already saved (incremental mode)
+    With `until_date` the whole history back to that date is walked instead (backfill mode):
+    each match is queued as soon as its list page is read, and `known_urls` are skipped
+    With a `journal`, the match list and every finished match are checkpointed, and whatever
+    the journal already holds from an interrupted run is reused instead of fetched again
+    """
     print(f"\nScraping {team_name}...")
     
     # Get matches
-    matches_df = get_team_matches(team_id, team_name, num_matches)
+    history = None
+    if journal is not None and journal.matches_df is not None:
+        matches_df = journal.matches_df
+        print(f"Resuming from checkpoint: {len(journal.completed)}/{len(matches_df)} matches already done")
+    elif matches_df is None and until_date is not None:
+        history = iter_match_history(team_id, team_name, until_date, max_pages, pool=pool, skip_urls=known_urls)
+    elif matches_df is None:
+        matches_df = retry_policy.call(get_team_matches, team_id, team_name, num_matches, pool=pool,
+                                       known_urls=known_urls, since_date=since_date,
+                                       retry_on=TRANSIENT_ERRORS, on_retry=log_retry)
+        if journal is not None:
+            journal.record_matches(matches_df)
     
-    if matches_df.empty:
+    if history is None and matches_df.empty:
         print(f"No matches found for {team_name}")
         return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
     
     # Get complete data for each match (players + maps)
-    all_players = []
-    all_maps = []
-    
-    for _, match in matches_df.iterrows():
+    # Pacing between page loads is handled by the shared rate limiter
+    jobs = []
+    discovered = []
+    for match in history if history is not None else (match for _, match in matches_df.iterrows()):
+        discovered.append(match)
         if match['match_url']:
+            if journal is not None and match['match_url'] in journal.completed:
+                jobs.append(journal.completed[match['match_url']])
+                continue
             print(f"Match {match['match_number']}: {match['result']} vs {match['opponent']} ({match['score']})")
-            
-            players_df, maps_df = get_match_complete_data(
-                match['match_url'], 
-                team_name, 
-                match['match_number'], 
-                match['result']
-            )
-            
-            if not players_df.empty:
-                all_players.append(players_df)
-            
-            if not maps_df.empty:
-                all_maps.append(maps_df)
-            
-            # Respectful delay
-            time.sleep(random.randint(1, 3))
+            args = (match['match_url'], team_name, match['match_number'], match['result'])
+            if executor is not None:
+                jobs.append(executor.submit(fetch_match, *args, pool=pool, journal=journal, match=dict(match)))
+            else:
+                jobs.append(fetch_match(*args, pool=pool, journal=journal, match=dict(match)))
+    
+    if history is not None:
+        matches_df = pd.DataFrame(discovered)
+        print(f"{len(matches_df)} new matches in {team_name}'s history back to {until_date}")
+        if journal is not None and not matches_df.empty:
+            journal.record_matches(matches_df)
+    
+    # Collect in match order so output matches the sequential run
+    results = [job.result() if hasattr(job, 'result') else job for job in jobs]
+    all_players = [players_df for players_df, _ in results if not players_df.empty]
+    all_maps = [maps_df for _, maps_df in results if not maps_df.empty]
     
     players_df = pd.concat(all_players, ignore_index=True) if all_players else pd.DataFrame()
     maps_df = pd.concat(all_maps, ignore_index=True) if all_maps else pd.DataFrame()
     
     return matches_df, players_df, maps_df
 
-if __name__ == "__main__":
+
+class ScrapeProgress:
+    """
+    Thread-safe per-worker progress and the end-of-run success/failure summary
+    """
+
+    def __init__(self, total_teams):
+        self.total_teams = total_teams
+        self.results = []
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def record(self, result):
+        with self._lock:
+            self.results.append(result)
+            done = len(self.results)
+            matches = sum(r['matches'] for r in self.results)
+        status = 'OK' if result['ok'] else f"FAILED ({result['error']})"
+        print(f"[{result['worker']}] {result['team_name']}: {status} - "
+              f"{result['matches']} matches, {result['players']} players, {result['maps']} maps "
+              f"in {result['seconds']:.0f}s | {done}/{self.total_teams} teams, {matches} matches total")
+        print(f"  [metrics] {scrape_metrics.live_line()}")
+
+    def print_summary(self):
+        succeeded = [r for r in self.results if r['ok']]
+        failed = [r for r in self.results if not r['ok']]
+        elapsed = time.time() - self.started
+
+        print(f"\n{'='*60}")
+        print("SCRAPING COMPLETE!")
+        print(f"{'='*60}")
+        print(f"Successfully scraped: {len(succeeded)}/{self.total_teams} teams in {elapsed / 60:.1f} min")
+        print(f"Failed: {len(failed)} teams")
+
+        by_worker = {}
+        for r in self.results:
+            by_worker.setdefault(r['worker'], []).append(r)
+        print("\nPer worker:")
+        for worker, rows in sorted(by_worker.items()):
+            print(f"  {worker}: {len(rows)} teams, {sum(r['matches'] for r in rows)} matches, "
+                  f"{sum(r['seconds'] for r in rows):.0f}s busy")
+
+        if failed:
+            print("\nFailed teams:")
+            for r in failed:
+                print(f"  - {r['team_name']}: {r['error']}")
+
+
+def scrape_and_save_team(team_name, team_id, num_matches, dirs, pool=None, executor=None, replay=False,
+                         manifest=None, incremental=False, checkpoint=None, backfill_until=None, max_pages=None):
+    """
+    Scrape one team and write its matches/players/maps datasets
+    In incremental mode only matches newer than the manifest watermark are fetched and
+    merged into the saved data; with `backfill_until` the team's history is walked back to that
+    date instead and every match not yet saved is merged in
+    With a `checkpoint`, progress is journaled per match and a team the journal marks done is skipped
+    Returns a result dict for ScrapeProgress instead of raising
+    """
+    matches_dir, players_dir, maps_dir = dirs
+    start = time.time()
+    result = {
+        'team_name': team_name,
+        'worker': threading.current_thread().name,
+        'ok': False,
+        'error': None,
+        'matches': 0,
+        'players': 0,
+        'maps': 0,
+    }
+    
+    try:
+        journal = checkpoint.team(team_name) if checkpoint is not None else None
+        if journal is not None and journal.done:
+            print(f"\n{team_name} already completed in the interrupted run - skipping")
+            result['ok'] = True
+            result['seconds'] = time.time() - start
+            return result
+        
+        # Replay parses the cached match-list page when there is one, else the saved list
+        saved_matches = None
+        if replay and team_matches_url(team_id, team_name) not in page_cache:
+            saved_matches = load_saved_matches(team_name, matches_dir, num_matches)
+        
+        known_urls, since_date = None, None
+        incremental = incremental or backfill_until is not None
+        if incremental and manifest is not None:
+            if manifest.has_team(team_name):
+                known_urls = manifest.known_urls(team_name)
+                since_date = manifest.latest_date(team_name)
+            else:
+                # Teams scraped before the manifest existed: seed from the saved match list
+                known = load_saved_matches(team_name, matches_dir, None)
+                known_urls = set(known['match_url']) if not known.empty else set()
+            print(f"Incremental: {len(known_urls)} known matches, watermark {since_date}")
+        
+        matches_df, players_df, maps_df = scrape_team_data(
+            team_id, team_name, num_matches, pool=pool, executor=executor, matches_df=saved_matches,
+            known_urls=known_urls, since_date=since_date, journal=journal,
+            until_date=backfill_until, max_pages=max_pages
+        )
+        new_matches = len(matches_df)
+        # Matches that were abandoned or skipped after retries; the team stays unfinished in
+        # its journal so --resume re-drives exactly these
+        unfinished = [] if journal is None else [
+            url for url in matches_df.get('match_url', pd.Series(dtype=object)) if url not in journal.completed
+        ]
+        
+        if incremental:
+            if matches_df.empty:
+                print(f"{team_name} is up to date")
+            else:
+                matches_df, players_df, maps_df = merge_with_saved(team_name, dirs, matches_df, players_df, maps_df)
+        
+        save_team_data(team_name, dirs, matches_df, players_df, maps_df)
+        
+        if row_store is not None:
+            row_store.finalize(team_name)
+        
+        if manifest is not None and not matches_df.empty:
+            manifest.update(team_name, matches_df)
+        
+        if journal is not None:
+            if unfinished:
+                print(f"{team_name}: {len(unfinished)} matches failed - rerun with --resume to re-drive them")
+            else:
+                journal.mark_done()
+        
+        result.update(ok=True, matches=new_matches, players=len(players_df), maps=len(maps_df),
+                      unfinished=len(unfinished))
+        
+    except Exception as e:
+        print(f"FAILED to scrape {team_name}: {str(e)}")
+        result['error'] = str(e)
+    
+    result['seconds'] = time.time() - start
+    return result
+
+def main():
+    global rate_limiter, page_cache, http_fetcher, retry_policy, team_breaker, redrive_log, row_store
+    global raw_formats
+    
+    parser = argparse.ArgumentParser(
+        description="Scrape VLR.gg match, player and map data for the VCT teams"
+    )
+    parser.add_argument(
+        "--num-matches",
+        type=int,
+        default=50,
+        help="Number of matches per team"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of teams (and match pages) scraped concurrently"
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=0.5,
+        help="Max page loads per second to vlr.gg, shared by all workers"
+    )
+    parser.add_argument(
+        "--burst",
+        type=int,
+        default=1,
+        help="Page loads allowed back-to-back before --rate applies"
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=None,
+        help="Number of long-lived Chrome drivers to keep open (default: --workers)"
+    )
+    parser.add_argument(
+        "--recycle-after",
+        type=int,
+        default=100,
+        help="Restart a driver after this many page loads (0 = never)"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=DEFAULT_CACHE_DIR,
+        help="Directory of the compressed raw-page cache"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not save rendered pages to the cache"
+    )
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help="Re-run the parsers over the page cache and saved match lists, with no browser"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only fetch matches newer than each team's saved watermark and merge them into the saved data"
+    )
+    parser.add_argument(
+        "--backfill-until",
+        type=str,
+        default=None,
+        help="Walk each team's paginated match history back to this date (YYYY/MM/DD) and merge "
+             "every match not yet saved into the team datasets (ignores --num-matches)"
+    )
+    parser.add_argument(
+        "--max-pages",
+        type=int,
+        default=None,
+        help="With --backfill-until: read at most this many match-list pages per team"
+    )
+    parser.add_argument(
+        "--browser-only",
+        action="store_true",
+        help="Load every page in Chrome instead of trying a plain HTTP fetch first"
+    )
+    parser.add_argument(
+        "--http-concurrency",
+        type=int,
+        default=None,
+        help="Max plain-HTTP requests in flight (default: --workers)"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from its checkpoints, skipping finished matches and teams"
+    )
+    parser.add_argument(
+        "--checkpoint-dir",
+        type=str,
+        default=DEFAULT_CHECKPOINT_DIR,
+        help="Directory of the per-team scrape journals used by --resume"
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=3,
+        help="Attempts per page load before a match is abandoned (with jittered exponential backoff)"
+    )
+    parser.add_argument(
+        "--breaker-threshold",
+        type=int,
+        default=5,
+        help="Abandoned matches in a row after which the rest of a team's matches are skipped"
+    )
+    parser.add_argument(
+        "--breaker-cooldown",
+        type=float,
+        default=600,
+        help="Seconds a tripped team circuit breaker stays open"
+    )
+    parser.add_argument(
+        "--redrive-log",
+        type=str,
+        default=DEFAULT_REDRIVE_LOG,
+        help="JSONL log of retried, abandoned and skipped match pages (and, with --replay, uncached ones)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMAT_CHOICES,
+        default="parquet",
+        help="File format of the per-team matches/players/maps datasets"
+    )
+    parser.add_argument(
+        "--partitioned",
+        action="store_true",
+        help="Also stream every match's rows into team/month partitions as they are scraped"
+    )
+    parser.add_argument(
+        "--partitions-dir",
+        type=str,
+        default=DEFAULT_PARTITIONS_DIR,
+        help="Root of the partitioned dataset written by --partitioned"
+    )
+    parser.add_argument(
+        "--metrics-dir",
+        type=str,
+        default=DEFAULT_METRICS_DIR,
+        help="Directory for the per-run JSON/CSV stage timing and counter report"
+    )
+    parser.add_argument(
+        "--wait-log",
+        type=str,
+        default=None,
+        help="Optional CSV path for every page/map wait duration"
+    )
+    args = parser.parse_args()
+
     # Configuration
-    num_matches = 50  # Number of matches per team
+    num_matches = args.num_matches  # Number of matches per team
+    # VLR list dates are YYYY/MM/DD and compared as strings
+    backfill_until = args.backfill_until.replace('-', '/') if args.backfill_until else None
+    workers = max(args.workers, 1)
+    rate_limiter = HostRateLimiter(rate=args.rate, burst=args.burst)
+    raw_formats = parse_formats(args.format)
+    if not args.no_cache or args.replay:
+        page_cache = PageCache(args.cache_dir)
+    if not (args.replay or args.browser_only):
+        http_fetcher = HttpFetcher(max_concurrency=args.http_concurrency or workers)
+    retry_policy = RetryPolicy(attempts=args.retries)
+    team_breaker = CircuitBreaker(threshold=args.breaker_threshold, cooldown=args.breaker_cooldown)
+    redrive_log = RedriveLog(args.redrive_log)
 
     # Create directory structure once
     matches_dir = '../data/raw/vlr_data/matches'
@@ -964,67 +1416,102 @@ if __name__ == "__main__":
     os.makedirs(matches_dir, exist_ok=True)
     os.makedirs(players_dir, exist_ok=True)
     os.makedirs(maps_dir, exist_ok=True)
+    dirs = (matches_dir, players_dir, maps_dir)
     
-    print(f"Starting scraping for {len(vct_teams)} teams...")
-    successful_teams = 0
-    failed_teams = []
+    if args.partitioned:
+        # Parts a crashed run left in progress are published before this run appends more
+        recovered = recover_partitions(args.partitions_dir, raw_formats)
+        if recovered:
+            print(f"Recovered {recovered} in-progress parts in {args.partitions_dir}")
+        row_store = PartitionedStore(args.partitions_dir, formats=raw_formats)
     
-    # Loop through all teams, yes I copy pasted from claude idgaf
-    for team_name, team_id in vct_teams.items():
-        try:
-            print(f"\n{'='*60}")
-            print(f"SCRAPING TEAM {successful_teams + 1}/{len(vct_teams)}: {team_name}")
-            print(f"{'='*60}")
-            
-            matches_df, players_df, maps_df = scrape_team_data(team_id, team_name, num_matches)
-            
-            print(f"\nResults for {team_name}:")
-            print(f"Matches: {len(matches_df)}")
-            print(f"Player records: {len(players_df)}")
-            print(f"Map records: {len(maps_df)}")
-            
-            # Save data with team-specific filenames
-            if not matches_df.empty:
-                matches_file = f'{matches_dir}/{team_name.upper()}_matches.csv'
-                matches_df.to_csv(matches_file, index=False)
-                print(f"Saved {len(matches_df)} matches to {matches_file}")
-            
-            if not players_df.empty:
-                players_file = f'{players_dir}/{team_name.upper()}_players.csv'
-                players_df.to_csv(players_file, index=False)
-                print(f"Saved {len(players_df)} player records to {players_file}")
-            
-            if not maps_df.empty:
-                maps_file = f'{maps_dir}/{team_name.upper()}_maps.csv'
-                maps_df.to_csv(maps_file, index=False)
-                print(f"Saved {len(maps_df)} map records to {maps_file}")
-
-            successful_teams += 1
-            
-            # Brief delay between teams
-            if team_name != list(vct_teams.keys())[-1]:  # Don't delay after last team
-                delay = random.randint(2, 4)  # 2-4 seconds between teams
-                print(f"⏳ Waiting {delay} seconds before next team...")
-                time.sleep(delay)
-                
-        except Exception as e:
-            print(f"FAILED to scrape {team_name}: {str(e)}")
-            failed_teams.append((team_name, str(e)))
-            continue
+    # Per-team ingested match_urls + newest date, kept up to date on every run
+    manifest = IngestManifest('../data/raw/vlr_data/ingest_manifest.json')
     
-    # Final summary
-    print(f"\n{'='*60}")
-    print("SCRAPING COMPLETE!")
-    print(f"{'='*60}")
-    print(f"Successfully scraped: {successful_teams}/{len(vct_teams)} teams")
-    print(f"Failed: {len(failed_teams)} teams")
+    # Live runs journal every match; a fresh run drops the previous run's journals
+    # (replay is cheap to re-run, so it is never checkpointed)
+    checkpoint = None
+    if not args.replay:
+        checkpoint = ScrapeCheckpoint(args.checkpoint_dir)
+        if args.resume:
+            print(f"Resuming from checkpoints in {args.checkpoint_dir}")
+        else:
+            checkpoint.reset()
     
-    if failed_teams:
-        print("\nFailed teams:")
-        for team, error in failed_teams:
-            print(f"  - {team}: {error}")
+    progress = ScrapeProgress(len(vct_teams))
+    if args.replay:
+        print(f"Replaying parsers over {args.cache_dir} for {len(vct_teams)} teams with {workers} worker(s)...")
+        pool = ReplayPool(page_cache)
+    else:
+        print(f"Starting scraping for {len(vct_teams)} teams with {workers} worker(s) at {args.rate} pages/sec...")
+        if backfill_until:
+            print(f"Backfilling each team's match history back to {backfill_until}")
+        pool = DriverPool(setup_driver, size=args.pool_size or workers, max_pages=args.recycle_after)
     
-    print(f"\nAll CSV files saved to:")
+    try:
+        if workers == 1:
+            threading.current_thread().name = 'worker-1'
+            for team_name, team_id in vct_teams.items():
+                progress.record(scrape_and_save_team(
+                    team_name, team_id, num_matches, dirs, pool=pool, replay=args.replay,
+                    manifest=manifest, incremental=args.incremental, checkpoint=checkpoint,
+                    backfill_until=backfill_until, max_pages=args.max_pages
+                ))
+        else:
+            # Teams are spread over one pool of threads and their match pages over another,
+            # so a team thread waiting on its matches never starves the match workers
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='matches') as match_executor, \
+                 ThreadPoolExecutor(max_workers=workers, thread_name_prefix='worker') as team_executor:
+                futures = [
+                    team_executor.submit(scrape_and_save_team, team_name, team_id, num_matches, dirs,
+                                         pool=pool, executor=match_executor, replay=args.replay,
+                                         manifest=manifest, incremental=args.incremental,
+                                         checkpoint=checkpoint, backfill_until=backfill_until,
+                                         max_pages=args.max_pages)
+                    for team_name, team_id in vct_teams.items()
+                ]
+                for future in as_completed(futures):
+                    progress.record(future.result())
+    finally:
+        pool.shutdown()
+        if http_fetcher is not None:
+            http_fetcher.close()
+        if row_store is not None:
+            row_store.close()
+    
+    progress.print_summary()
+    match_registry.print_summary()
+    if http_fetcher is not None:
+        http_fetcher.print_summary()
+    wait_stats.print_summary()
+    scrape_metrics.print_summary()
+    if team_breaker.trips or host_breaker.trips:
+        print(f"Circuit breakers: {team_breaker.trips} team trips, {host_breaker.trips} host pauses")
+    if redrive_log is not None and os.path.exists(redrive_log.path):
+        print(f"Retried/abandoned/missing pages logged to {redrive_log.path}")
+    report = scrape_metrics.write_report(args.metrics_dir, extra={
+        'args': vars(args),
+        'page_waits': wait_stats.summary(),
+        'teams': progress.results,
+        'match_pages': {'fetched': match_registry.fetched, 'shared': match_registry.shared},
+        'http': None if http_fetcher is None else {
+            'fetched': http_fetcher.fetched, 'failed': http_fetcher.failed,
+            'fallbacks': http_fetcher.fallbacks, 'bytes': http_fetcher.bytes,
+        },
+        'breakers': {'team_trips': team_breaker.trips, 'host_trips': host_breaker.trips},
+    })
+    print(f"Metrics report saved to {report}")
+    if args.wait_log:
+        wait_stats.to_csv(args.wait_log)
+        print(f"Wait timings saved to {args.wait_log}")
+    
+    print(f"\nAll team datasets saved to:")
     print(f"  - Matches: {matches_dir}")
     print(f"  - Players: {players_dir}")
-    print(f"  - Maps: {maps_dir}")
\ No newline at end of file
+    print(f"  - Maps: {maps_dir}")
+    if row_store is not None:
+        print(f"  - Partitions: {args.partitions_dir} ({row_store.rows_written} rows, "
+              f"{row_store.parts_finalized} parts)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+# QUEUE-DRIVEN SCRAPE WORKERS
+# (seed a SQLite work queue with team jobs, then run any number of worker processes - on one
+#  machine or several sharing the file - that pull team-list, match-detail and save jobs)
+#
+#   python scrape_worker.py seed [--teams-file teams.csv] [--backfill-until 2023/01/01]
+#   python scrape_worker.py work            (start as many as you like)
+#   python scrape_worker.py status [--retry-failed]
+
+import argparse
+import csv
+import json
+import os
+import time
+
+import pandas as pd
+
+import scrape_vlr
+from dataset_store import FORMAT_CHOICES, parse_formats
+from driver_pool import DriverPool
+from http_fetch import HttpFetcher
+from page_cache import PageCache
+from rate_limit import HostRateLimiter
+from work_queue import WorkQueue, default_worker_id
+
+DEFAULT_QUEUE = '../data/raw/vlr_data/work_queue.sqlite'
+
+# Higher runs first: finish what is in flight (saves, then match pages) before opening new teams
+PRIORITY = {'save': 2, 'match': 1, 'team': 0}
+
+
+def frame_records(df):
+    # to_json handles numpy scalars and NaN, unlike json.dumps
+    return json.loads(df.to_json(orient='records')) if not df.empty else []
+
+
+def load_teams(teams_file=None):
+    """{team_name: team_id} from a team_name,team_id CSV, or the scraper's VCT list"""
+    if teams_file is None:
+        return dict(scrape_vlr.vct_teams)
+    with open(teams_file, newline='', encoding='utf-8') as f:
+        return {row['team_name'].strip(): int(row['team_id']) for row in csv.DictReader(f)}
+
+
+def seed(queue, teams, num_matches, backfill_until=None, max_pages=None):
+    """Queue one team-list job per team; teams already queued in this run are left alone"""
+    added = 0
+    for team_name, team_id in teams.items():
+        payload = dict(team_name=team_name, team_id=team_id, num_matches=num_matches,
+                       until_date=backfill_until, max_pages=max_pages)
+        added += queue.enqueue('team', team_name, payload, group=team_name, priority=PRIORITY['team'])
+    print(f"Queued {added} new team jobs ({len(teams) - added} already queued)")
+
+
+def run_team_job(queue, job, dirs, pool):
+    """
+    Read the team's match list and queue a match-detail job per match
+    In backfill mode each match is queued as soon as its list page is read, so other workers
+    start on it while the walk continues
+    """
+    payload = job.payload
+    team_name = payload['team_name']
+
+    def queue_match(match):
+        match = {k: None if pd.isna(v) else v for k, v in dict(match).items()}
+        queue.enqueue('match', f"{team_name}|{match['match_url']}", match, group=team_name,
+                      priority=PRIORITY['match'])
+        return match
+
+    if payload['until_date']:
+        matches = [queue_match(match) for match in scrape_vlr.iter_match_history(
+            payload['team_id'], team_name, payload['until_date'], payload['max_pages'], pool=pool)]
+    else:
+        matches_df = scrape_vlr.retry_policy.call(
+            scrape_vlr.get_team_matches, payload['team_id'], team_name, payload['num_matches'], pool=pool,
+            retry_on=scrape_vlr.TRANSIENT_ERRORS, on_retry=scrape_vlr.log_retry)
+        matches = [queue_match(match) for _, match in matches_df.iterrows()]
+    print(f"{team_name}: queued {len(matches)} match jobs")
+    return {'matches': matches}
+
+
+def run_match_job(queue, job, dirs, pool):
+    """Players + maps for one match; an empty result fails the job so it is retried later"""
+    match = job.payload
+    players_df, maps_df = scrape_vlr.fetch_match(match['match_url'], job.group, match['match_number'],
+                                                 match['result'], pool=pool)
+    if players_df.empty and maps_df.empty:
+        raise RuntimeError(f"no data parsed from {match['match_url']}")
+    return {'players': frame_records(players_df), 'maps': frame_records(maps_df)}
+
+
+def run_save_job(queue, job, dirs, pool):
+    """Assemble the team's finished match jobs into its datasets (merged into saved ones when backfilling)"""
+    team_name = job.group
+    team = queue.results(team_name, 'team')[team_name]
+    details = queue.results(team_name, 'match')
+    players, maps = [], []
+    for match in team['matches']:
+        result = details.get(f"{team_name}|{match['match_url']}")
+        if result is not None:
+            players += result['players']
+            maps += result['maps']
+
+    matches_df, players_df, maps_df = pd.DataFrame(team['matches']), pd.DataFrame(players), pd.DataFrame(maps)
+    if job.payload['merge'] and not matches_df.empty:
+        matches_df, players_df, maps_df = scrape_vlr.merge_with_saved(team_name, dirs, matches_df, players_df, maps_df)
+    scrape_vlr.save_team_data(team_name, dirs, matches_df, players_df, maps_df)
+    return {'matches': len(matches_df), 'missing': len(team['matches']) - len(details)}
+
+
+HANDLERS = {'team': run_team_job, 'match': run_match_job, 'save': run_save_job}
+
+
+def queue_save_when_ready(queue, team_name):
+    """Queue the team's save job once its match list is in and no match job is still open"""
+    team = queue.results(team_name, 'team').get(team_name)
+    if team is None or queue.unfinished(team_name, 'match'):
+        return
+    if queue.enqueue('save', team_name, {'merge': bool(team.get('merge'))}, group=team_name,
+                     priority=PRIORITY['save']):
+        print(f"{team_name}: all match jobs finished, queued save")
+
+
+def work(queue, worker_id, dirs, pool, poll=5.0, forever=False):
+    """Lease and run jobs until the queue is drained (or forever); returns {kind: jobs done}"""
+    done = {}
+    while True:
+        job = queue.lease(worker_id)
+        if job is None:
+            if queue.idle() and not forever:
+                return done
+            time.sleep(poll)
+            continue
+
+        print(f"[{worker_id}] {job.kind} job {job.key} (attempt {job.attempts})")
+        try:
+            with queue.keep_alive(job):
+                result = HANDLERS[job.kind](queue, job, dirs, pool)
+        except Exception as e:
+            state = queue.fail(job, e)
+            print(f"[{worker_id}] {job.kind} job {job.key} failed: {e} -> {state or 'lease lost'}")
+            if state == 'failed' and job.kind == 'match':
+                queue_save_when_ready(queue, job.group)
+            continue
+
+        if job.kind == 'team':
+            result['merge'] = bool(job.payload['until_date'])
+        if not queue.complete(job, result):
+            print(f"[{worker_id}] lease on {job.kind} job {job.key} expired; another worker owns it now")
+            continue
+        done[job.kind] = done.get(job.kind, 0) + 1
+        if job.kind in ('team', 'match'):
+            queue_save_when_ready(queue, job.group)
+
+
+def print_status(queue):
+    counts = queue.counts()
+    if not counts:
+        print("Queue is empty")
+        return
+    for kind in ('team', 'match', 'save'):
+        if kind in counts:
+            states = ', '.join(f"{n} {state}" for state, n in sorted(counts[kind].items()))
+            print(f"  {kind:<6} {states}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed, run and inspect the queue-driven VLR scrape")
+    parser.add_argument("--queue", type=str, default=DEFAULT_QUEUE, help="SQLite work queue file")
+    parser.add_argument("--visibility-timeout", type=float, default=300,
+                        help="Seconds a leased job stays hidden from other workers without a heartbeat")
+    parser.add_argument("--max-attempts", type=int, default=5, help="Leases per job before it is marked failed")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser("seed", help="Queue a team-list job per team")
+    seed_parser.add_argument("--teams-file", type=str, default=None,
+                             help="CSV with team_name,team_id columns (default: the VCT teams in scrape_vlr.py)")
+    seed_parser.add_argument("--num-matches", type=int, default=50, help="Number of matches per team")
+    seed_parser.add_argument("--backfill-until", type=str, default=None,
+                             help="Walk each team's history back to this date (YYYY/MM/DD) and merge into saved data")
+    seed_parser.add_argument("--max-pages", type=int, default=None, help="With --backfill-until: list pages per team")
+    seed_parser.add_argument("--reset", action="store_true", help="Drop every job of the previous run first")
+
+    work_parser = commands.add_parser("work", help="Pull and run jobs until the queue is drained")
+    work_parser.add_argument("--worker-id", type=str, default=None, help="Name in leases (default: host:pid)")
+    work_parser.add_argument("--rate", type=float, default=0.5,
+                             help="Max page loads per second to vlr.gg for this worker process")
+    work_parser.add_argument("--pool-size", type=int, default=1, help="Chrome drivers this worker keeps open")
+    work_parser.add_argument("--format", choices=FORMAT_CHOICES, default="parquet",
+                             help="File format of the per-team datasets written by save jobs")
+    work_parser.add_argument("--browser-only", action="store_true", help="Load every page in Chrome")
+    work_parser.add_argument("--no-cache", action="store_true", help="Do not save rendered pages to the cache")
+    work_parser.add_argument("--cache-dir", type=str, default=scrape_vlr.DEFAULT_CACHE_DIR,
+                             help="Directory of the compressed raw-page cache")
+    work_parser.add_argument("--poll", type=float, default=5.0, help="Seconds between polls of an empty queue")
+    work_parser.add_argument("--forever", action="store_true", help="Keep polling after the queue is drained")
+
+    status_parser = commands.add_parser("status", help="Job counts by kind and state")
+    status_parser.add_argument("--retry-failed", action="store_true", help="Re-queue every failed job")
+    args = parser.parse_args()
+
+    queue = WorkQueue(args.queue, visibility_timeout=args.visibility_timeout, max_attempts=args.max_attempts)
+
+    if args.command == "seed":
+        if args.reset:
+            queue.reset()
+        backfill_until = args.backfill_until.replace('-', '/') if args.backfill_until else None
+        seed(queue, load_teams(args.teams_file), args.num_matches, backfill_until, args.max_pages)
+        print_status(queue)
+        return
+
+    if args.command == "status":
+        if args.retry_failed:
+            print(f"Re-queued {queue.retry_failed()} failed jobs")
+        print_status(queue)
+        return
+
+    # Same setup as scrape_vlr.main(), per worker process
+    worker_id = args.worker_id or default_worker_id()
+    scrape_vlr.rate_limiter = HostRateLimiter(rate=args.rate, burst=1)
+    scrape_vlr.raw_formats = parse_formats(args.format)
+    if not args.no_cache:
+        scrape_vlr.page_cache = PageCache(args.cache_dir)
+    if not args.browser_only:
+        scrape_vlr.http_fetcher = HttpFetcher(max_concurrency=1)
+    dirs = ('../data/raw/vlr_data/matches', '../data/raw/vlr_data/players', '../data/raw/vlr_data/maps')
+    for directory in dirs:
+        os.makedirs(directory, exist_ok=True)
+
+    print(f"Worker {worker_id} pulling from {args.queue}")
+    pool = DriverPool(scrape_vlr.setup_driver, size=args.pool_size)
+    try:
+        done = work(queue, worker_id, dirs, pool, poll=args.poll, forever=args.forever)
+    finally:
+        pool.shutdown()
+        if scrape_vlr.http_fetcher is not None:
+            scrape_vlr.http_fetcher.close()
+
+    print(f"Worker {worker_id} finished: " + ', '.join(f"{n} {kind} jobs" for kind, n in sorted(done.items())))
+    print_status(queue)
+
+
+if __name__ == "__main__":
+    main()
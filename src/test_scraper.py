@@ -1,7 +1,8 @@
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
-import time
+
+from page_waits import wait_for_page, wait_stats
 
 def setup_driver():
     options = Options()
@@ -23,7 +24,8 @@ def scrape_page_text(url):
     try:
         print(f"Scraping: {url}")
         driver.get(url)
-        time.sleep(3)
+        wait_for_page(driver)
+        print(f"Page ready in {wait_stats.samples[-1][1]:.2f}s")
         
         # Get all page text
         page_text = driver.find_element(By.TAG_NAME, 'body').text
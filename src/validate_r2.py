@@ -0,0 +1,295 @@
+### DATA-QUALITY VALIDATION OF THE R2 MATCH TABLES ###
+# (declarative, vectorized checks over R2_match_table / R2_match_players, run per match-month
+#  partition; a partition whose content hash is unchanged since it last passed is not re-checked,
+#  and every run writes a machine-readable report)
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import Counter, namedtuple
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from dataset_store import read_dataset, to_arrow
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+REPORT_NAME = "validation_report.json"
+MANIFEST_NAME = "validation_manifest.json"
+
+# A full Valorant match: five players a side
+PLAYERS_PER_MATCH = 10
+
+# Each check maps the two tables to one row per issue (match_url, detail); a partition passes
+# when none of its issues comes from an "error" check
+Check = namedtuple('Check', 'name severity description run')
+
+
+def _issues(match_urls, details) -> pd.DataFrame:
+    return pd.DataFrame({"match_url": np.asarray(match_urls, dtype=object), "detail": np.asarray(details, dtype=object)})
+
+
+def duplicate_matches(match_table: pd.DataFrame, match_players: pd.DataFrame) -> pd.DataFrame:
+    counts = match_table.groupby("match_url", observed=True).size()
+    counts = counts[counts > 1]
+    return _issues(counts.index, "stored " + counts.astype(str) + " times")
+
+
+def duplicate_players(match_table: pd.DataFrame, match_players: pd.DataFrame) -> pd.DataFrame:
+    keys = ["match_url", "team", "player_name"]
+    dupes = match_players[match_players.duplicated(keys, keep="first")]
+    return _issues(dupes["match_url"], dupes["player_name"].astype(object) + " (" + dupes["team"].astype(object) + ") repeated")
+
+
+def missing_players(match_table: pd.DataFrame, match_players: pd.DataFrame) -> pd.DataFrame:
+    missing = match_table.loc[~match_table["match_url"].isin(match_players["match_url"]), "match_url"]
+    return _issues(missing, "no player rows")
+
+
+def orphan_players(match_table: pd.DataFrame, match_players: pd.DataFrame) -> pd.DataFrame:
+    orphans = match_players.loc[~match_players["match_url"].isin(match_table["match_url"]), "match_url"].drop_duplicates()
+    return _issues(orphans, "player rows without a match")
+
+
+def missing_maps(match_table: pd.DataFrame, match_players: pd.DataFrame) -> pd.DataFrame:
+    missing = match_table["maps_played"].isna() | (match_table["total_maps"].fillna(0) == 0)
+    return _issues(match_table.loc[missing, "match_url"], "no map rows")
+
+
+def player_count(match_table: pd.DataFrame, match_players: pd.DataFrame) -> pd.DataFrame:
+    named = match_players[match_players["player_name"].astype(object).str.strip().fillna("") != ""]
+    counts = named.groupby("match_url", observed=True).size()
+    counts = counts[counts != PLAYERS_PER_MATCH]
+    return _issues(counts.index, counts.astype(str) + " players")
+
+
+def unknown_team_codes(match_table: pd.DataFrame, match_players: pd.DataFrame) -> pd.DataFrame:
+    # Matches where a side's code was never recognised...
+    codes = match_table[["match_url", "team_a_code", "team_b_code"]]
+    unrecognised = codes[codes["team_a_code"].isna() | codes["team_b_code"].isna()]
+    sides = np.where(unrecognised["team_a_code"].isna(), "team A", "team B")
+    # ...and players under a code that is neither side's
+    players = match_players[["match_url", "team"]].drop_duplicates().merge(codes, on="match_url")
+    stray = players[(players["team"] != players["team_a_code"]) & (players["team"] != players["team_b_code"])
+                    & players["team_a_code"].notna() & players["team_b_code"].notna()]
+    return pd.concat([
+        _issues(unrecognised["match_url"], pd.Series(sides) + " code not recognised"),
+        _issues(stray["match_url"], "players under code " + stray["team"].astype(object)),
+    ], ignore_index=True)
+
+
+CHECKS = [
+    Check("duplicate_matches", "error", "match_url stored more than once in the match table", duplicate_matches),
+    Check("duplicate_players", "error", "same (match_url, team, player_name) more than once", duplicate_players),
+    Check("missing_players", "error", "match without any player rows", missing_players),
+    Check("orphan_players", "error", "player rows whose match is not in the match table", orphan_players),
+    Check("missing_maps", "warning", "match without map rows", missing_maps),
+    Check("player_count", "warning", f"match with other than {PLAYERS_PER_MATCH} named players", player_count),
+    Check("unknown_team_codes", "warning", "side code not recognised, or players under a third code", unknown_team_codes),
+]
+
+
+def run_checks(match_table: pd.DataFrame, match_players: pd.DataFrame) -> pd.DataFrame:
+    """Every check over the two tables: one row per issue (check, severity, match_url, detail)"""
+    found = []
+    for check in CHECKS:
+        issues = check.run(match_table, match_players)
+        found.append(issues.assign(check=check.name, severity=check.severity))
+    return pd.concat(found, ignore_index=True)[["check", "severity", "match_url", "detail"]]
+
+
+def partition_keys(match_table: pd.DataFrame, match_players: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Match month ('2025-03', like the scraper's partitions) of every match and player row"""
+    month = match_table["date"].astype(object).str[:7].str.replace("/", "-", regex=False).fillna("unknown")
+    by_url = pd.Series(month.to_numpy(), index=match_table["match_url"].astype(object))
+    by_url = by_url[~by_url.index.duplicated()]
+    player_month = match_players["match_url"].astype(object).map(by_url).fillna("unknown")
+    return month.to_numpy(dtype=object), player_month.to_numpy(dtype=object)
+
+
+def _checks_signature() -> bytes:
+    """Changing a check (name or severity) invalidates every cached pass"""
+    return json.dumps([(check.name, check.severity, PLAYERS_PER_MATCH) for check in CHECKS]).encode()
+
+
+def _ipc_bytes(table: pa.Table) -> bytes:
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def partition_hashes(match_table: pd.DataFrame, match_players: pd.DataFrame,
+                     table_rows: Dict[str, np.ndarray], player_rows: Dict[str, np.ndarray]) -> Dict[str, str]:
+    """sha256 per partition over its rows of both tables in the stored schemas"""
+    tables = (to_arrow(match_table, "match_table"), to_arrow(match_players, "match_players"))
+    empty = np.array([], dtype=np.int64)
+    hashes = {}
+    for key in sorted(set(table_rows) | set(player_rows)):
+        digest = hashlib.sha256(_checks_signature())
+        for table, rows in zip(tables, (table_rows, player_rows)):
+            digest.update(_ipc_bytes(table.take(rows.get(key, empty))))
+        hashes[key] = digest.hexdigest()
+    return hashes
+
+
+class ValidationManifest:
+    """
+    JSON manifest: {"partitions": {month: {"sha256", "validated_at", "issues": [...]}}, "updated_at": ...}
+    Only partitions that passed are recorded, with their warnings, so a failing one is checked again
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.partitions: Dict[str, dict] = {}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                self.partitions = json.load(f).get("partitions", {})
+
+    def passed(self, key: str, sha256: str) -> bool:
+        return self.partitions.get(key, {}).get("sha256") == sha256
+
+    def save(self):
+        _write_json(self.path, {"partitions": self.partitions, "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S")})
+
+
+def _write_json(path: Path, payload: dict):
+    """Write atomically, so a reader never sees a half-written file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def validate(match_table: pd.DataFrame, match_players: pd.DataFrame, r2_dir: Path, full: bool = False) -> dict:
+    """
+    Run CHECKS over the partitions that changed since they last passed (all of them with full=True),
+    reuse the recorded warnings of the rest, and write R2_processed/validation_report.json
+    Returns the report: summary counts, per-partition status and every issue
+    """
+    r2_dir = Path(r2_dir)
+    manifest = ValidationManifest(r2_dir / MANIFEST_NAME)
+    table_keys, player_keys = partition_keys(match_table, match_players)
+    table_rows = pd.Series(table_keys).groupby(table_keys).indices
+    player_rows = pd.Series(player_keys).groupby(player_keys).indices
+    hashes = partition_hashes(match_table, match_players, table_rows, player_rows)
+
+    cached = {key for key, sha256 in hashes.items() if not full and manifest.passed(key, sha256)}
+    stale = sorted(set(hashes) - cached)
+    logger.info(f"Validating {len(stale)} of {len(hashes)} partitions ({len(cached)} unchanged since they passed)")
+
+    # One vectorized pass over the rows of every stale partition
+    issues = run_checks(match_table[np.isin(table_keys, stale)], match_players[np.isin(player_keys, stale)])
+    url_keys = pd.concat([
+        pd.Series(table_keys, index=match_table["match_url"].astype(object)),
+        pd.Series(player_keys, index=match_players["match_url"].astype(object)),
+    ])
+    url_keys = url_keys[~url_keys.index.duplicated()]
+    issues["partition"] = issues["match_url"].map(url_keys).fillna("unknown")
+    records = issues[["partition", "check", "severity", "match_url", "detail"]].to_dict("records")
+    by_partition = {key: [] for key in stale}
+    for record in records:
+        by_partition.setdefault(record["partition"], []).append(record)
+
+    now = time.strftime("%Y-%m-%dT%H:%M:%S")
+    partitions = {}
+    all_issues = []
+    for key in sorted(hashes):
+        if key in cached:
+            found = manifest.partitions[key]["issues"]
+        else:
+            found = by_partition.get(key, [])
+        passed = not any(issue["severity"] == "error" for issue in found)
+        partitions[key] = {
+            "sha256": hashes[key],
+            "status": "passed" if passed else "failed",
+            "cached": key in cached,
+            "match_rows": len(table_rows.get(key, ())),
+            "player_rows": len(player_rows.get(key, ())),
+            "issues": dict(sorted(Counter(issue["check"] for issue in found).items())),
+        }
+        all_issues.extend(found)
+        if key not in cached:
+            if passed:
+                manifest.partitions[key] = {"sha256": hashes[key], "validated_at": now, "issues": found}
+            else:
+                manifest.partitions.pop(key, None)
+    for key in set(manifest.partitions) - set(hashes):
+        del manifest.partitions[key]
+    manifest.save()
+
+    by_check = Counter(issue["check"] for issue in all_issues)
+    report = {
+        "generated_at": now,
+        "checks": [{"name": c.name, "severity": c.severity, "description": c.description} for c in CHECKS],
+        "summary": {
+            "partitions": len(hashes),
+            "validated": len(stale),
+            "cached": len(cached),
+            "failed": sum(p["status"] == "failed" for p in partitions.values()),
+            "errors": sum(issue["severity"] == "error" for issue in all_issues),
+            "warnings": sum(issue["severity"] == "warning" for issue in all_issues),
+            "by_check": {c.name: by_check[c.name] for c in CHECKS},
+        },
+        "partitions": partitions,
+        "issues": all_issues,
+    }
+    _write_json(r2_dir / REPORT_NAME, report)
+    return report
+
+
+def print_report(report: dict, examples: int = 3):
+    """Short human-readable version of a validation report"""
+    summary = report["summary"]
+    print("\n=== Data Quality Validation ===")
+    print(f"Partitions: {summary['partitions']} ({summary['validated']} validated, {summary['cached']} unchanged "
+          f"since they passed, {summary['failed']} failed)")
+    print(f"Errors: {summary['errors']}, warnings: {summary['warnings']}")
+    for check in report["checks"]:
+        found = [issue for issue in report["issues"] if issue["check"] == check["name"]]
+        if not found:
+            continue
+        print(f"\n  {check['name']} [{check['severity']}] - {check['description']}: {len(found)}")
+        for issue in found[:examples]:
+            print(f"    {issue['match_url']}  {issue['detail']}")
+        if len(found) > examples:
+            print(f"    ... and {len(found) - examples} more")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Validate the R2 match tables and write a JSON data-quality report"
+    )
+    parser.add_argument(
+        "--base-dir",
+        type=Path,
+        default=Path(__file__).parent.parent,
+        help="Project root directory"
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Check every partition, including those unchanged since they last passed"
+    )
+    args = parser.parse_args()
+
+    r2_dir = args.base_dir / "data/processed/R2_processed"
+    match_table = read_dataset(r2_dir / "R2_match_table", "match_table", lists="arrow")
+    match_players = read_dataset(r2_dir / "R2_match_players", "match_players")
+    report = validate(match_table, match_players, r2_dir, full=args.full)
+    print_report(report)
+    print(f"\nReport written to {r2_dir / REPORT_NAME}")
+    raise SystemExit(1 if report["summary"]["failed"] else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+# MINIMAL HTML TREE FOR PARSING A RENDERED PAGE SNAPSHOT LOCALLY
+# (one driver.page_source call instead of a WebDriver round trip per element)
+
+import re
+from functools import partial
+from html.parser import HTMLParser
+
+# Elements that start a new line in rendered text, like Selenium's element.text
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'body', 'dd', 'details', 'dialog', 'div', 'dl', 'dt',
+    'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header',
+    'hr', 'html', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'summary', 'table', 'tbody', 'thead',
+    'tfoot', 'tr', 'ul',
+}
+# VLR classes styled display:block on inline tags (CSS is not in the HTML, so these are listed by hand)
+BLOCK_CLASSES = {'m-item-team-name', 'm-item-team-tag'}
+# Elements whose content never shows up in rendered text
+HIDDEN_TAGS = {'head', 'script', 'style', 'noscript', 'template', 'title', 'meta', 'link'}
+VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param', 'source',
+    'track', 'wbr',
+}
+
+_BREAK = object()
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class HtmlNode:
+    """An element with its attributes and children (HtmlNodes and text strings)"""
+
+    __slots__ = ('tag', 'attrs', 'children', 'parent')
+
+    def __init__(self, tag, attrs=None, parent=None):
+        self.tag = tag
+        self.attrs = dict(attrs or {})
+        self.children = []
+        self.parent = parent
+
+    def get(self, name, default=None):
+        value = self.attrs.get(name, default)
+        return default if value is None else value
+
+    @property
+    def classes(self):
+        return self.get('class', '').split()
+
+    def has_class(self, *names):
+        classes = self.classes
+        return all(name in classes for name in names)
+
+    def iter(self):
+        """Every descendant element (self first) in document order"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(child for child in reversed(node.children) if isinstance(child, HtmlNode))
+
+    def find_all(self, tag=None, classes=()):
+        return [
+            node for node in self.iter()
+            if (tag is None or node.tag == tag) and (not classes or node.has_class(*classes))
+        ]
+
+    def find(self, tag=None, classes=()):
+        for node in self.iter():
+            if (tag is None or node.tag == tag) and (not classes or node.has_class(*classes)):
+                return node
+        return None
+
+    @property
+    def text(self):
+        """
+        Rendered text approximating Selenium's element.text: block elements and <br> break lines,
+        whitespace runs collapse to one space, lines are stripped and blank lines dropped
+        (CSS visibility cannot be known from the HTML, so hidden-by-style content is included)
+        """
+        return self.render_text()
+
+    def render_text(self, skip=None):
+        """element.text, leaving out any descendant for which skip(node) is true"""
+        parts = []
+        _collect_text(self, parts, skip)
+
+        lines, current = [], []
+        for part in parts:
+            if part is _BREAK:
+                lines.append(''.join(current))
+                current = []
+            else:
+                current.append(part)
+        lines.append(''.join(current))
+
+        cleaned = (_WHITESPACE_RE.sub(' ', line).strip() for line in lines)
+        return '\n'.join(line for line in cleaned if line)
+
+
+def _collect_text(node, parts, skip=None):
+    if node.tag in HIDDEN_TAGS or (skip is not None and skip(node)):
+        return
+    if node.tag == 'br':
+        parts.append(_BREAK)
+        return
+    block = (node.tag in BLOCK_TAGS or node.tag in ('td', 'th')
+             or any(c in BLOCK_CLASSES for c in node.classes))
+    if block:
+        parts.append(_BREAK)
+    for child in node.children:
+        if isinstance(child, HtmlNode):
+            _collect_text(child, parts, skip)
+            if child.tag in ('td', 'th'):
+                parts.append(' ')
+        else:
+            parts.append(child.replace('\xa0', ' '))
+    if block:
+        parts.append(_BREAK)
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = HtmlNode('#document')
+        self._stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = HtmlNode(tag, attrs, parent=self._stack[-1])
+        self._stack[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self._stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        node = HtmlNode(tag, attrs, parent=self._stack[-1])
+        self._stack[-1].children.append(node)
+
+    def handle_endtag(self, tag):
+        # Close the nearest open element with this tag, tolerating unclosed children
+        for i in range(len(self._stack) - 1, 0, -1):
+            if self._stack[i].tag == tag:
+                del self._stack[i:]
+                return
+
+    def handle_data(self, data):
+        self._stack[-1].children.append(data)
+
+
+def parse_html(html):
+    """Parse an HTML document into an HtmlNode tree rooted at a '#document' node"""
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+def _node_href(node):
+    """Link of the element itself if it is an <a>, else of its first descendant <a> (None if none)"""
+    link = node if node.tag == 'a' else node.find('a')
+    return link.get('href') if link is not None else None
+
+
+def match_list_cards(html):
+    """
+    (text, get_url) for every element of a team match-list page, in document order -
+    the same candidates get_team_matches reads from driver.find_elements(By.CSS_SELECTOR, "*")
+    """
+    root = parse_html(html)
+    for node in root.iter():
+        if node is root:
+            continue
+        yield node.text, partial(_node_href, node)
+
+
+# Pagination links on a team match-list page: <a class="btn mod-page" href="...&page=7">7</a>
+_PAGE_LINK_RE = re.compile(r'[?&;]page=(\d+)')
+
+
+def match_list_page_count(html):
+    """Number of pages in a team's match history, from the pagination links on any one of them"""
+    return max((int(n) for n in _PAGE_LINK_RE.findall(html)), default=1)
+
+
+def hidden_map_panel(node):
+    # Only the active .vm-stats-game panel is displayed; the others are display:none
+    return node.tag == 'div' and node.has_class('vm-stats-game') and not node.has_class('mod-active')
+
+
+def match_page_parts(html):
+    """
+    Everything the match-page parsers need from one snapshot of a match page:
+    {'title', 'body_text', 'header_text', 'map_tabs': [(map_number, map_name, panel_text), ...],
+     'stat_panels': number of .vm-stats-game panels}
+    body_text is what the page shows with the default tab active; map_tabs is empty for
+    single-map matches and panel_text is None for a tab whose panel is not in the snapshot
+    """
+    root = parse_html(html)
+
+    title_node = root.find('title')
+    title = ''.join(c for c in title_node.children if isinstance(c, str)).strip() if title_node else ''
+    body = root.find('body') or root
+    header = root.find(classes=('match-header-vs',))
+
+    panels = {panel.get('data-game-id'): panel for panel in root.find_all('div', classes=('vm-stats-game',))}
+    map_tabs = []
+    for button in root.find_all(classes=('vm-stats-gamesnav-item', 'js-map-switch')):
+        if button.has_class('mod-all'):
+            continue
+        parts = ' '.join(button.text.split()).split(' ', 1)
+        if len(parts) < 2 or not parts[0].isdigit():
+            continue
+        panel = panels.get(button.get('data-game-id'))
+        map_tabs.append((int(parts[0]), parts[1], panel.text if panel is not None else None))
+
+    return {
+        'title': title,
+        'body_text': body.render_text(skip=hidden_map_panel),
+        'header_text': header.text if header is not None else None,
+        'map_tabs': map_tabs,
+        'stat_panels': len(panels),
+    }
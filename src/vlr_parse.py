@@ -0,0 +1,353 @@
+# PURE PARSERS FOR VLR.GG MATCH-PAGE TEXT (NO SELENIUM)
+# (players, per-map results and the series score, from rendered page text with precompiled patterns)
+
+import re
+
+# Valorant map names
+MAP_NAMES = ('ascent', 'bind', 'haven', 'icebox', 'lotus', 'sunset', 'split',
+             'breeze', 'fracture', 'pearl', 'dust2', 'abyss',
+             'corrode')  # screw corrode
+MAP_NAME_SET = frozenset(MAP_NAMES)
+
+MORE_MATCHES_RE   = re.compile(r'\.\.\. \d+ more matches')
+RATING_RE         = re.compile(r'^(0\.\d{2}|1\.\d{2}|2\.\d{2})')
+SERIES_SCORE_RE   = re.compile(r'final\s*(\d+)\s*:\s*(\d+)\s*vs')
+BODY_SCORE_RE     = re.compile(r'(\d)\s*:\s*(\d)(?!\d)(?!\s*[AP]M)')
+TITLE_SCORE_RE    = re.compile(r'(\d+)\s*[:-]\s*(\d+)')
+ATK_DEF_RE        = re.compile(r'^\d+\s*/\s*\d+$')
+DURATION_RE       = re.compile(r'^\d+:\d+(:\d+)?$')
+REMAINS_RE        = re.compile(r'(\w+)\s+remains', re.IGNORECASE)
+BAN_REMAINS_RE    = re.compile(r'ban\s+\w+.*?(\w+)\s+remains', re.IGNORECASE | re.DOTALL)
+# Cheap prefilter: does a line mention any map name at all
+ANY_MAP_RE        = re.compile('|'.join(MAP_NAMES))
+MAP_WORD_RES      = {m: re.compile(r'\b' + m + r'\b', re.IGNORECASE) for m in MAP_NAMES}
+MAP_CONTEXT_RES   = {m: re.compile(r'.{0,20}\b' + m + r'\b.{0,20}', re.IGNORECASE) for m in MAP_NAMES}
+
+
+def clean_page_text(page_text):
+    """
+    Remove forum sections and comments from page text to avoid parsing interference
+    """
+    # Find section markers
+    forums_start = page_text.find('Forums')
+    more_matches_match = MORE_MATCHES_RE.search(page_text)
+
+    filtered_text = page_text
+
+    # Remove from "Forums" to "... X more matches"
+    if forums_start != -1 and more_matches_match:
+        end_pos = more_matches_match.end()
+        filtered_text = page_text[:forums_start] + page_text[end_pos:]
+    elif forums_start != -1:
+        # If no "more matches" found, just cut from Forums onward
+        filtered_text = page_text[:forums_start]
+
+    # Remove everything after COMMENTS:
+    comments_start = filtered_text.find('COMMENTS:')
+    if comments_start != -1:
+        filtered_text = filtered_text[:comments_start]
+
+    return filtered_text
+
+
+def match_section(page_text):
+    """
+    Cleaned page text cut down to the match itself (after the forum sidebar, before comments)
+    """
+    page_text = clean_page_text(page_text)
+
+    more_matches = MORE_MATCHES_RE.search(page_text)
+    match_start = more_matches.end() if more_matches else 0
+
+    comments_start = page_text.find('COMMENTS:')
+    if comments_start != -1:
+        return page_text[match_start:comments_start]
+    return page_text[match_start:]
+
+
+def is_valid_match_score(score1, score2):
+    """
+    Check if a score looks like a valid Valorant match score
+    """
+    total_maps = score1 + score2
+    max_score = max(score1, score2)
+
+    # Valorant match constraints:
+    # - Total maps: 1-5 (BO1, BO3, BO5)
+    # - Max score for winner: 1-3
+    # - Both scores should be reasonable (not round scores like 13:11)
+    return (
+        1 <= total_maps <= 5 and      # Valid total maps
+        1 <= max_score <= 3 and       # Valid max score for winner
+        score1 <= 3 and score2 <= 3   # Both scores reasonable
+    )
+
+
+def series_score(text):
+    """
+    Overall series score from header text or page source ("final 2:1 vs"), or None
+    """
+    score_match = SERIES_SCORE_RE.search(text or '')
+    if score_match:
+        score1, score2 = int(score_match.group(1)), int(score_match.group(2))
+        if is_valid_match_score(score1, score2):
+            return score1, score2
+    return None
+
+
+def body_series_score(body_text):
+    """
+    Fallback series score: first valid "X:Y" in the body text before the comments
+    """
+    body_text = clean_page_text(body_text)
+    comments_start = body_text.lower().find('comments')
+    if comments_start != -1:
+        body_text = body_text[:comments_start]
+
+    for score1, score2 in BODY_SCORE_RE.findall(body_text):
+        score1, score2 = int(score1), int(score2)
+        if is_valid_match_score(score1, score2):
+            return score1, score2
+    return None
+
+
+def title_series_score(title):
+    """
+    Last-resort series score from the page title, or None
+    """
+    score_match = TITLE_SCORE_RE.search(title or '')
+    if score_match:
+        score1, score2 = int(score_match.group(1)), int(score_match.group(2))
+        if is_valid_match_score(score1, score2):
+            return score1, score2
+    return None
+
+
+def parse_players(page_text, match_url, match_number):
+    """
+    Player ratings from match-page text: a rating line has the player name
+    2 lines above it and the team tag 1 line above
+    """
+    return _players_from_lines(match_section(page_text).split('\n'), match_url, match_number)
+
+
+def _players_from_lines(lines, match_url, match_number):
+    players = []
+
+    for i, line in enumerate(lines):
+        line = line.strip()
+
+        # Look for rating lines that start with decimal
+        if i >= 2 and RATING_RE.match(line):
+            rating = float(line.split()[0])
+            player_name = lines[i - 2].strip()
+            team_name = lines[i - 1].strip()
+
+            # Basic validation
+            if (2 <= len(player_name) <= 20 and
+                2 <= len(team_name) <= 10 and
+                team_name.isupper()):
+
+                players.append({
+                    'player_name': player_name,
+                    'team': team_name,
+                    'rating': rating,
+                    'match_number': match_number,
+                    'match_url': match_url
+                })
+
+    return players
+
+
+def parse_map_result(page_text, target_team_name):
+    """
+    Win/loss result AND scores for the target team from the text of one map
+    (an active map tab's body text, or a single map panel's text)
+    Returns: (result, our_score, their_score) or ('Unknown', None, None)
+    """
+    page_text = clean_page_text(page_text)
+
+    # Exclude the comments section
+    comments_start = page_text.lower().find('comments')
+    if comments_start != -1:
+        page_text = page_text[:comments_start]
+
+    return _map_result_from_lines(page_text.split('\n'), target_team_name)
+
+
+def _map_result_from_lines(lines, target_team_name):
+    target_lower = target_team_name.lower()
+
+    # Look for map names and analyze surrounding context
+    for i, line in enumerate(lines):
+        line_lower = line.lower().strip()
+        if not ANY_MAP_RE.search(line_lower):
+            continue
+
+        # Check if this line contains a map name
+        for map_name in MAP_NAMES:
+            if not (line_lower == map_name or (map_name in line_lower and len(line_lower) < 20)):
+                continue
+
+            # Pattern: Score, Team Name, A/D, Map, (PICK), Time, Team Name, A/D, Score
+            # Check lines before the map (typically 1-3 lines)
+            team1_score = None
+            team1_name = None
+
+            for j in range(max(0, i - 4), i):
+                prev_line = lines[j].strip()
+
+                # Check if it's a score (single number 0-25 for overtime)
+                if prev_line.isdigit() and 0 <= int(prev_line) <= 25:
+                    team1_score = int(prev_line)
+                    # Team name should be right after the score
+                    if j + 1 < i and not lines[j + 1].strip().isdigit():
+                        potential_team = lines[j + 1].strip()
+                        # Validate it's a team name (not A/D pattern)
+                        if not ATK_DEF_RE.match(potential_team):
+                            team1_name = potential_team
+                    break
+
+            # Check lines after the map
+            team2_score = None
+            team2_name = None
+
+            # Skip "PICK" line if present
+            start_idx = i + 1
+            if i + 1 < len(lines) and lines[i + 1].strip().upper() == 'PICK':
+                start_idx = i + 2
+
+            # Skip time line (format: MM:SS or HH:MM:SS)
+            if start_idx < len(lines) and DURATION_RE.match(lines[start_idx].strip()):
+                start_idx += 1
+
+            # Now look for team2 info
+            for j in range(start_idx, min(len(lines), start_idx + 4)):
+                current_line = lines[j].strip()
+
+                # First non-time line should be team name
+                if team2_name is None and current_line and not current_line.isdigit():
+                    # Check if it's not A/D pattern
+                    if not ATK_DEF_RE.match(current_line):
+                        team2_name = current_line
+
+                # Look for score after team name
+                elif team2_name and current_line.isdigit() and 0 <= int(current_line) <= 25:
+                    team2_score = int(current_line)
+                    break
+
+            if team1_score is None or team2_score is None:
+                continue
+
+            # Determine which score belongs to our target team
+            if team1_name and target_lower in team1_name.lower():
+                our_score, their_score = team1_score, team2_score
+            elif team2_name and target_lower in team2_name.lower():
+                our_score, their_score = team2_score, team1_score
+            else:
+                # If we can't match names exactly, look in broader context
+                context = ' '.join(lines[max(0, i - 10):min(len(lines), i + 10)])
+
+                # Find which position our team appears more prominently
+                team_mentions_before = context[:context.find(map_name)].lower().count(target_lower)
+                team_mentions_after = context[context.find(map_name):].lower().count(target_lower)
+
+                if team_mentions_before > team_mentions_after:
+                    our_score, their_score = team1_score, team2_score
+                else:
+                    our_score, their_score = team2_score, team1_score
+
+            result = 'W' if our_score > their_score else 'L'
+            return result, our_score, their_score
+
+    return 'Unknown', None, None
+
+
+def find_single_map_name(page_text, title):
+    """
+    Name of the one map of a Bo1 from match-section text and the page title
+    Returns (map_name, strategy) - ('Unknown', None) if no strategy finds one
+    """
+    # Strategy 1: Look for "X remains" pattern (most reliable for single maps)
+    remains_match = REMAINS_RE.search(page_text)
+    if remains_match and remains_match.group(1).lower() in MAP_NAME_SET:
+        return remains_match.group(1).capitalize(), 'remains'
+
+    # Strategy 2: Look for pick/ban phase and find the final map
+    ban_phase_match = BAN_REMAINS_RE.search(page_text)
+    if ban_phase_match and ban_phase_match.group(1).lower() in MAP_NAME_SET:
+        return ban_phase_match.group(1).capitalize(), 'ban phase'
+
+    # Strategy 3: Look for map in page title
+    title = (title or '').lower()
+    for map_name in MAP_NAMES:
+        if map_name in title:
+            return map_name.capitalize(), 'title'
+
+    # Strategy 4: Fallback - search page text, skipping mentions in a ban context
+    for map_name in MAP_NAMES:
+        if MAP_WORD_RES[map_name].search(page_text):
+            context_match = MAP_CONTEXT_RES[map_name].search(page_text)
+            if context_match and 'ban' not in context_match.group().lower():
+                return map_name.capitalize(), 'page text'
+
+    return 'Unknown', None
+
+
+def parse_single_map_data(page_text, title, match_url, team_name, match_number, match_result):
+    """
+    Map row for a single-map match (like 1:0 scores), with scores when they can be found
+    """
+    map_name, _ = find_single_map_name(match_section(page_text), title)
+    result, our_score, their_score = parse_map_result(page_text, team_name)
+    return map_row(match_url, team_name, match_number, match_result, 1, map_name,
+                   result if result != 'Unknown' else match_result, our_score, their_score)
+
+
+def map_row(match_url, team_name, match_number, match_result, map_number, map_name, result, our_score, their_score):
+    return {
+        'team_name': team_name,
+        'match_number': match_number,
+        'overall_match_result': match_result,
+        'map_number': map_number,
+        'map_name': map_name,
+        'map_result': result,
+        'our_score': our_score,
+        'their_score': their_score,
+        'map_score': f"{our_score}-{their_score}" if our_score is not None else None,
+        'match_url': match_url
+    }
+
+
+def parse_match_page(page, page_source, team_name, match_url, match_number, match_result, title=None):
+    """
+    Parse a whole match page in one go, from one snapshot of it
+
+    page:        vlr_html.match_page_parts(page_source)
+    page_source: the snapshot's HTML (the series score falls back to it when the header has none)
+    The scraper's static-HTML and browser-snapshot paths both go through here
+    Returns {'players': [...], 'maps': [...], 'series_score': (a, b) or None, 'maps_played': n};
+    'maps' is None when a played map's panel is missing from the snapshot
+    """
+    players = parse_players(page['body_text'], match_url, match_number)
+
+    score = series_score(page['header_text']) or series_score(page_source)
+    maps_played = sum(score) if score else 5  # Max possible in a BO5
+
+    if not page['map_tabs']:
+        maps = [parse_single_map_data(page['body_text'], title or page['title'], match_url,
+                                      team_name, match_number, match_result)]
+    else:
+        maps = []
+        for map_number, map_name, panel_text in page['map_tabs']:
+            # Only maps that were actually played
+            if map_number > maps_played:
+                continue
+            if panel_text is None:
+                maps = None
+                break
+            result, our_score, their_score = parse_map_result(panel_text, team_name)
+            maps.append(map_row(match_url, team_name, match_number, match_result,
+                                map_number, map_name, result, our_score, their_score))
+
+    return {'players': players, 'maps': maps, 'series_score': score, 'maps_played': maps_played}
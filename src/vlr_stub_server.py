@@ -0,0 +1,382 @@
+# LOCAL STAND-IN FOR VLR.GG
+# (serves recorded or synthetic team match-list and match pages over HTTP, so the real scraper
+#  can be run and benchmarked offline and reproducibly)
+
+import argparse
+import glob
+import gzip
+import html
+import json
+import os
+import random
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# Matches per match-list page, as on vlr.gg; synthetic seasons count back one day per round
+LIST_PAGE_SIZE = 50
+FIRST_DAY = date(2025, 7, 1)
+
+SYNTHETIC_MAPS = ('Ascent', 'Bind', 'Haven', 'Icebox', 'Lotus', 'Sunset', 'Split', 'Breeze', 'Fracture', 'Pearl', 'Abyss')
+
+# Real VLR hides inactive map panels and lays these spans out as blocks - the scraper's text
+# parsing relies on both, so the synthetic pages carry the same rules
+PAGE_STYLE = """
+.m-item-team-name, .m-item-team-tag { display: block; }
+.vm-stats-game { display: none; }
+.vm-stats-game.mod-active { display: block; }
+"""
+
+# Same behaviour as VLR's map tabs: clicking one shows its panel and marks it active
+MAP_SWITCH_SCRIPT = """
+document.querySelectorAll('.js-map-switch').forEach(function (tab) {
+  tab.addEventListener('click', function () {
+    document.querySelectorAll('.js-map-switch, .vm-stats-game').forEach(function (el) {
+      el.classList.toggle('mod-active', el.getAttribute('data-game-id') === tab.getAttribute('data-game-id'));
+    });
+  });
+});
+"""
+
+
+def page_path(url):
+    """
+    Lookup key for a URL: its unquoted path without trailing slash or query string, except a
+    match-list page number past the first ('/team/matches/2/sentinels?page=3')
+    """
+    parts = urlsplit(url)
+    path = unquote(parts.path).rstrip('/') or '/'
+    page = parse_qs(parts.query).get('page', ['1'])[0]
+    return path if page == '1' else f"{path}?page={page}"
+
+
+def team_tag(team_name):
+    words = [w for w in team_name.replace('.', ' ').split() if w]
+    tag = ''.join(w[0] for w in words) if len(words) > 1 else team_name[:3]
+    return tag.upper()
+
+
+def slugify(text):
+    return '-'.join(''.join(c if c.isalnum() else ' ' for c in text.lower()).split())
+
+
+# ---------------------------------------------------------------------------
+# Synthetic pages
+# ---------------------------------------------------------------------------
+
+def _page(title, body):
+    return (f'<!DOCTYPE html><html><head><title>{html.escape(title)}</title><style>{PAGE_STYLE}</style></head>'
+            f'<body>{body}<script>{MAP_SWITCH_SCRIPT}</script></body></html>')
+
+
+def _player_rows(team_name, rng):
+    tag = team_tag(team_name)
+    rows = []
+    for k in range(1, 6):
+        name = f"{slugify(team_name).replace('-', '')[:12]}{k}"
+        rows.append(
+            f'<tr><td class="mod-player"><div class="text-of">{html.escape(name)}</div>'
+            f'<div class="ge-text-light">{html.escape(tag)}</div></td>'
+            f'<td class="mod-stat">{rng.uniform(0.6, 1.6):.2f}</td></tr>'
+        )
+    return ''.join(rows)
+
+
+def _map_header(map_name, team1, team2, score1, score2, picked):
+    def side(score, name, right):
+        win = ' mod-win' if (score1 > score2) != right else ''
+        half = f'<div><span class="mod-t">{score // 2}</span> / <span class="mod-ct">{score - score // 2}</span></div>'
+        parts = [f'<div class="score{win}">{score}</div>', f'<div class="team-name">{html.escape(name)}</div>', half]
+        cls = 'team mod-right' if right else 'team'
+        return f'<div class="{cls}">{"".join(reversed(parts) if right else parts)}</div>'
+
+    pick = '<span class="picked">PICK</span>' if picked else ''
+    return (f'<div class="vm-stats-game-header">{side(score1, team1, False)}'
+            f'<div class="map"><div><span>{map_name}{pick}</span></div><div class="map-duration">41:07</div></div>'
+            f'{side(score2, team2, True)}</div>')
+
+
+def _map_scores(rng, team1_wins):
+    loser = rng.randint(2, 11)
+    winner = 13
+    if rng.random() < 0.15:
+        winner, loser = 14, 12
+    return (winner, loser) if team1_wins else (loser, winner)
+
+
+def synthetic_match_page(match, rng):
+    """
+    Match page in one of VLR's layouts: 'series' (Bo3 with map tabs), 'single' (Bo1 veto
+    ending in "X remains") or 'forfeit' (header score only, no stats)
+    """
+    team1, team2 = match['team1'], match['team2']
+    score1, score2 = match['series']
+    header = (
+        '<div class="match-header">'
+        f'<div class="match-header-super"><div class="match-header-event">{html.escape(match["tournament"])}</div></div>'
+        '<div class="match-header-vs">'
+        f'<a class="match-header-link mod-1"><div class="wf-title-med">{html.escape(team1)}</div></a>'
+        '<div class="match-header-vs-score"><div class="match-header-vs-note">final</div>'
+        f'<div class="js-spoiler"><span>{score1}</span><span class="match-header-vs-score-colon">:</span><span>{score2}</span></div>'
+        f'<div class="match-header-vs-note">vs.</div><div class="match-header-vs-note">{match["format"]}</div></div>'
+        f'<a class="match-header-link mod-2"><div class="wf-title-med">{html.escape(team2)}</div></a>'
+        '</div>'
+    )
+    players = f'<table class="wf-table-inset mod-overview">{_player_rows(team1, rng)}{_player_rows(team2, rng)}</table>'
+
+    if match['layout'] == 'forfeit':
+        body = header + '<div class="match-header-note">Forfeit</div></div>'
+    elif match['layout'] == 'single':
+        (map_name, s1, s2), = match['maps']
+        bans = [m for m in SYNTHETIC_MAPS if m != map_name][:6]
+        veto = '; '.join(f"{team_tag(t)} ban {m}" for t, m in zip((team1, team2) * 3, bans))
+        body = (header + f'<div class="match-header-note">{veto}; {map_name} remains</div></div>'
+                f'<div class="vm-stats"><div class="vm-stats-game mod-active" data-game-id="{match["id"]}1">'
+                f'{_map_header(map_name, team1, team2, s1, s2, False)}{players}</div></div>')
+    else:
+        nav = ['<div class="vm-stats-gamesnav-item js-map-switch mod-all mod-active" data-game-id="all"><div>All Maps</div></div>']
+        panels = [f'<div class="vm-stats-game mod-active" data-game-id="all">{players}</div>']
+        for number, (map_name, s1, s2) in enumerate(match['maps'], start=1):
+            game_id = f"{match['id']}{number}"
+            nav.append(f'<div class="vm-stats-gamesnav-item js-map-switch" data-game-id="{game_id}">'
+                       f'<div><span>{number}</span> {map_name}</div></div>')
+            played = s1 is not None
+            inner = _map_header(map_name, team1, team2, s1, s2, number < 3) + players if played else '<div>Not played</div>'
+            panels.append(f'<div class="vm-stats-game" data-game-id="{game_id}">{inner}</div>')
+        body = (header + '</div><div class="vm-stats"><div class="vm-stats-gamesnav">' + ''.join(nav) + '</div>'
+                + ''.join(panels) + '</div>')
+
+    title = f"{team1} vs. {team2} | {match['tournament']} | VLR.gg"
+    return _page(title, body + '<div class="wf-card">COMMENTS: none yet</div>')
+
+
+def synthetic_match_list(team_name, matches, page=1, page_count=1, list_path=''):
+    """A team's completed-matches page, newest first, with VLR-style pagination links"""
+    cards = []
+    for match in matches:
+        home = match['team1'] == team_name
+        opponent = match['team2'] if home else match['team1']
+        ours, theirs = match['series'] if home else reversed(match['series'])
+        cards.append(
+            f'<a href="/{match["id"]}/{match["slug"]}" class="wf-card fc-flex m-item">'
+            f'<div class="m-item-thumb"><img src="/img/vlr/tmp/vlr.png"></div>'
+            f'<div class="m-item-event text-of"><div>{html.escape(match["tournament"])}</div>{html.escape(match["stage"])}</div>'
+            f'<div class="m-item-team text-of"><span class="m-item-team-name">{html.escape(team_name)}</span>'
+            f'<span class="m-item-team-tag">#{team_tag(team_name)}</span></div>'
+            f'<div class="m-item-result"><span>{ours}</span>:<span>{theirs}</span></div>'
+            f'<div class="m-item-team text-of mod-right"><span class="m-item-team-name">{html.escape(opponent)}</span>'
+            f'<span class="m-item-team-tag">#{team_tag(opponent)}</span></div>'
+            f'<div class="m-item-date"><div>{match["date"]}</div></div>'
+            '</a>'
+        )
+    links = ''.join(
+        f'<span class="btn mod-page mod-active">{n}</span>' if n == page else
+        f'<a class="btn mod-page" href="{list_path}/?group=completed&amp;page={n}">{n}</a>'
+        for n in range(1, page_count + 1)
+    ) if page_count > 1 else ''
+    return _page(f"{team_name}: Matches | VLR.gg",
+                 f'<div class="mod-dark">{"".join(cards)}</div><div class="action-container-pages">{links}</div>')
+
+
+def synthetic_site(teams, matches_per_team=20, outside_share=0.2, seed=0):
+    """
+    {path: html} for a made-up season between `teams` ({team_name: team_id})
+    Tracked teams mostly play each other, so the same match page shows up on two list pages;
+    `outside_share` of games are against untracked teams. Layouts mix Bo3 series (2 or 3
+    maps played), Bo1 single maps and forfeits. Match lists are split into pages of
+    LIST_PAGE_SIZE like VLR's, one round (day) per match going back from FIRST_DAY
+    """
+    rng = random.Random(seed)
+    names = list(teams)
+    schedule = {name: [] for name in names}
+    matches = []
+    first_day = FIRST_DAY
+
+    for round_number in range(matches_per_team):
+        rng.shuffle(names)
+        waiting = []
+        for name in names:
+            if rng.random() < outside_share:
+                waiting.append((name, f"Guest Team {rng.randint(1, 40)}"))
+            elif waiting and waiting[-1][1] is None:
+                waiting[-1] = (waiting[-1][0], name)
+            else:
+                waiting.append((name, None))
+        for team1, team2 in waiting:
+            team2 = team2 or f"Guest Team {rng.randint(1, 40)}"
+            match_id = 500000 + len(matches)
+            layout = rng.choices(('series', 'single', 'forfeit'), weights=(6, 3, 1))[0]
+            team1_wins = rng.random() < 0.5
+            if layout == 'series':
+                results = [team1_wins, not team1_wins, team1_wins] if rng.random() < 0.4 else [team1_wins] * 2
+                picked = rng.sample(SYNTHETIC_MAPS, 3)
+                maps = [(m, *_map_scores(rng, won)) for m, won in zip(picked, results)]
+                maps += [(m, None, None) for m in picked[len(maps):]]
+                series = (results.count(True), results.count(False))
+                fmt = 'Bo3'
+            elif layout == 'single':
+                maps = [(rng.choice(SYNTHETIC_MAPS), *_map_scores(rng, team1_wins))]
+                series = (1, 0) if team1_wins else (0, 1)
+                fmt = 'Bo1'
+            else:
+                maps = []
+                series = (1, 0) if team1_wins else (0, 1)
+                fmt = 'Bo3'
+            match = {
+                'id': match_id,
+                'slug': f"{slugify(team1)}-vs-{slugify(team2)}-bench-league",
+                'team1': team1, 'team2': team2,
+                'layout': layout, 'format': fmt, 'maps': maps, 'series': series,
+                'tournament': 'Bench League 2025', 'stage': f"Regular Season ⋅ W{round_number + 1}",
+                'date': (first_day - timedelta(days=round_number)).strftime('%Y/%m/%d'),
+            }
+            matches.append(match)
+            for name in (team1, team2):
+                if name in schedule:
+                    schedule[name].append(match)
+
+    pages = {}
+    for match in matches:
+        pages[f"/{match['id']}/{match['slug']}"] = synthetic_match_page(match, rng)
+    for name, team_id in teams.items():
+        list_path = f"/team/matches/{team_id}/{name.lower()}"
+        history = schedule[name]
+        page_count = max(1, -(-len(history) // LIST_PAGE_SIZE))
+        for page in range(1, page_count + 1):
+            chunk = history[(page - 1) * LIST_PAGE_SIZE:page * LIST_PAGE_SIZE]
+            pages[page_path(f"{list_path}/?page={page}")] = synthetic_match_list(name, chunk, page, page_count, list_path)
+    return pages
+
+
+def recorded_site(cache_dir):
+    """{path: html} for every page the scraper saved to its page cache (overview snapshots only)"""
+    pages = {}
+    for path in glob.glob(os.path.join(cache_dir, '*', '*.json.gz')):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        if snapshot.get('tab') == 'overview' and snapshot.get('html'):
+            pages[page_path(snapshot['url'])] = snapshot['html']
+    return pages
+
+
+def recorded_teams(pages, known_teams):
+    """{team_name: team_id} for every team whose match-list page was recorded"""
+    by_id = {team_id: name for name, team_id in known_teams.items()}
+    teams = {}
+    for path in pages:
+        if path.startswith('/team/matches/'):
+            team_id, slug = path.split('/')[3:5]
+            teams[by_id.get(int(team_id), slug)] = int(team_id)
+    return teams
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        stub = self.server.stub
+        if stub.latency:
+            time.sleep(stub.latency)
+        page = stub.pages.get(page_path(self.path))
+        stub.count(page is not None)
+        if page is None:
+            self.send_error(404)
+            return
+        body = page.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer:
+    """
+    Threaded HTTP server for a {path: html} site on localhost, run in a background thread
+    `latency` adds a fixed delay per request to imitate the network
+    """
+
+    def __init__(self, pages, host='127.0.0.1', port=0, latency=0.0):
+        self.pages = pages
+        self.latency = latency
+        self.served = 0
+        self.missing = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, found):
+        with self._lock:
+            if found:
+                self.served += 1
+            else:
+                self.missing += 1
+
+    def serve_forever(self):
+        """Serve in the calling thread until interrupted"""
+        try:
+            self._httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._httpd.server_close()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='vlr-stub', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    from scrape_vlr import DEFAULT_CACHE_DIR, vct_teams
+
+    parser = argparse.ArgumentParser(description="Serve recorded or synthetic VLR pages on localhost")
+    parser.add_argument("--recorded", nargs='?', const=DEFAULT_CACHE_DIR, default=None,
+                        help="Serve pages from the scraper's page cache instead of synthetic ones")
+    parser.add_argument("--teams", type=int, default=8, help="Synthetic: number of tracked teams")
+    parser.add_argument("--matches", type=int, default=20, help="Synthetic: matches per team")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic: random seed")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of delay added to every request")
+    args = parser.parse_args()
+
+    if args.recorded:
+        pages = recorded_site(args.recorded)
+        teams = recorded_teams(pages, vct_teams)
+    else:
+        teams = dict(list(vct_teams.items())[:args.teams])
+        pages = synthetic_site(teams, args.matches, seed=args.seed)
+
+    server = StubServer(pages, port=args.port, latency=args.latency)
+    print(f"Serving {len(pages)} pages ({len(teams)} team match lists) at {server.base_url}")
+    for name, team_id in teams.items():
+        print(f"  {server.base_url}/team/matches/{team_id}/{name.lower()}/?group=completed")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
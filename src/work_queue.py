@@ -0,0 +1,216 @@
+# PERSISTENT SCRAPE WORK QUEUE IN ONE SQLITE FILE
+# (team-list, match-detail and save jobs that any number of worker processes can pull from;
+#  a worker that dies holding a job loses its lease and the job is handed out again)
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections import namedtuple
+from contextlib import closing, contextmanager
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id            INTEGER PRIMARY KEY,
+    kind          TEXT NOT NULL,
+    key           TEXT NOT NULL,
+    grp           TEXT,
+    payload       TEXT NOT NULL,
+    priority      INTEGER NOT NULL DEFAULT 0,
+    state         TEXT NOT NULL DEFAULT 'pending',
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    lease_owner   TEXT,
+    lease_token   TEXT,
+    lease_expires REAL,
+    result        TEXT,
+    error         TEXT,
+    created       REAL NOT NULL,
+    updated       REAL NOT NULL,
+    UNIQUE (kind, key)
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (state, priority, id);
+CREATE INDEX IF NOT EXISTS jobs_group ON jobs (grp, kind, state);
+"""
+
+# A leased job as handed to a worker; `token` identifies this particular lease
+Job = namedtuple('Job', 'id kind key group payload attempts token')
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class WorkQueue:
+    """
+    Jobs are (kind, key) unique, so enqueueing the same work twice is a no-op
+    lease() hands out the highest-priority ready job - pending, or leased with an expired lease -
+    for `visibility_timeout` seconds; complete()/fail() only count for the lease that is still
+    current, so a late worker whose job was re-leased cannot overwrite the newer result
+    Every call opens its own connection (safe across threads and processes). Hosts can share the
+    file only on a filesystem with working POSIX locks - SQLite is not safe on most NFS mounts
+    """
+
+    def __init__(self, path, visibility_timeout=300.0, max_attempts=5):
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # isolation_level=None: transactions are explicit, BEGIN IMMEDIATE takes the write lock up front
+        with closing(sqlite3.connect(self.path, timeout=60, isolation_level=None)) as db:
+            db.row_factory = sqlite3.Row
+            yield db
+
+    @contextmanager
+    def _transaction(self):
+        with self._connect() as db:
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                yield db
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+            db.execute('COMMIT')
+
+    def enqueue(self, kind, key, payload, group=None, priority=0):
+        """Add a job unless (kind, key) is already queued; returns True if it was added"""
+        now = time.time()
+        with self._transaction() as db:
+            cursor = db.execute(
+                'INSERT OR IGNORE INTO jobs (kind, key, grp, payload, priority, created, updated) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (kind, key, group, json.dumps(payload, ensure_ascii=False), priority, now, now)
+            )
+            return cursor.rowcount == 1
+
+    def lease(self, worker_id, kinds=None):
+        """The next ready job (highest priority, oldest first) leased to `worker_id`, or None"""
+        now = time.time()
+        kind_filter = ''
+        params = [now]
+        if kinds:
+            kind_filter = f" AND kind IN ({','.join('?' * len(kinds))})"
+            params += list(kinds)
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT * FROM jobs WHERE (state = 'pending' OR (state = 'leased' AND lease_expires < ?))"
+                f"{kind_filter} ORDER BY priority DESC, id LIMIT 1", params
+            ).fetchone()
+            if row is None:
+                return None
+            token = uuid.uuid4().hex
+            db.execute(
+                "UPDATE jobs SET state = 'leased', attempts = attempts + 1, lease_owner = ?, lease_token = ?, "
+                "lease_expires = ?, updated = ? WHERE id = ?",
+                (worker_id, token, now + self.visibility_timeout, now, row['id'])
+            )
+        return Job(row['id'], row['kind'], row['key'], row['grp'], json.loads(row['payload']),
+                   row['attempts'] + 1, token)
+
+    def extend(self, job):
+        """Push the lease's expiry out by another visibility timeout; False if the lease was lost"""
+        now = time.time()
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET lease_expires = ?, updated = ? WHERE id = ? AND lease_token = ? AND state = 'leased'",
+                (now + self.visibility_timeout, now, job.id, job.token)
+            )
+            return cursor.rowcount == 1
+
+    @contextmanager
+    def keep_alive(self, job, interval=None):
+        """Extend the job's lease in a background thread while the block runs (for long jobs)"""
+        interval = interval or self.visibility_timeout / 3
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(interval):
+                if not self.extend(job):
+                    return
+
+        thread = threading.Thread(target=beat, name=f"lease-{job.id}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def complete(self, job, result=None):
+        """Mark the job done with an optional JSON-able result; False if this lease is no longer current"""
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET state = 'done', result = ?, error = NULL, lease_owner = NULL, lease_expires = NULL, "
+                "updated = ? WHERE id = ? AND lease_token = ? AND state = 'leased'",
+                (None if result is None else json.dumps(result, ensure_ascii=False), time.time(), job.id, job.token)
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job, error):
+        """
+        Give the job back: pending again, or 'failed' once it has used max_attempts
+        Returns the new state, or None if this lease is no longer current
+        """
+        state = 'failed' if job.attempts >= self.max_attempts else 'pending'
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET state = ?, error = ?, lease_owner = NULL, lease_expires = NULL, updated = ? "
+                "WHERE id = ? AND lease_token = ? AND state = 'leased'",
+                (state, str(error)[:500], time.time(), job.id, job.token)
+            )
+            return state if cursor.rowcount == 1 else None
+
+    def unfinished(self, group, kind):
+        """Jobs of `kind` in `group` that are neither done nor failed"""
+        with self._connect() as db:
+            return db.execute(
+                "SELECT COUNT(*) FROM jobs WHERE grp = ? AND kind = ? AND state IN ('pending', 'leased')",
+                (group, kind)
+            ).fetchone()[0]
+
+    def results(self, group, kind):
+        """{key: result} of the done jobs of `kind` in `group`, oldest job first"""
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT key, result FROM jobs WHERE grp = ? AND kind = ? AND state = 'done' ORDER BY id",
+                (group, kind)
+            ).fetchall()
+        return {row['key']: json.loads(row['result']) if row['result'] else None for row in rows}
+
+    def idle(self):
+        """True when no job is pending or leased (the queue is drained)"""
+        with self._connect() as db:
+            return db.execute(
+                "SELECT COUNT(*) FROM jobs WHERE state IN ('pending', 'leased')"
+            ).fetchone()[0] == 0
+
+    def counts(self):
+        """{kind: {state: n}}"""
+        with self._connect() as db:
+            rows = db.execute('SELECT kind, state, COUNT(*) AS n FROM jobs GROUP BY kind, state').fetchall()
+        counts = {}
+        for row in rows:
+            counts.setdefault(row['kind'], {})[row['state']] = row['n']
+        return counts
+
+    def retry_failed(self):
+        """Put every failed job back in the queue with a fresh attempt budget; returns how many"""
+        with self._transaction() as db:
+            return db.execute(
+                "UPDATE jobs SET state = 'pending', attempts = 0, updated = ? WHERE state = 'failed'",
+                (time.time(),)
+            ).rowcount
+
+    def reset(self):
+        """Drop every job (start a new run)"""
+        with self._transaction() as db:
+            db.execute('DELETE FROM jobs')